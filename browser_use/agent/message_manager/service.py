@@ -14,12 +14,14 @@ from browser_use.agent.views import (
 	MessageManagerState,
 )
 from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import SerializedDOMState
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.messages import (
 	BaseMessage,
 	ContentPartImageParam,
 	ContentPartTextParam,
 	SystemMessage,
+	UserMessage,
 )
 from browser_use.observability import observe_debug
 from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
@@ -110,6 +112,8 @@ class MessageManager:
 		include_tool_call_examples: bool = False,
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		dom_representation: Literal['full', 'diff'] = 'full',
+		dom_viewport_margin: int | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -122,6 +126,10 @@ class MessageManager:
 		self.include_tool_call_examples = include_tool_call_examples
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
+		self.dom_representation = dom_representation
+		self.dom_viewport_margin = dom_viewport_margin
+		# (url, state, element list) of the last step that sent the full element list, diffs are against it
+		self._dom_keyframe: tuple[str, SerializedDOMState, str] | None = None
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
 
@@ -298,7 +306,7 @@ class MessageManager:
 
 		# Create single state message with all content
 		assert browser_state_summary
-		state_message = AgentMessagePrompt(
+		prompt = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
 			agent_history_description=self.agent_history_description,
@@ -313,11 +321,43 @@ class MessageManager:
 			vision_detail_level=self.vision_detail_level,
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
-		).get_user_message(use_vision)
+			dom_representation=self.dom_representation,
+			previous_dom_state=self._dom_keyframe[1]
+			if self._dom_keyframe and self._dom_keyframe[0] == browser_state_summary.url
+			else None,
+			dom_viewport_margin=self.dom_viewport_margin,
+		)
+		state_message = prompt.get_user_message(use_vision)
+
+		if self.dom_representation == 'diff':
+			self._update_dom_keyframe(browser_state_summary, prompt)
 
 		# Set the state message with caching enabled
 		self._set_message_with_type(state_message, 'state')
 
+	def _update_dom_keyframe(self, browser_state_summary: BrowserStateSummary, prompt: AgentMessagePrompt) -> None:
+		"""Keep the full element list the model last saw in context while the state message only has the changes"""
+		if prompt.dom_diff_sent:
+			assert self._dom_keyframe is not None
+			if self.state.history.dom_keyframe_message is None:
+				url, _, elements_text = self._dom_keyframe
+				keyframe = f'<browser_state_keyframe>\nElements of {url} when the full list was last sent:\n{elements_text}\n</browser_state_keyframe>'
+				self._set_message_with_type(UserMessage(content=keyframe, cache=True), 'dom_keyframe')
+			return
+
+		# The full list was sent (first step, navigation or large change), it is the new keyframe
+		self.state.history.dom_keyframe_message = None
+		dom_state = browser_state_summary.dom_state
+		# Same arguments as the prompt, served from the state's representation cache
+		elements_text = dom_state.llm_representation(
+			include_attributes=self.include_attributes,
+			max_chars=prompt.max_clickable_elements_length,
+			viewport_margin=prompt.dom_viewport_margin,
+			viewport_height=prompt.dom_viewport_height,
+		)
+		# A diff against a truncated list would refer to lines the model never saw
+		self._dom_keyframe = None if dom_state.truncated else (browser_state_summary.url, dom_state, elements_text)
+
 	def _log_history_lines(self) -> str:
 		"""Generate a formatted log string of message history for debugging / printing to terminal"""
 		# TODO: fix logging
@@ -364,7 +404,7 @@ class MessageManager:
 		self.last_input_messages = self.state.history.get_messages()
 		return self.last_input_messages
 
-	def _set_message_with_type(self, message: BaseMessage, message_type: Literal['system', 'state']) -> None:
+	def _set_message_with_type(self, message: BaseMessage, message_type: Literal['system', 'dom_keyframe', 'state']) -> None:
 		"""Replace a specific state message slot with a new message"""
 		# filter out sensitive data from the message
 		if self.sensitive_data:
@@ -372,6 +412,8 @@ class MessageManager:
 
 		if message_type == 'system':
 			self.state.history.system_message = message
+		elif message_type == 'dom_keyframe':
+			self.state.history.dom_keyframe_message = message
 		elif message_type == 'state':
 			self.state.history.state_message = message
 		else:
@@ -69,15 +69,19 @@ class MessageHistory(BaseModel):
 	"""History of messages"""
 
 	system_message: BaseMessage | None = None
+	dom_keyframe_message: BaseMessage | None = None
+	"""Last full element list, only set while the state message lists the changes since (dom_representation='diff')"""
 	state_message: BaseMessage | None = None
 	context_messages: list[BaseMessage] = Field(default_factory=list)
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	def get_messages(self) -> list[BaseMessage]:
-		"""Get all messages in the correct order: system -> state -> contextual"""
+		"""Get all messages in the correct order: system -> DOM keyframe -> state -> contextual"""
 		messages = []
 		if self.system_message:
 			messages.append(self.system_message)
+		if self.dom_keyframe_message:
+			messages.append(self.dom_keyframe_message)
 		if self.state_message:
 			messages.append(self.state_message)
 		messages.extend(self.context_messages)
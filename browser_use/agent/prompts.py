@@ -9,6 +9,7 @@ from browser_use.utils import is_new_tab_page
 if TYPE_CHECKING:
 	from browser_use.agent.views import AgentStepInfo
 	from browser_use.browser.views import BrowserStateSummary
+	from browser_use.dom.views import SerializedDOMState
 	from browser_use.filesystem.file_system import FileSystem
 
 
@@ -94,6 +95,9 @@ class AgentMessagePrompt:
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		dom_representation: Literal['full', 'diff'] = 'full',
+		previous_dom_state: 'SerializedDOMState | None' = None,
+		dom_viewport_margin: int | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -110,18 +114,46 @@ class AgentMessagePrompt:
 		self.vision_detail_level = vision_detail_level
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images or []
+		# With 'diff', only the changes since previous_dom_state are listed when that is shorter than the full list,
+		# the caller has to keep the full list of previous_dom_state in the model's context
+		self.dom_representation = dom_representation
+		self.previous_dom_state = previous_dom_state
+		self.dom_diff_sent = False
+		# Only list elements within this many pixels of the viewport, off-screen sections are summarized
+		self.dom_viewport_margin = dom_viewport_margin
+		page_info = browser_state_summary.page_info
+		self.dom_viewport_height = page_info.viewport_height if page_info else None
 		assert self.browser_state
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='_get_browser_state_description')
 	def _get_browser_state_description(self) -> str:
-		elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
+		dom_state = self.browser_state.dom_state
+		# Stop serializing once the budget is used up instead of serializing everything and slicing it
+		elements_text = dom_state.llm_representation(
+			include_attributes=self.include_attributes,
+			max_chars=self.max_clickable_elements_length,
+			viewport_margin=self.dom_viewport_margin,
+			viewport_height=self.dom_viewport_height,
+		)
 
-		if len(elements_text) > self.max_clickable_elements_length:
-			elements_text = elements_text[: self.max_clickable_elements_length]
+		if dom_state.truncated:
 			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
 		else:
 			truncated_text = ''
 
+		diff_text = None
+		if self.dom_representation == 'diff' and self.previous_dom_state is not None and elements_text:
+			diff_text = dom_state.diff_representation(
+				self.previous_dom_state,
+				include_attributes=self.include_attributes,
+				viewport_margin=self.dom_viewport_margin,
+				viewport_height=self.dom_viewport_height,
+			)
+			# Fall back to the full list when it is not longer than the diff
+			if len(diff_text) >= len(elements_text):
+				diff_text = None
+		self.dom_diff_sent = diff_text is not None
+
 		has_content_above = (self.browser_state.pixels_above or 0) > 0
 		has_content_below = (self.browser_state.pixels_below or 0) > 0
 
@@ -141,7 +173,10 @@ class AgentMessagePrompt:
 			page_info_text += f'{total_pages:.1f} total pages'
 			page_info_text += '</page_info>\n'
 			# , at {current_page_position:.0%} of page
-		if elements_text != '':
+		if diff_text is not None:
+			elements_text = diff_text
+			truncated_text = ' (only the changes since <browser_state_keyframe>: + added, - removed, indices are current)'
+		elif elements_text != '':
 			if has_content_above:
 				if self.browser_state.page_info:
 					pi = self.browser_state.page_info
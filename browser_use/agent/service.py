@@ -7,6 +7,7 @@ import re
 import tempfile
 import time
 from collections.abc import Awaitable, Callable
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Generic, Literal, TypeVar
@@ -57,7 +58,7 @@ from browser_use.agent.views import (
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.config import CONFIG
-from browser_use.dom.views import DOMInteractedElement
+from browser_use.dom.views import DOMInteractedElement, DOMSerializationStats, SerializedDOMState
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
 from browser_use.sync import CloudSync
@@ -181,6 +182,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
+		dom_representation: Literal['full', 'diff'] = 'full',
+		dom_viewport_margin: int | None = None,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
@@ -267,6 +270,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
+			dom_representation=dom_representation,
+			dom_viewport_margin=dom_viewport_margin,
 		)
 
 		# Token cost service
@@ -354,6 +359,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_tool_call_examples=self.settings.include_tool_call_examples,
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
+			dom_representation=self.settings.dom_representation,
+			dom_viewport_margin=self.settings.dom_viewport_margin,
 		)
 
 		if self.sensitive_data:
@@ -440,6 +447,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# llm_representation cache counters for the current run, collected from each step's SerializedDOMState
+		self.dom_serialization_stats = DOMSerializationStats()
+		self._counted_dom_state: SerializedDOMState | None = None
+		self._counted_dom_state_stats = DOMSerializationStats()
+
 	@property
 	def logger(self) -> logging.Logger:
 		"""Get instance-specific logger with task ID in the name"""
@@ -630,6 +642,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		self.step_start_cdp_commands = self.browser_session.cdp_commands_sent if self.browser_session else 0
 
 		browser_state_summary = None
 
@@ -807,14 +820,21 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def _finalize(self, browser_state_summary: BrowserStateSummary | None) -> None:
 		"""Finalize the step with history, logging, and events"""
 		step_end_time = time.time()
+		if browser_state_summary:
+			self._collect_dom_serialization_stats(browser_state_summary.dom_state)
+
 		if not self.state.last_result:
 			return
 
 		if browser_state_summary:
+			cdp_commands = self.browser_session.cdp_commands_sent - self.step_start_cdp_commands if self.browser_session else None
+			page_settle = browser_state_summary.page_settle
 			metadata = StepMetadata(
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				cdp_commands=cdp_commands,
+				page_settle_wait=page_settle.waited if page_settle else None,
 			)
 
 			# Use _make_history_item like main branch
@@ -848,6 +868,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Increment step counter after step is fully completed
 		self.state.n_steps += 1
 
+	def _collect_dom_serialization_stats(self, dom_state: SerializedDOMState) -> None:
+		"""Add the serializations done (and avoided) on this step's DOM state to the run totals"""
+		# The cached browser state can be reused across steps, so only count what happened since we last looked
+		if dom_state is not self._counted_dom_state:
+			self._counted_dom_state = dom_state
+			self._counted_dom_state_stats = DOMSerializationStats()
+
+		current = replace(dom_state.serialization_stats)
+		self.dom_serialization_stats += current - self._counted_dom_state_stats
+		self._counted_dom_state_stats = current
+
 	async def _force_done_after_last_step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Handle special processing for the last step"""
 		if step_info and step_info.is_last_step():
@@ -1254,8 +1285,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		status_parts = [part for part in [success_indicator, failure_indicator] if part]
 		status_str = ' | '.join(status_parts) if status_parts else '✅ 0'
 
+		cdp_commands = self.browser_session.cdp_commands_sent - self.step_start_cdp_commands if self.browser_session else 0
 		self.logger.debug(
-			f'📍 Step {self.state.n_steps}: Ran {action_count} action{"" if action_count == 1 else "s"} in {step_duration:.2f}s: {status_str}'
+			f'📍 Step {self.state.n_steps}: Ran {action_count} action{"" if action_count == 1 else "s"} in {step_duration:.2f}s '
+			f'({cdp_commands} CDP commands): {status_str}'
 		)
 
 	def _log_agent_event(self, max_steps: int, agent_run_error: str | None = None) -> None:
@@ -1411,6 +1444,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			# Initialize timing for session and task
 			self._session_start_time = time.time()
+			self.dom_serialization_stats = DOMSerializationStats()
 			self._task_start_time = self._session_start_time  # Initialize task start time
 
 			# Only dispatch session events if this is the first run
@@ -1555,6 +1589,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Log token usage summary
 			await self.token_cost_service.log_usage_summary()
 
+			stats = self.dom_serialization_stats
+			self.logger.debug(
+				f'🧮 DOM serialization: {stats.serializations} serialized, {stats.cache_hits} served from cache '
+				f'({stats.chars_reused:,} chars not re-serialized)'
+			)
+			if self.browser_session:
+				pool_stats = self.browser_session.cdp_session_pool_stats
+				self.logger.debug(
+					f'🔌 CDP sessions: {pool_stats.created} attached, {pool_stats.reused} reused, {pool_stats.evicted} detached, '
+					f'{pool_stats.attached_sessions} pooled over {pool_stats.open_sockets} sockets'
+				)
+
 			# Unregister signal handlers before cleanup
 			signal_handler.unregister()
 
@@ -50,6 +50,8 @@ class AgentSettings(BaseModel):
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
+	dom_representation: Literal['full', 'diff'] = 'full'  # 'diff': after the first step, only send the element changes
+	dom_viewport_margin: int | None = None  # Only list elements within this many px of the viewport, summarize the rest
 
 
 class AgentState(BaseModel):
@@ -129,6 +131,8 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	cdp_commands: int | None = None  # CDP commands the browser session sent during the step
+	page_settle_wait: float | None = None  # Seconds the browser state capture waited for the page to settle
 
 	@property
 	def duration_seconds(self) -> float:
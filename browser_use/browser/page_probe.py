@@ -0,0 +1,120 @@
+"""
+One round of page metadata for a target: a single Runtime.evaluate (document.readyState, iframe scroll positions) sent
+together with a single Page.getLayoutMetrics.
+
+During a browser state request `BrowserSession.get_page_probe()` shares one probe per target between the DOM service
+(device pixel ratio), `DOMWatchdog._get_page_info()` (viewport and scroll) and the screenshot highlighting (viewport
+offset), instead of each of them fetching the layout metrics on its own.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.target import TargetID
+
+from browser_use.browser.views import PageInfo
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+PAGE_PROBE_JS = """
+(() => {
+	const iframeScrollPositions = {};
+	document.querySelectorAll('iframe').forEach((iframe, index) => {
+		try {
+			const doc = iframe.contentDocument || iframe.contentWindow.document;
+			if (doc) {
+				iframeScrollPositions[index] = {
+					scrollTop: doc.documentElement.scrollTop || doc.body.scrollTop || 0,
+					scrollLeft: doc.documentElement.scrollLeft || doc.body.scrollLeft || 0
+				};
+			}
+		} catch (e) {
+			// Cross-origin iframe, can't access
+		}
+	});
+	return {readyState: document.readyState, iframeScrollPositions};
+})()
+"""
+
+
+@dataclass
+class PageProbe:
+	"""Page metadata of one target, taken at a single point in time"""
+
+	target_id: TargetID
+	layout_metrics: dict[str, Any]
+	ready_state: str | None = None
+	iframe_scroll_positions: dict[str, dict[str, float]] = field(default_factory=dict)
+
+	@property
+	def device_pixel_ratio(self) -> float:
+		"""Device pixels per CSS pixel, from the visual viewport."""
+		visual_viewport = self.layout_metrics.get('visualViewport', {})
+		css_visual_viewport = self.layout_metrics.get('cssVisualViewport', {})
+		css_layout_viewport = self.layout_metrics.get('cssLayoutViewport', {})
+		css_width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1280.0))
+		device_width = visual_viewport.get('clientWidth', css_width)
+		return float(device_width / css_width) if css_width > 0 else 1.0
+
+	@property
+	def viewport_offset(self) -> tuple[int, int]:
+		"""Scroll position of the visual viewport in CSS pixels."""
+		css_visual_viewport = self.layout_metrics.get('cssVisualViewport', {})
+		return int(css_visual_viewport.get('pageX', 0)), int(css_visual_viewport.get('pageY', 0))
+
+	def page_info(self) -> PageInfo:
+		"""Viewport, page dimensions and scroll information in CSS pixels."""
+		layout_viewport = self.layout_metrics.get('layoutViewport', {})
+		css_visual_viewport = self.layout_metrics.get('cssVisualViewport', {})
+		css_layout_viewport = self.layout_metrics.get('cssLayoutViewport', {})
+		content_size = self.layout_metrics.get('contentSize', {})
+		device_pixel_ratio = self.device_pixel_ratio
+
+		# For viewport dimensions, use CSS pixels (what JavaScript sees)
+		# Prioritize CSS layout viewport, then fall back to layout viewport
+		viewport_width = int(css_layout_viewport.get('clientWidth') or layout_viewport.get('clientWidth', 1280))
+		viewport_height = int(css_layout_viewport.get('clientHeight') or layout_viewport.get('clientHeight', 720))
+
+		# Content size is typically in device pixels, so convert to CSS pixels by dividing by device pixel ratio
+		raw_page_width = content_size.get('width', viewport_width * device_pixel_ratio)
+		raw_page_height = content_size.get('height', viewport_height * device_pixel_ratio)
+		page_width = int(raw_page_width / device_pixel_ratio)
+		page_height = int(raw_page_height / device_pixel_ratio)
+
+		# For scroll position, use CSS visual viewport if available, otherwise CSS layout viewport
+		scroll_x = int(css_visual_viewport.get('pageX') or css_layout_viewport.get('pageX', 0))
+		scroll_y = int(css_visual_viewport.get('pageY') or css_layout_viewport.get('pageY', 0))
+
+		return PageInfo(
+			viewport_width=viewport_width,
+			viewport_height=viewport_height,
+			page_width=page_width,
+			page_height=page_height,
+			scroll_x=scroll_x,
+			scroll_y=scroll_y,
+			pixels_above=scroll_y,
+			pixels_below=max(0, page_height - viewport_height - scroll_y),
+			pixels_left=scroll_x,
+			pixels_right=max(0, page_width - viewport_width - scroll_x),
+		)
+
+
+async def probe_page(cdp_session: 'CDPSession') -> PageProbe:
+	"""Send the metadata script and Page.getLayoutMetrics together, the script failing only leaves its fields empty."""
+	evaluate, layout_metrics = await asyncio.gather(
+		cdp_session.cdp_client.send.Runtime.evaluate(
+			params={'expression': PAGE_PROBE_JS, 'returnByValue': True}, session_id=cdp_session.session_id
+		),
+		cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id),
+		return_exceptions=True,
+	)
+	if isinstance(layout_metrics, BaseException):
+		raise layout_metrics
+
+	probe = PageProbe(target_id=cdp_session.target_id, layout_metrics=dict(layout_metrics))
+	if not isinstance(evaluate, BaseException) and isinstance(value := evaluate.get('result', {}).get('value'), dict):
+		probe.ready_state = value.get('readyState')
+		probe.iframe_scroll_positions = value.get('iframeScrollPositions') or {}
+	return probe
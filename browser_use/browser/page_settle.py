@@ -0,0 +1,226 @@
+"""
+Page settle detection from CDP events instead of fixed sleeps.
+
+`PageSettleTracker` follows the requests in flight (Network.requestWillBeSent / loadingFinished / loadingFailed) and the
+frame lifecycle (Page.lifecycleEvent) of every target session it watches. `wait_until_settled()` returns as soon as
+no frame is loading, no request that matters was in flight for the network idle time and the DOM did not change for
+the quiet period, or when the maximum wait is reached. Both periods count from the start of the wait at the earliest:
+a page that was idle before an action still gets the time to start the navigation or requests the action set off.
+
+Websockets, event streams, beacons, analytics and requests in flight for longer than `LONG_POLL_SECONDS` (long polling,
+streaming) never keep a page from settling.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from cdp_use import CDPClient
+
+from browser_use.browser.views import PageSettleResult
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+IGNORED_RESOURCE_TYPES = frozenset({'WebSocket', 'EventSource', 'Ping', 'CSPViolationReport', 'Manifest'})
+IGNORED_URL_SCHEMES = ('data:', 'blob:', 'chrome-extension:')
+IGNORED_URL_PATTERNS = (
+	'google-analytics.com',
+	'googletagmanager.com',
+	'doubleclick.net',
+	'connect.facebook.net',
+	'facebook.com/tr',
+	'hotjar.',
+	'segment.io',
+	'mixpanel.com',
+	'sentry.io',
+	'clarity.ms',
+	'nr-data.net',
+	'amplitude.com',
+	'fullstory.com',
+)
+LONG_POLL_SECONDS = 5.0
+
+# Resolves true once the document is complete and no node was added, removed or changed its text for `quietMs` since
+# the call at the earliest, or false after `timeoutMs`. The observer is installed once per document and keeps the time
+# of the last mutation.
+DOM_QUIET_JS = """
+((quietMs, timeoutMs) => new Promise(resolve => {
+	if (!window.__browserUseLastMutation) {
+		window.__browserUseLastMutation = {time: performance.now()};
+		new MutationObserver(() => { window.__browserUseLastMutation.time = performance.now(); })
+			.observe(document, {childList: true, subtree: true, characterData: true});
+	}
+	const start = performance.now();
+	const check = () => {
+		const now = performance.now();
+		const quietFor = now - Math.max(window.__browserUseLastMutation.time, start);
+		if (document.readyState === 'complete' && quietFor >= quietMs) return resolve(true);
+		if (now - start >= timeoutMs) return resolve(false);
+		setTimeout(check, Math.min(Math.max(quietMs - quietFor, 10), 100, timeoutMs - (now - start)));
+	};
+	check();
+}))
+"""
+
+
+@dataclass
+class _PageActivity:
+	"""Network and lifecycle state of one target session"""
+
+	in_flight: dict[str, float] = field(default_factory=dict)  # request id -> time it was sent
+	loading_frames: dict[str, float] = field(default_factory=dict)  # frame id -> lifecycle 'init', until its 'load'
+	last_activity: float = field(default_factory=time.monotonic)
+	changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+	def touch(self) -> None:
+		self.last_activity = time.monotonic()
+		self.changed.set()
+
+
+class PageSettleTracker:
+	"""Tracks requests in flight and frame loading of the target sessions it watches, from CDP events"""
+
+	def __init__(self, long_poll_seconds: float = LONG_POLL_SECONDS):
+		self.long_poll_seconds = long_poll_seconds
+		self._pages: dict[str, _PageActivity] = {}  # session id -> activity
+		self._clients: set[CDPClient] = set()
+
+	def register(self, cdp_client: CDPClient) -> None:
+		"""Route the network and lifecycle events of `cdp_client` to the tracker (once per client)."""
+		if cdp_client in self._clients:
+			return
+		self._clients.add(cdp_client)
+		cdp_client.register.Network.requestWillBeSent(self.on_request_will_be_sent)  # type: ignore[arg-type]
+		cdp_client.register.Network.loadingFinished(self.on_request_done)  # type: ignore[arg-type]
+		cdp_client.register.Network.loadingFailed(self.on_request_done)  # type: ignore[arg-type]
+		cdp_client.register.Page.lifecycleEvent(self.on_lifecycle_event)  # type: ignore[arg-type]
+
+	async def watch(self, cdp_session: 'CDPSession') -> None:
+		"""Start tracking a target session: enable its network events and lifecycle events."""
+		if cdp_session.session_id in self._pages:
+			return
+		self.register(cdp_session.cdp_client)
+		self._pages[cdp_session.session_id] = _PageActivity()
+		try:
+			await asyncio.gather(
+				cdp_session.cdp_client.send.Network.enable(session_id=cdp_session.session_id),
+				cdp_session.cdp_client.send.Page.setLifecycleEventsEnabled(
+					params={'enabled': True}, session_id=cdp_session.session_id
+				),
+			)
+		except Exception:
+			self._pages.pop(cdp_session.session_id, None)
+			raise
+
+	def retain(self, session_ids: Iterable[str]) -> None:
+		"""Forget the sessions not in `session_ids`, whose targets were detached or destroyed."""
+		keep = set(session_ids)
+		for session_id in [session_id for session_id in self._pages if session_id not in keep]:
+			del self._pages[session_id]
+
+	def is_ignored(self, event: dict[str, Any]) -> bool:
+		"""Whether a request can never keep the page from settling."""
+		if event.get('type') in IGNORED_RESOURCE_TYPES:
+			return True
+		url = event.get('request', {}).get('url', '')
+		return url.startswith(IGNORED_URL_SCHEMES) or any(pattern in url for pattern in IGNORED_URL_PATTERNS)
+
+	def on_request_will_be_sent(self, event: dict[str, Any], session_id: str | None = None) -> None:
+		page = self._pages.get(session_id or '')
+		if page is None or self.is_ignored(event):
+			return
+		# redirects are sent again under the same request id
+		page.in_flight[event['requestId']] = time.monotonic()
+		self._prune(page)
+		page.touch()
+
+	def on_request_done(self, event: dict[str, Any], session_id: str | None = None) -> None:
+		page = self._pages.get(session_id or '')
+		if page is not None and page.in_flight.pop(event['requestId'], None) is not None:
+			page.touch()
+
+	def on_lifecycle_event(self, event: dict[str, Any], session_id: str | None = None) -> None:
+		page = self._pages.get(session_id or '')
+		if page is None:
+			return
+		if event['name'] == 'init':
+			page.loading_frames[event['frameId']] = time.monotonic()
+		elif event['name'] == 'load':
+			page.loading_frames.pop(event['frameId'], None)
+		else:
+			return
+		page.touch()
+
+	def _prune(self, page: _PageActivity) -> None:
+		"""Drop the requests (long polls that may never finish) and frame loads older than `long_poll_seconds`."""
+		cutoff = time.monotonic() - self.long_poll_seconds
+		page.in_flight = {request_id: sent for request_id, sent in page.in_flight.items() if sent > cutoff}
+		page.loading_frames = {frame_id: init for frame_id, init in page.loading_frames.items() if init > cutoff}
+
+	def _busy_since(self, page: _PageActivity) -> list[float]:
+		"""Start times of the requests in flight and frames loading that still keep the page from settling."""
+		self._prune(page)
+		return [*page.in_flight.values(), *page.loading_frames.values()]
+
+	async def wait_for_network_idle(self, session_id: str, idle_time: float, start: float, deadline: float) -> bool:
+		"""Wait until no frame is loading and no request was in flight for `idle_time` since `start`, False at the deadline."""
+		page = self._pages[session_id]
+		while True:
+			# clear before looking at the state, so an event arriving in between wakes the wait below
+			page.changed.clear()
+			now = time.monotonic()
+			busy_since = self._busy_since(page)
+			if busy_since:
+				# wake up when the oldest request turns into a long poll at the latest
+				timeout = min(busy_since) + self.long_poll_seconds - now
+			else:
+				timeout = max(page.last_activity, start) + idle_time - now
+				if timeout <= 0:
+					return True
+			if now >= deadline:
+				return False
+			try:
+				await asyncio.wait_for(page.changed.wait(), timeout=min(timeout, deadline - now))
+			except TimeoutError:
+				pass
+
+	async def wait_for_dom_quiet(self, cdp_session: 'CDPSession', quiet_time: float, deadline: float) -> bool:
+		"""Wait until the document is complete and the DOM did not change for `quiet_time`, False at the deadline."""
+		while (remaining := deadline - time.monotonic()) > 0:
+			try:
+				result = await cdp_session.cdp_client.send.Runtime.evaluate(
+					params={
+						'expression': f'{DOM_QUIET_JS}({int(quiet_time * 1000)}, {int(remaining * 1000)})',
+						'awaitPromise': True,
+						'returnByValue': True,
+					},
+					session_id=cdp_session.session_id,
+				)
+				return bool(result.get('result', {}).get('value'))
+			except Exception:
+				# the document was replaced while waiting, check the new one
+				await asyncio.sleep(min(0.05, max(remaining, 0)))
+		return False
+
+	async def wait_until_settled(
+		self, cdp_session: 'CDPSession', network_idle_time: float, dom_quiet_time: float, max_wait: float
+	) -> PageSettleResult:
+		"""Wait for the network to be idle and the DOM to be quiet, at most `max_wait` seconds."""
+		start = time.monotonic()
+		deadline = start + max_wait
+		await self.watch(cdp_session)
+		network_idle, dom_quiet = await asyncio.gather(
+			self.wait_for_network_idle(cdp_session.session_id, network_idle_time, start, deadline),
+			self.wait_for_dom_quiet(cdp_session, dom_quiet_time, deadline),
+		)
+		page = self._pages[cdp_session.session_id]
+		self._prune(page)
+		return PageSettleResult(
+			waited=time.monotonic() - start,
+			network_idle=network_idle,
+			dom_quiet=dom_quiet,
+			in_flight_requests=len(page.in_flight),
+		)
@@ -599,11 +599,46 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=5,
 		description='Maximum depth for cross-origin iframe recursion (default: 5 levels deep).',
 	)
+	max_concurrent_iframe_fetches: int = Field(
+		ge=1,
+		default=4,
+		description='Maximum number of cross-origin iframe documents fetched at the same time while building the DOM tree.',
+	)
+	tab_registry_check: bool = Field(
+		default=False,
+		description='Compare the event-maintained tab registry against a fresh Target.getTargets on every get_tabs() call and log any mismatch. For debugging.',
+	)
+	dedicated_cdp_sockets: bool = Field(
+		default=False,
+		description='Open a dedicated WebSocket connection for every new target session instead of multiplexing all sessions over the root CDP connection.',
+	)
+	cdp_session_pool_size: int = Field(
+		default=32,
+		ge=0,
+		description='Maximum number of target sessions kept attached in the session pool, the least recently used ones are detached beyond that between steps. 0 = unbounded.',
+	)
+	cdp_session_idle_timeout: float | None = Field(
+		default=300.0,
+		description='Detach pooled target sessions that were not used for this many seconds, checked between steps. None = never.',
+	)
 
 	# --- Page load/wait timings ---
 
-	minimum_wait_page_load_time: float = Field(default=0.25, description='Minimum time to wait before capturing page state.')
-	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
+	minimum_wait_page_load_time: float = Field(
+		default=0.25,
+		description='Minimum time to wait before capturing page state. With page_settle_detection, how long the DOM must not change.',
+	)
+	wait_for_network_idle_page_load_time: float = Field(
+		default=0.5,
+		description='Time to wait for network idle. With page_settle_detection, how long no request may have been in flight.',
+	)
+	maximum_wait_page_load_time: float = Field(
+		default=5.0, description='Maximum time to wait for the page to settle before capturing page state.'
+	)
+	page_settle_detection: bool = Field(
+		default=True,
+		description='Wait for network and lifecycle events and a DOM quiet period instead of sleeping the page load times.',
+	)
 
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
 
@@ -613,7 +648,35 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	filter_highlight_ids: bool = Field(
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
-	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	paint_order_filtering: bool | Literal['grid', 'rect_union'] = Field(
+		default=True,
+		description="Enable paint order filtering. Slightly experimental. True uses the spatial-grid engine ('grid'), 'rect_union' selects the legacy RectUnionPure engine.",
+	)
+	iterative_dom_tree_builder: bool = Field(
+		default=True,
+		description='Build the enhanced DOM tree with the iterative, synchronous builder. Set to False to use the legacy recursive builder.',
+	)
+	live_dom_mirror: bool = Field(
+		default=False,
+		description='Keep a mirror of the page DOM updated from CDP mutation events instead of re-fetching the full document every step. Requires iterative_dom_tree_builder. Experimental.',
+	)
+	reuse_unchanged_dom_state: bool = Field(
+		default=False,
+		description='Fingerprint the page snapshot on every step and reuse the previous serialized DOM state when nothing changed, instead of rebuilding it. Costs a hash of all page payloads per step, for pages that rarely change between steps. Not used with cross_origin_iframes.',
+	)
+	dom_capture_path: str | Path | None = Field(
+		default=None,
+		description='Append the raw CDP payloads (DOM snapshot, DOM tree, AX tree) of every DOM state to this capture file, for offline replay with browser_use.dom.capture.',
+	)
+	dom_process_pool_workers: int = Field(
+		default=0,
+		ge=0,
+		description='Build and serialize the DOM in a pool of this many worker processes, shared by all browser sessions of the process and shut down with the last of them, instead of on the event loop. Workers are spawned, not forked. For hosts running many agents at once. 0 = in-process. Not used with cross_origin_iframes.',
+	)
+	ax_tree_mode: Literal['full', 'lazy', 'off'] = Field(
+		default='full',
+		description="Accessibility data per step: 'full' fetches the AX tree of every frame, 'lazy' only fetches AX nodes of candidate interactive elements, 'off' skips accessibility data (faster, slightly fewer detected elements).",
+	)
 
 	# --- Downloads ---
 	auto_download_pdfs: bool = Field(default=True, description='Automatically download PDFs when navigating to PDF viewer pages.')
@@ -9,6 +9,7 @@ import base64
 import io
 import logging
 import os
+from typing import TYPE_CHECKING
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -16,6 +17,9 @@ from browser_use.dom.views import DOMSelectorMap
 from browser_use.observability import observe_debug
 from browser_use.utils import time_execution_async
 
+if TYPE_CHECKING:
+	from browser_use.browser.page_probe import PageProbe
+
 logger = logging.getLogger(__name__)
 
 # Font cache to prevent repeated font loading and reduce memory usage
@@ -500,7 +504,11 @@ async def get_viewport_info_from_cdp(cdp_session) -> tuple[float, int, int]:
 
 @time_execution_async('create_highlighted_screenshot_async')
 async def create_highlighted_screenshot_async(
-	screenshot_b64: str, selector_map: DOMSelectorMap, cdp_session=None, filter_highlight_ids: bool = True
+	screenshot_b64: str,
+	selector_map: DOMSelectorMap,
+	cdp_session=None,
+	filter_highlight_ids: bool = True,
+	page_probe: 'PageProbe | None' = None,
 ) -> str:
 	"""Async wrapper for creating highlighted screenshots.
 
@@ -509,6 +517,7 @@ async def create_highlighted_screenshot_async(
 	    selector_map: Map of interactive elements
 	    cdp_session: CDP session for getting viewport info
 	    filter_highlight_ids: Whether to filter element IDs based on meaningful text
+	    page_probe: Page metadata already fetched for this state, used for the viewport info instead of the CDP session
 
 	Returns:
 	    Base64 encoded highlighted screenshot
@@ -518,7 +527,10 @@ async def create_highlighted_screenshot_async(
 	viewport_offset_x = 0
 	viewport_offset_y = 0
 
-	if cdp_session:
+	if page_probe:
+		device_pixel_ratio = page_probe.device_pixel_ratio
+		viewport_offset_x, viewport_offset_y = page_probe.viewport_offset
+	elif cdp_session:
 		try:
 			device_pixel_ratio, viewport_offset_x, viewport_offset_y = await get_viewport_info_from_cdp(cdp_session)
 		except Exception as e:
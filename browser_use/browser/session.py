@@ -2,6 +2,8 @@
 
 import asyncio
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import cached_property
 from pathlib import Path
 from typing import Any, Literal, Self, cast
@@ -11,7 +13,16 @@ from bubus import EventBus
 from cdp_use import CDPClient
 from cdp_use.cdp.fetch import AuthRequiredEvent, RequestPausedEvent
 from cdp_use.cdp.network import Cookie
-from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
+from cdp_use.cdp.page import FrameAttachedEvent, FrameDetachedEvent, FrameNavigatedEvent
+from cdp_use.cdp.target import (
+	AttachedToTargetEvent,
+	DetachedFromTargetEvent,
+	SessionID,
+	TargetCreatedEvent,
+	TargetDestroyedEvent,
+	TargetID,
+	TargetInfoChangedEvent,
+)
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
 
@@ -36,8 +47,10 @@ from browser_use.browser.events import (
 	TabClosedEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.page_probe import PageProbe, probe_page
 from browser_use.browser.profile import BrowserProfile, ProxySettings
-from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.browser.views import BrowserStateSummary, CDPSessionPoolStats, TabInfo
+from browser_use.dom.offload import acquire_shared_process_pool, release_shared_process_pool
 from browser_use.dom.views import EnhancedDOMTreeNode, TargetInfo
 from browser_use.observability import observe_debug
 from browser_use.utils import _log_pretty_url, is_new_tab_page
@@ -67,6 +80,9 @@ class CDPSession(BaseModel):
 
 	# Track if this session owns its CDP client (for cleanup)
 	owns_cdp_client: bool = False
+	last_used: float = Field(default_factory=time.monotonic)
+	# Runtime.runIfWaitingForDebugger was sent, the target cannot be paused waiting for us anymore
+	debugger_released: bool = False
 
 	@classmethod
 	async def for_target(
@@ -148,7 +164,7 @@ class CDPSession(BaseModel):
 			raise RuntimeError(f'Failed to enable requested CDP domain: {results}')
 
 		# in case 'Debugger' domain is enabled, disable breakpoints on the page so it doesnt pause on crashes / debugger statements
-		# also covered by Runtime.runIfWaitingForDebugger() calls in get_or_create_cdp_session()
+		# also covered by the Runtime.runIfWaitingForDebugger() call in BrowserSession._activate_target()
 		try:
 			await self.cdp_client.send.Debugger.setSkipAllPauses(params={'skip': True}, session_id=self.session_id)
 			# if 'Debugger' not in domains:
@@ -171,6 +187,16 @@ class CDPSession(BaseModel):
 			except Exception:
 				pass  # Ignore errors during cleanup
 
+	async def detach(self) -> None:
+		"""Detach from the target, closing the connection instead if this session owns its CDP client."""
+		if self.owns_cdp_client:
+			await self.disconnect()
+			return
+		try:
+			await self.cdp_client.send.Target.detachFromTarget(params={'sessionId': self.session_id})
+		except Exception:
+			pass  # The target may already be gone
+
 	async def get_tab_info(self) -> TabInfo:
 		target_info = await self.get_target_info()
 		return TabInfo(
@@ -184,6 +210,177 @@ class CDPSession(BaseModel):
 		return result['targetInfo']
 
 
+class FrameRegistry:
+	"""Frame hierarchy built by `BrowserSession.get_all_frames()`, kept current from CDP frame and target events.
+
+	Frame navigations and removals are applied in place. Anything that can change which target owns a frame (new
+	frames, OOPIF swaps, targets attaching or detaching) drops the hierarchy, so the next lookup rebuilds it.
+	"""
+
+	def __init__(self) -> None:
+		self.all_frames: dict[str, dict] | None = None
+		self.target_sessions: dict[str, str] = {}
+		self.focus_target_id: str | None = None
+		self.generation = 0  # bumped on every event, so a build that raced an event is not stored
+		self.builds = 0
+		self.hits = 0
+		self._clients: set[CDPClient] = set()
+
+	def get(self, focus_target_id: str | None) -> tuple[dict[str, dict], dict[str, str]] | None:
+		if self.all_frames is None or focus_target_id != self.focus_target_id:
+			return None
+		self.hits += 1
+		return dict(self.all_frames), dict(self.target_sessions)
+
+	def store(
+		self, all_frames: dict[str, dict], target_sessions: dict[str, str], focus_target_id: str | None, generation: int
+	) -> None:
+		self.builds += 1
+		if generation != self.generation:
+			return
+		self.all_frames = dict(all_frames)
+		self.target_sessions = dict(target_sessions)
+		self.focus_target_id = focus_target_id
+
+	def invalidate(self) -> None:
+		self.generation += 1
+		self.all_frames = None
+
+	def register(self, cdp_client: CDPClient, root: bool = False) -> None:
+		"""Subscribe to the frame events of every session on this client (once per client).
+
+		Target.attachedToTarget is only registered on the root client, and chained by the proxy auth handler.
+		"""
+		if cdp_client in self._clients:
+			return
+		self._clients.add(cdp_client)
+		cdp_client.register.Page.frameAttached(self.on_frame_attached)
+		cdp_client.register.Page.frameDetached(self.on_frame_detached)
+		cdp_client.register.Page.frameNavigated(self.on_frame_navigated)
+		cdp_client.register.Target.detachedFromTarget(self.on_target_changed)
+		if root:
+			cdp_client.register.Target.attachedToTarget(self.on_target_changed)
+
+	def on_frame_attached(self, event: FrameAttachedEvent, session_id: SessionID | None = None) -> None:
+		# The new frame's owner node (and whether it ends up in its own target) is only known after a rebuild
+		if self.all_frames is None or event['parentFrameId'] in self.all_frames:
+			self.invalidate()
+
+	def on_frame_detached(self, event: FrameDetachedEvent, session_id: SessionID | None = None) -> None:
+		self.generation += 1
+		if self.all_frames is None or event['frameId'] not in self.all_frames:
+			return
+		if event.get('reason') == 'swap':
+			# The frame moved to its own process / target
+			self.invalidate()
+			return
+
+		frame_info = self.all_frames[event['frameId']]
+		parent_info = self.all_frames.get(frame_info.get('parentFrameId') or '')
+		if parent_info and event['frameId'] in parent_info['childFrameIds']:
+			parent_info['childFrameIds'].remove(event['frameId'])
+
+		stack = [event['frameId']]
+		while stack:
+			removed = self.all_frames.pop(stack.pop(), None)
+			if removed:
+				stack.extend(removed['childFrameIds'])
+
+	def on_frame_navigated(self, event: FrameNavigatedEvent, session_id: SessionID | None = None) -> None:
+		self.generation += 1
+		if self.all_frames is None:
+			return
+		frame = event['frame']
+		frame_info = self.all_frames.get(frame['id'])
+		# A main frame navigation changes the target url (and so isValidTarget), rebuild for those
+		if (
+			frame_info is None
+			or not frame.get('parentId')
+			or frame.get('crossOriginIsolatedContextType') != frame_info.get('crossOriginIsolatedContextType')
+		):
+			self.invalidate()
+			return
+		frame_info.update(frame)
+
+	def on_target_changed(
+		self, event: AttachedToTargetEvent | DetachedFromTargetEvent, session_id: SessionID | None = None
+	) -> None:
+		self.invalidate()
+
+
+class TabRegistry:
+	"""Targets of the browser read by `BrowserSession.get_tabs()`, kept current from CDP target discovery events.
+
+	Seeded once from Target.getTargets, then Target.targetCreated / targetInfoChanged / targetDestroyed update the url,
+	title, type and opener of every target in place, so reading the tabs needs no CDP round trip.
+
+	Also remembers which target was last activated, until a new page or its destruction may have moved the foreground.
+	"""
+
+	def __init__(self) -> None:
+		self.targets: dict[str, TargetInfo] | None = None
+		self.discovering = False  # set once Target.setDiscoverTargets succeeded, the events only arrive after that
+		self.generation = 0  # bumped on every event, so a seed that raced an event is not stored
+		self.builds = 0
+		self.hits = 0
+		self.mismatches = 0
+		self.active_target_id: str | None = None  # last target brought to the foreground with Target.activateTarget
+		self._clients: set[CDPClient] = set()
+
+	def get(self) -> list[TargetInfo] | None:
+		if self.targets is None:
+			return None
+		self.hits += 1
+		return list(self.targets.values())
+
+	def store(self, target_infos: list[TargetInfo], generation: int) -> None:
+		self.builds += 1
+		if generation != self.generation or not self.discovering:
+			return
+		self.targets = {target_info['targetId']: target_info for target_info in target_infos}
+
+	def diff(self, target_infos: list[TargetInfo]) -> list[str]:
+		"""Describe where the registry disagrees with a fresh Target.getTargets result."""
+		known = self.targets or {}
+		fresh = {target_info['targetId']: target_info for target_info in target_infos}
+		problems = [f'missing {target_id[-4:]} {_log_pretty_url(fresh[target_id]["url"])}' for target_id in fresh.keys() - known]
+		problems += [f'stale {target_id[-4:]} {_log_pretty_url(known[target_id]["url"])}' for target_id in known.keys() - fresh]
+		for target_id in fresh.keys() & known.keys():
+			for key in ('url', 'title', 'type', 'openerId'):
+				if fresh[target_id].get(key) != known[target_id].get(key):
+					problems.append(f'{target_id[-4:]} {key}: {known[target_id].get(key)!r} != {fresh[target_id].get(key)!r}')
+		return problems
+
+	def register(self, cdp_client: CDPClient) -> None:
+		"""Subscribe to the target discovery events of the root client (once per client)."""
+		if cdp_client in self._clients:
+			return
+		self._clients.add(cdp_client)
+		cdp_client.register.Target.targetCreated(self.on_target_created)
+		cdp_client.register.Target.targetInfoChanged(self.on_target_info_changed)
+		cdp_client.register.Target.targetDestroyed(self.on_target_destroyed)
+
+	def on_target_created(self, event: TargetCreatedEvent, session_id: SessionID | None = None) -> None:
+		self.generation += 1
+		if event['targetInfo']['type'] == 'page':
+			# New tabs and popups can come to the foreground on their own
+			self.active_target_id = None
+		if self.targets is not None:
+			self.targets[event['targetInfo']['targetId']] = event['targetInfo']
+
+	def on_target_info_changed(self, event: TargetInfoChangedEvent, session_id: SessionID | None = None) -> None:
+		self.generation += 1
+		if self.targets is not None:
+			self.targets[event['targetInfo']['targetId']] = event['targetInfo']
+
+	def on_target_destroyed(self, event: TargetDestroyedEvent, session_id: SessionID | None = None) -> None:
+		self.generation += 1
+		if event['targetId'] == self.active_target_id:
+			self.active_target_id = None
+		if self.targets is not None:
+			self.targets.pop(event['targetId'], None)
+
+
 class BrowserSession(BaseModel):
 	"""Event-driven browser session with backwards compatibility.
 
@@ -263,6 +460,8 @@ class BrowserSession(BaseModel):
 		window_position: dict | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
+		maximum_wait_page_load_time: float | None = None,
+		page_settle_detection: bool | None = None,
 		wait_between_actions: float | None = None,
 		filter_highlight_ids: bool | None = None,
 		auto_download_pdfs: bool | None = None,
@@ -271,7 +470,10 @@ class BrowserSession(BaseModel):
 		# DOM extraction layer configuration
 		cross_origin_iframes: bool | None = None,
 		highlight_elements: bool | None = None,
-		paint_order_filtering: bool | None = None,
+		paint_order_filtering: bool | Literal['grid', 'rect_union'] | None = None,
+		iterative_dom_tree_builder: bool | None = None,
+		live_dom_mirror: bool | None = None,
+		reuse_unchanged_dom_state: bool | None = None,
 		# Iframe processing limits
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
@@ -329,9 +531,15 @@ class BrowserSession(BaseModel):
 	# Mutable private state shared between watchdogs
 	_cdp_client_root: CDPClient | None = PrivateAttr(default=None)
 	_cdp_session_pool: dict[str, CDPSession] = PrivateAttr(default_factory=dict)
+	_cdp_session_stats: CDPSessionPoolStats = PrivateAttr(default_factory=CDPSessionPoolStats)
+	_cdp_commands_on_closed_sockets: int = PrivateAttr(default=0)
+	_page_probes: dict[TargetID, asyncio.Task[PageProbe]] | None = PrivateAttr(default=None)
+	_dom_process_pool: ProcessPoolExecutor | None = PrivateAttr(default=None)
 	_cached_browser_state_summary: Any = PrivateAttr(default=None)
 	_cached_selector_map: dict[int, EnhancedDOMTreeNode] = PrivateAttr(default_factory=dict)
 	_downloaded_files: list[str] = PrivateAttr(default_factory=list)  # Track files downloaded during this session
+	_frame_registry: FrameRegistry = PrivateAttr(default_factory=FrameRegistry)
+	_tab_registry: TabRegistry = PrivateAttr(default_factory=TabRegistry)
 
 	# Watchdogs
 	_crash_watchdog: Any | None = PrivateAttr(default=None)
@@ -391,11 +599,19 @@ class BrowserSession(BaseModel):
 			if hasattr(session, 'disconnect'):
 				await session.disconnect()
 		self._cdp_session_pool.clear()
+		self._cdp_session_stats = CDPSessionPoolStats()
+		self._cdp_commands_on_closed_sockets = 0
+		self.stop_page_probe_sharing()
+		if self._dom_process_pool is not None:
+			release_shared_process_pool(self._dom_process_pool)
+			self._dom_process_pool = None
 
 		self._cdp_client_root = None  # type: ignore
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
 		self._downloaded_files.clear()
+		self._frame_registry = FrameRegistry()
+		self._tab_registry = TabRegistry()
 
 		self.agent_focus = None
 		if self.is_local:
@@ -866,26 +1082,28 @@ class BrowserSession(BaseModel):
 		# Check if we already have a session for this target in the pool
 		if target_id in self._cdp_session_pool:
 			session = self._cdp_session_pool[target_id]
+			session.last_used = time.monotonic()
+			self._cdp_session_stats.reused += 1
 			if focus and self.agent_focus.target_id != target_id:
 				self.logger.debug(
 					f'[get_or_create_cdp_session] Switching agent focus from {self.agent_focus.target_id} to {target_id}'
 				)
 				self.agent_focus = session
 			if focus:
-				await session.cdp_client.send.Target.activateTarget(params={'targetId': session.target_id})
-				await session.cdp_client.send.Runtime.runIfWaitingForDebugger(session_id=session.session_id)
+				await self._activate_target(session)
 			# else:
 			# self.logger.debug(f'[get_or_create_cdp_session] Reusing existing session for {target_id} (focus={focus})')
 			return session
 
 		# If it's the current focus target, return that session
 		if self.agent_focus.target_id == target_id:
+			self.agent_focus.last_used = time.monotonic()
 			self._cdp_session_pool[target_id] = self.agent_focus
 			return self.agent_focus
 
 		# Create new session for this target
-		# Default to True for new sessions (each new target gets its own WebSocket)
-		should_use_new_socket = True if new_socket is None else new_socket
+		# Sessions are multiplexed over the root connection unless dedicated sockets are configured or requested
+		should_use_new_socket = self.browser_profile.dedicated_cdp_sockets if new_socket is None else new_socket
 		self.logger.debug(
 			f'[get_or_create_cdp_session] Creating new CDP session for target {target_id} (new_socket={should_use_new_socket})'
 		)
@@ -897,6 +1115,7 @@ class BrowserSession(BaseModel):
    			headers=self.browser_profile.headers
 		)
 		self._cdp_session_pool[target_id] = session
+		self._cdp_session_stats.created += 1
 		# log length of _cdp_session_pool
 		self.logger.debug(f'[get_or_create_cdp_session] new _cdp_session_pool length: {len(self._cdp_session_pool)}')
 
@@ -906,8 +1125,7 @@ class BrowserSession(BaseModel):
 				f'[get_or_create_cdp_session] Switching agent focus from {self.agent_focus.target_id} to {target_id}'
 			)
 			self.agent_focus = session
-			await session.cdp_client.send.Target.activateTarget(params={'targetId': session.target_id})
-			await session.cdp_client.send.Runtime.runIfWaitingForDebugger(session_id=session.session_id)
+			await self._activate_target(session)
 		else:
 			self.logger.debug(
 				f'[get_or_create_cdp_session] Created session for {target_id} without changing focus (still on {self.agent_focus.target_id})'
@@ -915,6 +1133,97 @@ class BrowserSession(BaseModel):
 
 		return session
 
+	async def _activate_target(self, session: CDPSession, force: bool = False) -> None:
+		"""Bring the target to the foreground and let it run, skipping the commands that would not change anything.
+
+		The active target is only known while target discovery events arrive, see `TabRegistry.active_target_id`.
+		Tabs brought to the front without a target event (a popup not reported yet, the user switching tabs in a
+		headful browser) are not seen, so callers that may have changed the foreground pass `force=True`.
+		All Target.activateTarget commands go through here to keep the tracked target accurate.
+		"""
+		if force or not (self._tab_registry.discovering and self._tab_registry.active_target_id == session.target_id):
+			await session.cdp_client.send.Target.activateTarget(params={'targetId': session.target_id})
+			self._tab_registry.active_target_id = session.target_id
+		if not session.debugger_released:
+			await session.cdp_client.send.Runtime.runIfWaitingForDebugger(session_id=session.session_id)
+			session.debugger_released = True
+
+	def _cdp_sessions_to_evict(self, used_since: float | None = None) -> list[CDPSession]:
+		"""Pooled sessions of closed targets, sessions idle for longer than the timeout, then least recently used ones.
+
+		The focused session and sessions used since `used_since` (still held by the step that used them) are kept,
+		even if the pool stays above its size.
+		"""
+		profile = self.browser_profile
+		focus_id = self.agent_focus.target_id if self.agent_focus else None
+		candidates = sorted(
+			(
+				session
+				for target_id, session in self._cdp_session_pool.items()
+				if target_id != focus_id and (used_since is None or session.last_used < used_since)
+			),
+			key=lambda session: session.last_used,
+		)
+		live_targets = self._tab_registry.targets
+		idle_since = time.monotonic() - profile.cdp_session_idle_timeout if profile.cdp_session_idle_timeout else None
+		evict = [
+			session
+			for session in candidates
+			if (live_targets is not None and session.target_id not in live_targets)
+			or (idle_since is not None and session.last_used < idle_since)
+		]
+		if profile.cdp_session_pool_size:
+			excess = len(self._cdp_session_pool) - len(evict) - profile.cdp_session_pool_size
+			if excess > 0:
+				evict += [session for session in candidates if session not in evict][:excess]
+		return evict
+
+	async def _evict_cdp_sessions(self, used_since: float | None = None) -> None:
+		"""Detach the pooled sessions picked by `_cdp_sessions_to_evict()`.
+
+		Only called between steps (after a browser state request), never while sessions are being created, so
+		operations holding several sessions (e.g. `get_all_frames()` on pages with many OOPIFs) keep them.
+		"""
+		evict = self._cdp_sessions_to_evict(used_since)
+		if not evict:
+			return
+		for session in evict:
+			self._cdp_session_pool.pop(session.target_id, None)
+			if session.owns_cdp_client:
+				self._cdp_commands_on_closed_sockets += session.cdp_client.msg_id
+		self._cdp_session_stats.evicted += len(evict)
+		# The frame registry maps targets to the ids of pooled sessions
+		self._frame_registry.invalidate()
+		self.logger.debug(f'[_evict_cdp_sessions] Detaching {len(evict)} unused CDP sessions from the pool')
+		await asyncio.gather(*(session.detach() for session in evict), return_exceptions=True)
+
+	@property
+	def cdp_commands_sent(self) -> int:
+		"""Number of CDP commands sent over all connections of this session so far, for per-step command counts."""
+		clients = {id(session.cdp_client): session.cdp_client for session in self._cdp_session_pool.values()}
+		if self.agent_focus:
+			clients[id(self.agent_focus.cdp_client)] = self.agent_focus.cdp_client
+		if self._cdp_client_root:
+			clients[id(self._cdp_client_root)] = self._cdp_client_root
+		return self._cdp_commands_on_closed_sockets + sum(client.msg_id for client in clients.values())
+
+	@property
+	def cdp_session_pool_stats(self) -> CDPSessionPoolStats:
+		"""Session pool counters, with the number of pooled sessions and open WebSocket connections right now."""
+		sessions = {id(session): session for session in self._cdp_session_pool.values()}
+		if self.agent_focus:
+			sessions[id(self.agent_focus)] = self.agent_focus
+		clients = {id(session.cdp_client) for session in sessions.values()}
+		if self._cdp_client_root:
+			clients.add(id(self._cdp_client_root))
+		return CDPSessionPoolStats(
+			created=self._cdp_session_stats.created,
+			reused=self._cdp_session_stats.reused,
+			evicted=self._cdp_session_stats.evicted,
+			attached_sessions=len(self._cdp_session_pool),
+			open_sockets=len(clients),
+		)
+
 	@property
 	def current_target_id(self) -> str | None:
 		return self.agent_focus.target_id if self.agent_focus else None
@@ -948,6 +1257,7 @@ class BrowserSession(BaseModel):
 				# Fall through to fetch fresh state
 
 		# Dispatch the event and wait for result
+		step_start = time.monotonic()
 		event: BrowserStateRequestEvent = cast(
 			BrowserStateRequestEvent,
 			self.event_bus.dispatch(
@@ -963,6 +1273,8 @@ class BrowserSession(BaseModel):
 		# The handler returns the BrowserStateSummary directly
 		result = await event.event_result(raise_if_none=True, raise_if_any=True)
 		assert result is not None and result.dom_state is not None
+		# Between steps, bound the session pool without detaching sessions this state request used
+		await self._evict_cdp_sessions(used_since=step_start)
 		return result
 
 	async def attach_all_watchdogs(self) -> None:
@@ -1141,6 +1453,13 @@ class BrowserSession(BaseModel):
 			await self._cdp_client_root.send.Target.setAutoAttach(
 				params={'autoAttach': True, 'waitForDebuggerOnStart': False, 'flatten': True}
 			)
+			self._frame_registry.register(self._cdp_client_root, root=True)
+			self._tab_registry.register(self._cdp_client_root)
+			try:
+				await self._cdp_client_root.send.Target.setDiscoverTargets(params={'discover': True})
+				self._tab_registry.discovering = True
+			except Exception as e:
+				self.logger.debug(f'Target discovery not available, tabs are fetched on every call: {type(e).__name__}: {e}')
 			self.logger.debug('CDP client connected successfully')
 
 			# Get browser targets to find available contexts/pages
@@ -1359,6 +1678,8 @@ class BrowserSession(BaseModel):
 
 			# Auto-enable Fetch on every newly attached target to ensure auth callbacks fire
 			def _on_attached(event: AttachedToTargetEvent, session_id: SessionID | None = None):
+				# Replaces the frame registry's handler on the root client, so keep it informed
+				self._frame_registry.on_target_changed(event, session_id)
 				sid = event.get('sessionId') or event.get('session_id') or session_id
 				if not sid:
 					return
@@ -1395,76 +1716,74 @@ class BrowserSession(BaseModel):
 			self.logger.debug(f'Skipping proxy auth setup: {type(e).__name__}: {e}')
 
 	async def get_tabs(self) -> list[TabInfo]:
-		"""Get information about all open tabs using CDP Target.getTargetInfo for speed."""
-		tabs = []
-
+		"""Get information about all open tabs from the tab registry, fetched with one Target.getTargets if not seeded yet."""
 		# Safety check - return empty list if browser not connected yet
 		if not self._cdp_client_root:
-			return tabs
-
-		# Get all page targets using CDP
-		pages = await self._cdp_get_all_pages()
+			return []
 
-		for i, page_target in enumerate(pages):
-			target_id = page_target['targetId']
-			url = page_target['url']
+		target_infos = self._tab_registry.get()
+		if target_infos is None:
+			generation = self._tab_registry.generation
+			target_infos = (await self.cdp_client.send.Target.getTargets())['targetInfos']
+			self._tab_registry.store(target_infos, generation)
+		elif self.browser_profile.tab_registry_check:
+			fresh_target_infos = (await self.cdp_client.send.Target.getTargets())['targetInfos']
+			if problems := self._tab_registry.diff(fresh_target_infos):
+				self._tab_registry.mismatches += 1
+				self.logger.warning(f'⚠️ Tab registry out of sync with Target.getTargets: {"; ".join(problems)}')
 
-			# Try to get the title directly from Target.getTargetInfo - much faster!
-			# The initial getTargets() doesn't include title, but getTargetInfo does
-			try:
-				target_info = await self.cdp_client.send.Target.getTargetInfo(params={'targetId': target_id})
-				# The title is directly available in targetInfo
-				title = target_info.get('targetInfo', {}).get('title', '')
-
-				# Skip JS execution for chrome:// pages and new tab pages
-				if is_new_tab_page(url) or url.startswith('chrome://'):
-					# Use URL as title for chrome pages, or mark new tabs as unusable
-					if is_new_tab_page(url):
-						title = 'ignore this tab and do not use it'
-					elif not title:
-						# For chrome:// pages without a title, use the URL itself
-						title = url
-
-				# Special handling for PDF pages without titles
-				if (not title or title == '') and (url.endswith('.pdf') or 'pdf' in url):
-					# PDF pages might not have a title, use URL filename
-					try:
-						from urllib.parse import urlparse
+		return [
+			self._tab_info(target_info)
+			for target_info in target_infos
+			if self._is_valid_target(
+				target_info,
+				include_http=True,
+				include_about=True,
+				include_pages=True,
+				include_iframes=False,
+				include_workers=False,
+			)
+		]
 
-						filename = urlparse(url).path.split('/')[-1]
-						if filename:
-							title = filename
-					except Exception:
-						pass
+	@staticmethod
+	def _tab_info(target_info: TargetInfo) -> TabInfo:
+		url = target_info['url']
+		title = target_info.get('title', '')
 
-			except Exception as e:
-				# Fallback to basic title handling
-				self.logger.debug(f'⚠️ Failed to get target info for tab #{i}: {_log_pretty_url(url)} - {type(e).__name__}')
+		# Skip JS execution for chrome:// pages and new tab pages
+		if is_new_tab_page(url):
+			# Mark new tabs as unusable
+			title = 'ignore this tab and do not use it'
+		elif url.startswith('chrome://') and not title:
+			# For chrome:// pages without a title, use the URL itself
+			title = url
 
-				if is_new_tab_page(url):
-					title = 'ignore this tab and do not use it'
-				elif url.startswith('chrome://'):
-					title = url
-				else:
-					title = ''
+		# Special handling for PDF pages without titles
+		if not title and (url.endswith('.pdf') or 'pdf' in url):
+			# PDF pages might not have a title, use URL filename
+			from urllib.parse import urlparse
 
-			tab_info = TabInfo(
-				target_id=target_id,
-				url=url,
-				title=title,
-				parent_target_id=None,
-			)
-			tabs.append(tab_info)
+			filename = urlparse(url).path.split('/')[-1]
+			if filename:
+				title = filename
 
-		return tabs
+		return TabInfo(
+			target_id=target_info['targetId'],
+			url=url,
+			title=title,
+			parent_target_id=target_info.get('openerId'),
+		)
 
 	# ========== ID Lookup Methods ==========
 
 	async def get_current_target_info(self) -> TargetInfo | None:
-		"""Get info about the current active target using CDP."""
+		"""Get info about the current active target from the tab registry, or using CDP if it is not seeded."""
 		if not self.agent_focus or not self.agent_focus.target_id:
 			return None
 
+		if self._tab_registry.targets is not None:
+			return self._tab_registry.targets.get(self.agent_focus.target_id)
+
 		targets = await self.cdp_client.send.Target.getTargets()
 		for target in targets.get('targetInfos', []):
 			if target.get('targetId') == self.agent_focus.target_id:
@@ -1486,6 +1805,46 @@ class BrowserSession(BaseModel):
 			return target_info.get('title', 'Unknown page title')
 		return 'Unknown page title'
 
+	async def get_page_probe(self, target_id: TargetID | None = None) -> PageProbe:
+		"""Get the page metadata of a target (the current one by default), see `browser_use.browser.page_probe`.
+
+		While page probes are shared, every target is probed once and all callers get that result.
+		"""
+		if target_id is None:
+			assert self.agent_focus is not None, 'CDP session not initialized - browser may not be connected yet'
+			target_id = self.agent_focus.target_id
+		if self._page_probes is None:
+			return await self._probe_page(target_id)
+
+		if target_id not in self._page_probes:
+			self._page_probes[target_id] = asyncio.create_task(self._probe_page(target_id))
+		# Shielded, a caller timing out must not cancel the probe for the others
+		return await asyncio.shield(self._page_probes[target_id])
+
+	async def _probe_page(self, target_id: TargetID) -> PageProbe:
+		return await probe_page(await self.get_or_create_cdp_session(target_id, focus=False))
+
+	def start_page_probe_sharing(self) -> None:
+		"""Share one page probe per target between all `get_page_probe()` calls until `stop_page_probe_sharing()`."""
+		if self._page_probes is None:
+			self._page_probes = {}
+
+	def stop_page_probe_sharing(self) -> None:
+		probes, self._page_probes = self._page_probes or {}, None
+		for task in probes.values():
+			if not task.done():
+				task.cancel()
+			elif not task.cancelled():
+				task.exception()  # retrieve it, so a failed probe is not logged as never retrieved
+
+	def get_dom_process_pool(self) -> ProcessPoolExecutor | None:
+		"""Shared process pool for DOM serialization, held until this session is reset, stopped or killed."""
+		if not self.browser_profile.dom_process_pool_workers:
+			return None
+		if self._dom_process_pool is None:
+			self._dom_process_pool = acquire_shared_process_pool(self.browser_profile.dom_process_pool_workers)
+		return self._dom_process_pool
+
 	async def navigate_to(self, url: str, new_tab: bool = False) -> None:
 		"""Navigate to a URL using the standard event system.
 
@@ -1992,17 +2351,27 @@ class BrowserSession(BaseModel):
 	async def get_all_frames(self) -> tuple[dict[str, dict], dict[str, str]]:
 		"""Get a complete frame hierarchy from all browser targets.
 
+		The hierarchy is built once and kept in the frame registry, which CDP frame / target events keep current, so
+		repeated lookups don't walk every target again.
+
 		Returns:
 			Tuple of (all_frames, target_sessions) where:
 			- all_frames: dict mapping frame_id -> frame info dict with all metadata
 			- target_sessions: dict mapping target_id -> session_id for active sessions
 		"""
-		all_frames = {}  # frame_id -> FrameInfo dict
-		target_sessions = {}  # target_id -> session_id (keep sessions alive during collection)
-
 		# Check if cross-origin iframe support is enabled
 		include_cross_origin = self.browser_profile.cross_origin_iframes
 
+		# Without cross-origin support only the focused target is walked, so the hierarchy depends on the focus
+		focus_target_id = None if include_cross_origin or not self.agent_focus else self.agent_focus.target_id
+		cached = self._frame_registry.get(focus_target_id)
+		if cached is not None:
+			return cached
+		generation = self._frame_registry.generation
+
+		all_frames = {}  # frame_id -> FrameInfo dict
+		target_sessions = {}  # target_id -> session_id (keep sessions alive during collection)
+
 		# Get all targets - only include iframes if cross-origin support is enabled
 		targets = await self._cdp_get_all_pages(
 			include_http=True,
@@ -2037,6 +2406,7 @@ class BrowserSession(BaseModel):
 
 			if cdp_session:
 				target_sessions[target_id] = cdp_session.session_id
+				self._frame_registry.register(cdp_session.cdp_client)
 
 				try:
 					# Try to get frame tree (not all target types support this)
@@ -2122,6 +2492,7 @@ class BrowserSession(BaseModel):
 		if include_cross_origin:
 			await self._populate_frame_metadata(all_frames, target_sessions)
 
+		self._frame_registry.store(all_frames, target_sessions, focus_target_id, generation)
 		return all_frames, target_sessions
 
 	async def _populate_frame_metadata(self, all_frames: dict[str, dict], target_sessions: dict[str, str]) -> None:
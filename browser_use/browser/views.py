@@ -65,6 +65,20 @@ class PageInfo(BaseModel):
 	# Page statistics are now computed dynamically instead of stored
 
 
+@dataclass
+class PageSettleResult:
+	"""How long the page took to settle before its state was captured, and whether it did before the maximum wait"""
+
+	waited: float
+	network_idle: bool
+	dom_quiet: bool
+	in_flight_requests: int = 0  # requests that matter still in flight when the wait ended
+
+	@property
+	def timed_out(self) -> bool:
+		return not (self.network_idle and self.dom_quiet)
+
+
 @dataclass
 class BrowserStateSummary:
 	"""The summary of the browser's current state designed for an LLM to process"""
@@ -84,6 +98,7 @@ class BrowserStateSummary:
 	browser_errors: list[str] = field(default_factory=list)
 	is_pdf_viewer: bool = False  # Whether the current page is a PDF viewer
 	recent_events: str | None = None  # Text summary of recent browser events
+	page_settle: PageSettleResult | None = None  # How long the capture waited for the page to settle
 
 
 @dataclass
@@ -125,6 +140,17 @@ class BrowserStateHistory:
 		return data
 
 
+@dataclass
+class CDPSessionPoolStats:
+	"""Target sessions of `BrowserSession`'s CDP session pool: counters, and the connections open right now"""
+
+	created: int = 0
+	reused: int = 0
+	evicted: int = 0
+	attached_sessions: int = 0
+	open_sockets: int = 0
+
+
 class BrowserError(Exception):
 	"""Browser error with structured memory for LLM context management.
 
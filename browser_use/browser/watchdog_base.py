@@ -149,11 +149,9 @@ class BaseWatchdog(BaseModel):
 							)
 							del browser_session._cdp_session_pool[browser_session.agent_focus.target_id]
 							browser_session.agent_focus = await browser_session.get_or_create_cdp_session(
-								target_id=browser_session.agent_focus.target_id, new_socket=True
-							)
-							await browser_session.agent_focus.cdp_client.send.Target.activateTarget(
-								params={'targetId': browser_session.agent_focus.target_id}
+								target_id=browser_session.agent_focus.target_id, focus=False, new_socket=True
 							)
+							await browser_session._activate_target(browser_session.agent_focus, force=True)
 						else:
 							await browser_session.get_or_create_cdp_session(target_id=None, new_socket=True, focus=True)
 					except Exception as sub_error:
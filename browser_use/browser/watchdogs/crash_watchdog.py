@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, ClassVar
 
 import psutil
 from bubus import BaseEvent
+from cdp_use import CDPClient
 from cdp_use.cdp.target import SessionID, TargetID
 from cdp_use.cdp.target.events import TargetCrashedEvent
 from pydantic import Field, PrivateAttr
@@ -53,7 +54,7 @@ class CrashWatchdog(BaseWatchdog):
 	_monitoring_task: asyncio.Task | None = PrivateAttr(default=None)
 	_last_responsive_checks: dict[str, float] = PrivateAttr(default_factory=dict)  # target_url -> timestamp
 	_cdp_event_tasks: set[asyncio.Task] = PrivateAttr(default_factory=set)  # Track CDP event handler tasks
-	_sessions_with_listeners: set[str] = PrivateAttr(default_factory=set)  # Track sessions that already have event listeners
+	_clients_with_listeners: set[CDPClient] = PrivateAttr(default_factory=set)  # Clients with listeners
 
 	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
 		"""Start monitoring when browser is connected."""
@@ -78,9 +79,9 @@ class CrashWatchdog(BaseWatchdog):
 			# Create temporary session for monitoring without switching focus
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
 
-			# Check if we already have listeners for this session
-			if cdp_session.session_id in self._sessions_with_listeners:
-				self.logger.debug(f'[CrashWatchdog] Event listeners already exist for session: {cdp_session.session_id}')
+			# Target sessions share their CDP client, which keeps one handler per event: listen once per client
+			if cdp_session.cdp_client in self._clients_with_listeners:
+				self.logger.debug(f'[CrashWatchdog] Event listeners already exist for the CDP client of target: {target_id}')
 				return
 
 			# Set up network event handlers
@@ -109,15 +110,15 @@ class CrashWatchdog(BaseWatchdog):
 
 			def on_target_crashed(event: TargetCrashedEvent, session_id: SessionID | None = None):
 				# Create and track the task
-				task = asyncio.create_task(self._on_target_crash_cdp(target_id))
+				task = asyncio.create_task(self._on_target_crash_cdp(event['targetId']))
 				self._cdp_event_tasks.add(task)
 				# Remove from set when done
 				task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
 
 			cdp_session.cdp_client.register.Target.targetCrashed(on_target_crashed)
 
-			# Track that we've added listeners to this session
-			self._sessions_with_listeners.add(cdp_session.session_id)
+			# Track that we've added listeners to this client
+			self._clients_with_listeners.add(cdp_session.cdp_client)
 
 			# Get target info for logging
 			targets = await cdp_session.cdp_client.send.Target.getTargets()
@@ -232,7 +233,7 @@ class CrashWatchdog(BaseWatchdog):
 
 		# Clear tracking (CDP sessions are cached and managed by BrowserSession)
 		self._active_requests.clear()
-		self._sessions_with_listeners.clear()
+		self._clients_with_listeners.clear()
 
 	async def _monitoring_loop(self) -> None:
 		"""Main monitoring loop."""
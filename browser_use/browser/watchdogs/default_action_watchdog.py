@@ -167,9 +167,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			pixels = event.amount if event.direction == 'down' else -event.amount
 
 			# CRITICAL: CDP calls time out without this, even if the target is already active
-			await self.browser_session.agent_focus.cdp_client.send.Target.activateTarget(
-				params={'targetId': self.browser_session.agent_focus.target_id}
-			)
+			await self.browser_session._activate_target(self.browser_session.agent_focus, force=True)
 
 			# Element-specific scrolling if node is provided
 			if event.node is not None:
@@ -202,9 +200,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			await self._scroll_with_cdp_gesture(pixels)
 
 			# CRITICAL: CDP calls time out without this, even if the target is already active
-			await self.browser_session.agent_focus.cdp_client.send.Target.activateTarget(
-				params={'targetId': self.browser_session.agent_focus.target_id}
-			)
+			await self.browser_session._activate_target(self.browser_session.agent_focus, force=True)
 
 			# Note: We don't clear cached state here - let multi_act handle DOM change detection
 			# by explicitly rebuilding and comparing when needed
@@ -532,9 +528,9 @@ class DefaultActionWatchdog(BaseWatchdog):
 					raise Exception(f'Failed to click element: {e}')
 			finally:
 				# always re-focus back to original top-level page session context in case click opened a new tab/popup/window/dialog/etc.
-				cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
-				await cdp_session.cdp_client.send.Target.activateTarget(params={'targetId': cdp_session.target_id})
-				await cdp_session.cdp_client.send.Runtime.runIfWaitingForDebugger(session_id=cdp_session.session_id)
+				# the new tab may not be reported yet, so the activation cannot be skipped
+				cdp_session = await self.browser_session.get_or_create_cdp_session(focus=False)
+				await self.browser_session._activate_target(cdp_session, force=True)
 
 		except URLNotAllowedError as e:
 			raise e
@@ -559,7 +555,6 @@ class DefaultActionWatchdog(BaseWatchdog):
 		try:
 			# Get CDP client and session
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=True)
-			await cdp_session.cdp_client.send.Target.activateTarget(params={'targetId': cdp_session.target_id})
 
 			# Type the text character by character to the focused element
 			for char in text:
@@ -10,7 +10,10 @@ from browser_use.browser.events import (
 	ScreenshotEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.page_settle import PageSettleTracker
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.dom.capture import DOMCaptureRecorder
+from browser_use.dom.live_mirror import LiveDOMMirror
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -20,7 +23,7 @@ from browser_use.observability import observe_debug
 from browser_use.utils import time_execution_async
 
 if TYPE_CHECKING:
-	from browser_use.browser.views import BrowserStateSummary, PageInfo
+	from browser_use.browser.views import BrowserStateSummary, PageInfo, PageSettleResult
 
 
 class DOMWatchdog(BaseWatchdog):
@@ -41,6 +44,8 @@ class DOMWatchdog(BaseWatchdog):
 
 	# Internal DOM service
 	_dom_service: DomService | None = None
+	_live_dom_mirror: LiveDOMMirror | None = None
+	_page_settle: PageSettleTracker | None = None
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
@@ -112,10 +117,11 @@ class DOMWatchdog(BaseWatchdog):
 		not_a_meaningful_website = page_url.lower().split(':', 1)[0] not in ('http', 'https')
 
 		# Wait for page stability using browser profile settings (main branch pattern)
+		page_settle = None
 		if not not_a_meaningful_website:
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
 			try:
-				await self._wait_for_stable_network()
+				page_settle = await self._wait_for_stable_network()
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Page stability complete')
 			except Exception as e:
 				self.logger.warning(
@@ -137,6 +143,9 @@ class DOMWatchdog(BaseWatchdog):
 		# self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got scroll info: {scroll_info["result"]}')
 
 		try:
+			# The DOM build, highlighting and page info below share one page metadata probe
+			self.browser_session.start_page_probe_sharing()
+
 			# Fast path for empty pages
 			if not_a_meaningful_website:
 				self.logger.debug(f'⚡ Skipping BuildDOMTree for empty target: {page_url}')
@@ -231,14 +240,18 @@ class DOMWatchdog(BaseWatchdog):
 					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🎨 Applying Python-based highlighting...')
 					from browser_use.browser.python_highlights import create_highlighted_screenshot_async
 
-					# Get CDP session for viewport info
-					cdp_session = await self.browser_session.get_or_create_cdp_session()
+					# Viewport info comes from the page probe shared with the DOM build
+					try:
+						page_probe = await self.browser_session.get_page_probe()
+					except Exception as e:
+						self.logger.debug(f'Failed to get viewport info for highlighting: {e}')
+						page_probe = None
 					start = time.time()
 					screenshot_b64 = await create_highlighted_screenshot_async(
 						screenshot_b64,
 						content.selector_map,
-						cdp_session,
-						self.browser_session.browser_profile.filter_highlight_ids,
+						filter_highlight_ids=self.browser_session.browser_profile.filter_highlight_ids,
+						page_probe=page_probe,
 					)
 					self.logger.debug(
 						f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Applied highlights to {len(content.selector_map)} elements in {time.time() - start:.2f}s'
@@ -310,6 +323,7 @@ class DOMWatchdog(BaseWatchdog):
 				browser_errors=[],
 				is_pdf_viewer=is_pdf_viewer,
 				recent_events=self._get_recent_events_str() if event.include_recent_events else None,
+				page_settle=page_settle,
 			)
 
 			# Cache the state
@@ -347,6 +361,9 @@ class DOMWatchdog(BaseWatchdog):
 				recent_events=None,
 			)
 
+		finally:
+			self.browser_session.stop_page_probe_sharing()
+
 	@time_execution_async('build_dom_tree_without_highlights')
 	@observe_debug(ignore_input=True, ignore_output=True, name='build_dom_tree_without_highlights')
 	async def _build_dom_tree_without_highlights(self, previous_state: SerializedDOMState | None = None) -> SerializedDOMState:
@@ -356,6 +373,8 @@ class DOMWatchdog(BaseWatchdog):
 
 			# Create or reuse DOM service
 			if self._dom_service is None:
+				if self.browser_session.browser_profile.live_dom_mirror:
+					self._live_dom_mirror = LiveDOMMirror(self.browser_session, logger=self.logger)
 				self._dom_service = DomService(
 					browser_session=self.browser_session,
 					logger=self.logger,
@@ -363,6 +382,15 @@ class DOMWatchdog(BaseWatchdog):
 					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
 					max_iframes=self.browser_session.browser_profile.max_iframes,
 					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+					max_concurrent_iframe_fetches=self.browser_session.browser_profile.max_concurrent_iframe_fetches,
+					iterative_tree_builder=self.browser_session.browser_profile.iterative_dom_tree_builder,
+					live_dom_mirror=self._live_dom_mirror,
+					ax_tree_mode=self.browser_session.browser_profile.ax_tree_mode,
+					reuse_unchanged_dom=self.browser_session.browser_profile.reuse_unchanged_dom_state,
+					process_pool=self.browser_session.get_dom_process_pool(),
+					capture_recorder=DOMCaptureRecorder(self.browser_session.browser_profile.dom_capture_path)
+					if self.browser_session.browser_profile.dom_capture_path
+					else None,
 				)
 
 			# Get serialized DOM tree using the service
@@ -439,99 +467,74 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.warning(f'📸 Clean screenshot failed: {type(e).__name__}: {e}')
 			raise
 
-	async def _wait_for_stable_network(self):
-		"""Wait for page stability - simplified for CDP-only branch."""
+	async def _wait_for_stable_network(self) -> 'PageSettleResult | None':
+		"""Wait for page stability, from network, lifecycle and DOM mutation events when page_settle_detection is on.
+
+		Returns as soon as the page settled, or after maximum_wait_page_load_time. Falls back to sleeping the fixed page
+		load times when settle detection is off or fails, and then returns None.
+		"""
+		profile = self.browser_session.browser_profile
+		cdp_session = self.browser_session.agent_focus
+		if profile.page_settle_detection and cdp_session:
+			if self._page_settle is None:
+				self._page_settle = PageSettleTracker()
+			# sessions detached from the pool (evicted, closed or crashed targets) are not tracked anymore
+			self._page_settle.retain(
+				[cdp_session.session_id, *(session.session_id for session in self.browser_session._cdp_session_pool.values())]
+			)
+			try:
+				result = await self._page_settle.wait_until_settled(
+					cdp_session,
+					network_idle_time=profile.wait_for_network_idle_page_load_time,
+					dom_quiet_time=profile.minimum_wait_page_load_time,
+					max_wait=profile.maximum_wait_page_load_time,
+				)
+			except Exception as e:
+				self.logger.debug(f'⏳ Page settle detection failed: {type(e).__name__}: {e}, waiting the fixed page load times')
+			else:
+				if result.timed_out:
+					self.logger.debug(
+						f'⏳ Page did not settle within {result.waited:.2f}s (network idle: {result.network_idle}, '
+						f'DOM quiet: {result.dom_quiet}, {result.in_flight_requests} requests in flight)'
+					)
+				else:
+					self.logger.debug(f'✅ Page settled in {result.waited:.2f}s')
+				return result
+
 		start_time = time.time()
 
 		# Apply minimum wait time first (let page settle)
-		min_wait = self.browser_session.browser_profile.minimum_wait_page_load_time
+		min_wait = profile.minimum_wait_page_load_time
 		if min_wait > 0:
 			self.logger.debug(f'⏳ Minimum wait: {min_wait}s')
 			await asyncio.sleep(min_wait)
 
 		# Apply network idle wait time (for dynamic content like iframes)
-		network_idle_wait = self.browser_session.browser_profile.wait_for_network_idle_page_load_time
+		network_idle_wait = profile.wait_for_network_idle_page_load_time
 		if network_idle_wait > 0:
 			self.logger.debug(f'⏳ Network idle wait: {network_idle_wait}s')
 			await asyncio.sleep(network_idle_wait)
 
 		elapsed = time.time() - start_time
 		self.logger.debug(f'✅ Page stability wait completed in {elapsed:.2f}s')
+		return None
 
 	async def _get_page_info(self) -> 'PageInfo':
-		"""Get comprehensive page information using a single CDP call.
+		"""Get comprehensive page information from the page probe shared with the rest of the browser state request.
 
 		TODO: should we make this an event as well?
 
 		Returns:
 			PageInfo with all viewport, page dimensions, and scroll information
 		"""
-
-		from browser_use.browser.views import PageInfo
-
 		# Get CDP session for the current target
 		if not self.browser_session.agent_focus:
 			raise RuntimeError('No active CDP session - browser may not be connected yet')
 
-		cdp_session = await self.browser_session.get_or_create_cdp_session(
-			target_id=self.browser_session.agent_focus.target_id, focus=True
+		probe = await asyncio.wait_for(
+			self.browser_session.get_page_probe(self.browser_session.agent_focus.target_id), timeout=10.0
 		)
-
-		# Get layout metrics which includes all the information we need
-		metrics = await asyncio.wait_for(
-			cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id), timeout=10.0
-		)
-
-		# Extract different viewport types
-		layout_viewport = metrics.get('layoutViewport', {})
-		visual_viewport = metrics.get('visualViewport', {})
-		css_visual_viewport = metrics.get('cssVisualViewport', {})
-		css_layout_viewport = metrics.get('cssLayoutViewport', {})
-		content_size = metrics.get('contentSize', {})
-
-		# Calculate device pixel ratio to convert between device pixels and CSS pixels
-		# This matches the approach in dom/service.py _get_viewport_ratio method
-		css_width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1280.0))
-		device_width = visual_viewport.get('clientWidth', css_width)
-		device_pixel_ratio = device_width / css_width if css_width > 0 else 1.0
-
-		# For viewport dimensions, use CSS pixels (what JavaScript sees)
-		# Prioritize CSS layout viewport, then fall back to layout viewport
-		viewport_width = int(css_layout_viewport.get('clientWidth') or layout_viewport.get('clientWidth', 1280))
-		viewport_height = int(css_layout_viewport.get('clientHeight') or layout_viewport.get('clientHeight', 720))
-
-		# For total page dimensions, content size is typically in device pixels, so convert to CSS pixels
-		# by dividing by device pixel ratio
-		raw_page_width = content_size.get('width', viewport_width * device_pixel_ratio)
-		raw_page_height = content_size.get('height', viewport_height * device_pixel_ratio)
-		page_width = int(raw_page_width / device_pixel_ratio)
-		page_height = int(raw_page_height / device_pixel_ratio)
-
-		# For scroll position, use CSS visual viewport if available, otherwise CSS layout viewport
-		# These should already be in CSS pixels
-		scroll_x = int(css_visual_viewport.get('pageX') or css_layout_viewport.get('pageX', 0))
-		scroll_y = int(css_visual_viewport.get('pageY') or css_layout_viewport.get('pageY', 0))
-
-		# Calculate scroll information - pixels that are above/below/left/right of current viewport
-		pixels_above = scroll_y
-		pixels_below = max(0, page_height - viewport_height - scroll_y)
-		pixels_left = scroll_x
-		pixels_right = max(0, page_width - viewport_width - scroll_x)
-
-		page_info = PageInfo(
-			viewport_width=viewport_width,
-			viewport_height=viewport_height,
-			page_width=page_width,
-			page_height=page_height,
-			scroll_x=scroll_x,
-			scroll_y=scroll_y,
-			pixels_above=pixels_above,
-			pixels_below=pixels_below,
-			pixels_left=pixels_left,
-			pixels_right=pixels_right,
-		)
-
-		return page_info
+		return probe.page_info()
 
 	# ========== Public Helper Methods ==========
 
@@ -573,9 +576,13 @@ class DOMWatchdog(BaseWatchdog):
 		if self._dom_service:
 			await self._dom_service.__aexit__(exc_type, exc_value, traceback)
 			self._dom_service = None
+		if self._live_dom_mirror:
+			await self._live_dom_mirror.close()
+			self._live_dom_mirror = None
 
 	def __del__(self):
 		"""Clean up DOM service on deletion."""
 		super().__del__()
 		# DOM service will clean up its own CDP client
 		self._dom_service = None
+		self._live_dom_mirror = None
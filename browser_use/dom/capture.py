@@ -0,0 +1,140 @@
+"""
+Recording of the raw CDP payloads behind each DOM state, and offline replay of them without a browser.
+
+`DOMCaptureRecorder` appends what `DomService._get_all_trees` returned for every step (DOMSnapshot with its string
+table, DOM tree, AX tree, device pixel ratio) to a capture file. `read_dom_captures` reads them back as
+`TargetAllTrees` that `DomService.get_dom_tree(..., trees=...)` and `DOMTreeSerializer` accept as they are, so real
+pages can be profiled and used in regression tests reproducibly.
+
+File format: the `MAGIC` header, then one frame per step: a little-endian uint32 length followed by that many bytes
+of zlib-compressed compact JSON. Payloads are stored exactly as received, so captures stay readable by later
+versions of the DOM pipeline.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+
+from cdp_use.cdp.target import TargetID
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import TargetAllTrees
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BUDOMCAP\x01'
+_FRAME_LENGTH = struct.Struct('<I')
+
+
+@dataclass
+class DOMCapture:
+	"""One recorded step: the CDP payloads of the page target at that time."""
+
+	target_id: TargetID
+	trees: TargetAllTrees
+	url: str | None = None
+	timestamp: float = field(default_factory=time.time)
+
+
+class DOMCaptureRecorder:
+	"""Appends one frame per recorded step to a capture file, creating it on the first step."""
+
+	def __init__(self, path: str | Path, compression_level: int = 1):
+		self.path = Path(path).expanduser()
+		self.compression_level = compression_level
+		self.steps = 0
+		self.bytes_written = 0
+		self._lock = threading.Lock()
+
+	async def record(self, target_id: TargetID, trees: TargetAllTrees) -> bool:
+		"""Record a step, must be awaited before building the tree, which rewrites snapshot bounds.
+
+		The payloads are encoded on the event loop, because with the live DOM mirror `trees.dom_tree` is the mirror's
+		own document that DOM events keep changing. Only the compression and the file append run in a thread.
+		Recording is a diagnostic, a step that cannot be written is logged and skipped instead of failing the state.
+		"""
+		try:
+			encoded = self.encode(target_id, trees)
+			await asyncio.to_thread(self._append, encoded)
+			return True
+		except Exception as e:
+			logger.warning(f'Failed to record DOM capture step to {self.path}: {type(e).__name__}: {e}')
+			return False
+
+	def write(self, target_id: TargetID, trees: TargetAllTrees) -> None:
+		"""Encode and append the payloads of one step (blocking)."""
+		self._append(self.encode(target_id, trees))
+
+	@staticmethod
+	def encode(target_id: TargetID, trees: TargetAllTrees) -> bytes:
+		"""Compact JSON of the payloads of one step, a consistent copy of them at the time of the call."""
+		data = {
+			'target_id': target_id,
+			'url': trees.dom_tree['root'].get('documentURL'),
+			'timestamp': time.time(),
+			'device_pixel_ratio': trees.device_pixel_ratio,
+			'cdp_timing': trees.cdp_timing,
+			'snapshot': trees.snapshot,
+			'dom_tree': trees.dom_tree,
+			'ax_tree': trees.ax_tree,
+		}
+		return json.dumps(data, separators=(',', ':')).encode()
+
+	def _append(self, encoded: bytes) -> None:
+		frame = zlib.compress(encoded, self.compression_level)
+		with self._lock:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			with open(self.path, 'ab') as f:
+				if f.tell() == 0:
+					f.write(MAGIC)
+					self.bytes_written += len(MAGIC)
+				f.write(_FRAME_LENGTH.pack(len(frame)))
+				f.write(frame)
+			self.steps += 1
+			self.bytes_written += _FRAME_LENGTH.size + len(frame)
+
+
+def read_dom_captures(path: str | Path) -> Iterator[DOMCapture]:
+	"""Yield the recorded steps of a capture file in order, every step with its own freshly decoded payloads."""
+	with open(Path(path).expanduser(), 'rb') as f:
+		if f.read(len(MAGIC)) != MAGIC:
+			raise ValueError(f'{path} is not a DOM capture file')
+		while header := f.read(_FRAME_LENGTH.size):
+			if len(header) < _FRAME_LENGTH.size:
+				raise ValueError(f'{path} ends with a truncated frame')
+			(length,) = _FRAME_LENGTH.unpack(header)
+			frame = f.read(length)
+			if len(frame) < length:
+				raise ValueError(f'{path} ends with a truncated frame')
+
+			data = json.loads(zlib.decompress(frame))
+			yield DOMCapture(
+				target_id=data['target_id'],
+				url=data['url'],
+				timestamp=data['timestamp'],
+				trees=TargetAllTrees(
+					snapshot=data['snapshot'],
+					dom_tree=data['dom_tree'],
+					ax_tree=data['ax_tree'],
+					device_pixel_ratio=data['device_pixel_ratio'],
+					cdp_timing=data['cdp_timing'],
+				),
+			)
+
+
+def offline_dom_service(logger: logging.Logger | None = None, **kwargs) -> DomService:
+	"""DomService for replaying captures with `get_dom_tree(capture.target_id, trees=capture.trees)`, no browser needed.
+
+	Cross-origin iframe documents come from their own targets, which are not recorded, so they cannot be enabled.
+	"""
+	logger = logger or logging.getLogger(__name__)
+	browser_session = SimpleNamespace(logger=logger, agent_focus=None, current_target_id=None)
+	return DomService(browser_session, logger=logger, cross_origin_iframes=False, **kwargs)  # type: ignore[arg-type]
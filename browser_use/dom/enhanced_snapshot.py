@@ -5,6 +5,11 @@ This module provides stateless functions for parsing Chrome DevTools Protocol (C
 to extract visibility, clickability, cursor styles, and other layout information.
 """
 
+import math
+from array import array
+from collections.abc import Iterator, Mapping
+from itertools import chain
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
 	LayoutTreeSnapshot,
@@ -44,11 +49,15 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
-def build_snapshot_lookup(
+def build_eager_snapshot_lookup(
 	snapshot: CaptureSnapshotReturns,
 	device_pixel_ratio: float = 1.0,
 ) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
+	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront.
+
+	Reference implementation that materializes one `EnhancedSnapshotNode` per node, kept for parity tests and
+	benchmarks. The DOM pipeline uses `build_snapshot_lookup` (columnar + lazy views) instead.
+	"""
 	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
 
 	if not snapshot['documents']:
@@ -159,3 +168,330 @@ def build_snapshot_lookup(
 			)
 
 	return snapshot_lookup
+
+
+# Sentinel row used to pad missing rectangles so every column stays 4 floats wide
+_NO_RECT = (math.nan, math.nan, math.nan, math.nan)
+_NUM_STYLES = len(REQUIRED_COMPUTED_STYLES)
+_NO_STYLES = (-1,) * _NUM_STYLES
+
+
+def _flatten_rects(rects: list[list[float]], count: int) -> array:
+	"""Flatten a list of CDP rectangles into a 4-wide float column, padding missing/short entries with NaN."""
+	column = array('d')
+	extend = column.extend
+	for i in range(count):
+		rect = rects[i] if i < len(rects) else None
+		extend(rect[:4] if rect and len(rect) >= 4 else _NO_RECT)
+	return column
+
+
+def _flatten_styles(styles: list[list[int]], count: int) -> array:
+	"""Flatten per-layout-node style string indices into a fixed-width matrix (-1 = style not reported)."""
+	column = array('i')
+	extend = column.extend
+	for i in range(count):
+		row = styles[i] if i < len(styles) else None
+		if row and len(row) == _NUM_STYLES:
+			extend(row)
+		elif row:
+			extend((list(row[:_NUM_STYLES]) + [-1] * _NUM_STYLES)[:_NUM_STYLES])
+		else:
+			extend(_NO_STYLES)
+	return column
+
+
+class SnapshotIndex(Mapping[int, EnhancedSnapshotNode]):
+	"""
+	Columnar index over a `DOMSnapshot.captureSnapshot` result, keyed by backend node id.
+
+	Layout data of all documents is stored in flat `array` columns (bounds, client rects, scroll rects,
+	paint order, a fixed-width matrix of style string indices) and `isClickable` in a bitset, so building
+	the index allocates no per-node Python objects. `EnhancedSnapshotNode` views are only created for the
+	nodes that are actually looked up, and each view materializes its rects/styles on first access.
+	"""
+
+	def __init__(self, snapshot: CaptureSnapshotReturns, device_pixel_ratio: float = 1.0):
+		self.strings: list[str] = snapshot['strings']
+		self.device_pixel_ratio = device_pixel_ratio
+
+		# node row (global across documents) -> layout row, -1 if the node has no layout object
+		self.node_layout = array('i')
+		# backend node id -> node row (later documents win on duplicates, same as the eager lookup)
+		self.row_by_backend_id: dict[int, int] = {}
+
+		# layout columns, one row per layout node (bounds/rects are 4 floats wide, NaN when missing)
+		self.bounds = array('d')
+		self.client_rects = array('d')
+		self.scroll_rects = array('d')
+		self.paint_orders = array('q')
+		self.has_paint_order = bytearray()
+		self.styles = array('i')
+		# layout row -> stacking context value (mirrors the eager lookup's rare-data indexing)
+		self.stacking_contexts: dict[int, int] = {}
+
+		# bitsets over node rows
+		self.clickable = bytearray()
+		self.clickable_known = bytearray()
+
+		self._views: dict[int, SnapshotNodeView] = {}
+		self._hidden_by_style: bytearray | None = None
+		# style string indices -> computed styles dict, shared by all layout rows with the same styles
+		self._computed_styles: dict[tuple[int, ...], dict[str, str]] = {}
+
+		for document in snapshot['documents']:
+			self._add_document(document['nodes'], document['layout'])
+
+	def _add_document(self, nodes: NodeTreeSnapshot, layout: LayoutTreeSnapshot) -> None:
+		node_offset = len(self.node_layout)
+		layout_offset = len(self.paint_orders)
+		backend_ids = nodes.get('backendNodeId', [])
+		node_count = len(nodes.get('parentIndex', backend_ids))
+		node_count = max(node_count, len(backend_ids))
+
+		# Node -> layout row, keeping the FIRST layout entry for duplicated node indices
+		node_layout = array('i', [-1]) * node_count
+		node_indices = layout.get('nodeIndex', []) if layout else []
+		for layout_idx in range(len(node_indices) - 1, -1, -1):
+			node_index = node_indices[layout_idx]
+			if 0 <= node_index < node_count:
+				node_layout[node_index] = layout_offset + layout_idx
+		self.node_layout.extend(node_layout)
+
+		self.row_by_backend_id.update(zip(backend_ids, range(node_offset, node_offset + len(backend_ids))))
+
+		# Layout columns
+		layout_count = len(node_indices)
+		if layout_count:
+			bounds = layout.get('bounds', [])
+			if bounds and all(len(b) == 4 for b in bounds) and len(bounds) == layout_count:
+				self.bounds.extend(chain.from_iterable(bounds))
+			else:
+				self.bounds.extend(_flatten_rects(bounds, layout_count))
+			self.client_rects.extend(_flatten_rects(layout.get('clientRects', []), layout_count))
+			self.scroll_rects.extend(_flatten_rects(layout.get('scrollRects', []), layout_count))
+			self.styles.extend(_flatten_styles(layout.get('styles', []), layout_count))
+
+			paint_orders = layout.get('paintOrders', [])
+			self.paint_orders.extend(paint_orders[:layout_count])
+			self.has_paint_order.extend(b'\x01' * min(len(paint_orders), layout_count))
+			if len(paint_orders) < layout_count:
+				missing = layout_count - len(paint_orders)
+				self.paint_orders.extend([0] * missing)
+				self.has_paint_order.extend(b'\x00' * missing)
+
+			# NOTE: the eager lookup guards with len() of the RareBooleanData dict and then indexes its 'index'
+			# list by layout index, so only the first few layout rows ever receive a value. Keep that behavior.
+			stacking = layout.get('stackingContexts', {})
+			stacking_indices = stacking.get('index', []) if stacking else []
+			for layout_idx in range(min(len(stacking), layout_count, len(stacking_indices))):
+				self.stacking_contexts[layout_offset + layout_idx] = stacking_indices[layout_idx]
+
+		# isClickable bitset
+		total_rows = node_offset + node_count
+		missing_bytes = (total_rows + 7) // 8 - len(self.clickable)
+		if missing_bytes > 0:
+			self.clickable.extend(bytes(missing_bytes))
+			self.clickable_known.extend(bytes(missing_bytes))
+		if 'isClickable' in nodes:
+			for row in range(node_offset, total_rows):
+				self.clickable_known[row >> 3] |= 1 << (row & 7)
+			for snapshot_index in nodes['isClickable']['index']:
+				row = node_offset + snapshot_index
+				if row < total_rows:
+					self.clickable[row >> 3] |= 1 << (row & 7)
+
+	# --- Mapping interface -------------------------------------------------
+	def __getitem__(self, backend_node_id: int) -> 'SnapshotNodeView':
+		view = self._views.get(backend_node_id)
+		if view is None:
+			view = SnapshotNodeView(self, self.row_by_backend_id[backend_node_id])
+			self._views[backend_node_id] = view
+		return view
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return backend_node_id in self.row_by_backend_id
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self.row_by_backend_id)
+
+	def __len__(self) -> int:
+		return len(self.row_by_backend_id)
+
+	# --- Column accessors (used by the lazy views) --------------------------
+	def is_clickable(self, row: int) -> bool | None:
+		if not self.clickable_known[row >> 3] >> (row & 7) & 1:
+			return None
+		return bool(self.clickable[row >> 3] >> (row & 7) & 1)
+
+	def rect(self, column: array, layout_row: int, scale: float = 1.0) -> DOMRect | None:
+		offset = layout_row * 4
+		x = column[offset]
+		if x != x:  # NaN -> no rect for this layout node
+			return None
+		return DOMRect(
+			x=x / scale,
+			y=column[offset + 1] / scale,
+			width=column[offset + 2] / scale,
+			height=column[offset + 3] / scale,
+		)
+
+	def computed_styles(self, layout_row: int) -> dict[str, str]:
+		"""Computed styles of a layout row. Rows with the same styles share one dict, so it must not be mutated."""
+		offset = layout_row * _NUM_STYLES
+		style_indices = tuple(self.styles[offset : offset + _NUM_STYLES])
+		styles = self._computed_styles.get(style_indices)
+		if styles is None:
+			strings = self.strings
+			num_strings = len(strings)
+			styles = {}
+			for i, style_index in enumerate(style_indices):
+				if 0 <= style_index < num_strings:
+					styles[REQUIRED_COMPUTED_STYLES[i]] = strings[style_index]
+			self._computed_styles[style_indices] = styles
+		return styles
+
+	def hidden_by_style(self, layout_row: int) -> bool:
+		"""Same decision as `EnhancedSnapshotNode.hidden_by_style`, from a mask built once for all layout rows."""
+		if self._hidden_by_style is None:
+			self._hidden_by_style = self._build_hidden_by_style_mask()
+		return bool(self._hidden_by_style[layout_row])
+
+	def _build_hidden_by_style_mask(self) -> bytearray:
+		"""Parse each distinct display/visibility/opacity string once, then flag every layout row that uses one."""
+		strings = self.strings
+		num_strings = len(strings)
+
+		def hidden_ids(style_name: str, is_hidden) -> tuple[array, set[int]]:
+			column = self.styles[REQUIRED_COMPUTED_STYLES.index(style_name) :: _NUM_STYLES]
+			return column, {i for i in set(column) if 0 <= i < num_strings and is_hidden(strings[i])}
+
+		def opacity_hidden(value: str) -> bool:
+			try:
+				return float(value) <= 0
+			except ValueError:
+				return False
+
+		display, display_hidden = hidden_ids('display', lambda value: value.lower() == 'none')
+		visibility, visibility_hidden = hidden_ids('visibility', lambda value: value.lower() == 'hidden')
+		opacity, opacity_hidden_ids = hidden_ids('opacity', opacity_hidden)
+		return bytearray(
+			d in display_hidden or v in visibility_hidden or o in opacity_hidden_ids
+			for d, v, o in zip(display, visibility, opacity)
+		)
+
+	def style_value(self, layout_row: int, style_name: str) -> str | None:
+		"""Read a single computed style without building the styles dict."""
+		style_index = self.styles[layout_row * _NUM_STYLES + REQUIRED_COMPUTED_STYLES.index(style_name)]
+		if 0 <= style_index < len(self.strings):
+			return self.strings[style_index]
+		return None
+
+
+_UNSET = object()
+
+
+class SnapshotNodeView(EnhancedSnapshotNode):
+	"""
+	Lazy `EnhancedSnapshotNode` backed by a row of a `SnapshotIndex`.
+
+	Exposes the same attributes as the eager dataclass. Rects and computed styles are materialized on first
+	access and then cached, so callers that mutate e.g. `bounds` in place keep seeing their changes.
+	"""
+
+	__slots__ = ('_index', '_row', '_layout_row', '_bounds', '_client_rects', '_scroll_rects', '_computed_styles')
+
+	def __init__(self, index: SnapshotIndex, row: int):
+		self._index = index
+		self._row = row
+		self._layout_row = index.node_layout[row]
+		self._bounds = _UNSET
+		self._client_rects = _UNSET
+		self._scroll_rects = _UNSET
+		self._computed_styles = _UNSET
+
+	@property
+	def is_clickable(self) -> bool | None:  # type: ignore[override]
+		return self._index.is_clickable(self._row)
+
+	@property
+	def cursor_style(self) -> str | None:  # type: ignore[override]
+		if self._layout_row < 0:
+			return None
+		if self._computed_styles is not _UNSET:
+			return self._computed_styles.get('cursor') if self._computed_styles else None  # type: ignore[union-attr]
+		return self._index.style_value(self._layout_row, 'cursor')
+
+	@property
+	def bounds(self) -> DOMRect | None:  # type: ignore[override]
+		if self._bounds is _UNSET:
+			self._bounds = (
+				self._index.rect(self._index.bounds, self._layout_row, self._index.device_pixel_ratio)
+				if self._layout_row >= 0
+				else None
+			)
+		return self._bounds  # type: ignore[return-value]
+
+	@property
+	def clientRects(self) -> DOMRect | None:  # type: ignore[override]
+		if self._client_rects is _UNSET:
+			self._client_rects = self._index.rect(self._index.client_rects, self._layout_row) if self._layout_row >= 0 else None
+		return self._client_rects  # type: ignore[return-value]
+
+	@property
+	def scrollRects(self) -> DOMRect | None:  # type: ignore[override]
+		if self._scroll_rects is _UNSET:
+			self._scroll_rects = self._index.rect(self._index.scroll_rects, self._layout_row) if self._layout_row >= 0 else None
+		return self._scroll_rects  # type: ignore[return-value]
+
+	@property
+	def computed_styles(self) -> dict[str, str] | None:  # type: ignore[override]
+		if self._computed_styles is _UNSET:
+			self._computed_styles = (self._index.computed_styles(self._layout_row) or None) if self._layout_row >= 0 else None
+		return self._computed_styles  # type: ignore[return-value]
+
+	@property
+	def hidden_by_style(self) -> bool:
+		if self._layout_row < 0:
+			return False
+		return self._index.hidden_by_style(self._layout_row)
+
+	@property
+	def paint_order(self) -> int | None:  # type: ignore[override]
+		if self._layout_row < 0 or not self._index.has_paint_order[self._layout_row]:
+			return None
+		return self._index.paint_orders[self._layout_row]
+
+	@property
+	def stacking_contexts(self) -> int | None:  # type: ignore[override]
+		if self._layout_row < 0:
+			return None
+		return self._index.stacking_contexts.get(self._layout_row)
+
+	def _fields(self) -> tuple:
+		return (
+			self.is_clickable,
+			self.cursor_style,
+			self.bounds,
+			self.clientRects,
+			self.scrollRects,
+			self.computed_styles,
+			self.paint_order,
+			self.stacking_contexts,
+		)
+
+	def materialize(self) -> EnhancedSnapshotNode:
+		"""Eager copy that no longer references the index, e.g. to send one node to another process."""
+		return EnhancedSnapshotNode(*self._fields())
+
+	def __reduce__(self):
+		# unpickles as the eager dataclass, pickling the view itself would pickle the whole index with it
+		return EnhancedSnapshotNode, self._fields()
+
+
+def build_snapshot_lookup(
+	snapshot: CaptureSnapshotReturns,
+	device_pixel_ratio: float = 1.0,
+) -> SnapshotIndex:
+	"""Build a columnar lookup of backend node ID to (lazily materialized) enhanced snapshot data."""
+	return SnapshotIndex(snapshot, device_pixel_ratio)
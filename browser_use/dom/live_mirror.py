@@ -0,0 +1,365 @@
+"""
+Live mirror of a page's raw CDP DOM tree, kept up to date from DOM mutation events.
+
+`DomService._get_all_trees` normally re-fetches `DOM.getDocument(depth=-1, pierce=True)` on every step. With the mirror,
+the full document is fetched once per navigation on a dedicated CDP session and then patched in place from
+`DOM.childNodeInserted/Removed`, `DOM.attributeModified/Removed`, `DOM.characterDataModified`, `DOM.setChildNodes`
+and shadow root events. Anything the mirror cannot apply safely (unknown node ids, inserted frames, document
+replacement) marks it stale, and the next `get_document()` falls back to a full fetch.
+
+The mirror runs on its own CDP session because the DOM domain only reports mutations for nodes the session has
+already been sent: a `DOM.getDocument(depth=1)` issued elsewhere on the agent session would silently stop events.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.dom.commands import GetDocumentReturns
+from cdp_use.cdp.dom.events import (
+	AttributeModifiedEvent,
+	AttributeRemovedEvent,
+	CharacterDataModifiedEvent,
+	ChildNodeCountUpdatedEvent,
+	ChildNodeInsertedEvent,
+	ChildNodeRemovedEvent,
+	DocumentUpdatedEvent,
+	SetChildNodesEvent,
+	ShadowRootPoppedEvent,
+	ShadowRootPushedEvent,
+)
+from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.target import SessionID, TargetID
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession, CDPSession
+
+# Node keys that hold nested nodes with their own node ids
+_NESTED_LIST_KEYS = ('children', 'shadowRoots', 'pseudoElements')
+_NESTED_NODE_KEYS = ('contentDocument', 'templateContent')
+
+# Frame owners get their content document asynchronously, which mutation events do not describe
+_FRAME_OWNER_NAMES = ('IFRAME', 'FRAME')
+
+
+class LiveDOMMirror:
+	"""Raw CDP DOM tree of one target, patched in place from DOM mutation events."""
+
+	def __init__(self, browser_session: 'BrowserSession', logger: logging.Logger | None = None, max_pending_subtrees: int = 50):
+		self.browser_session = browser_session
+		self.logger = logger or browser_session.logger
+		self.max_pending_subtrees = max_pending_subtrees
+
+		self.target_id: TargetID | None = None
+		self.cdp_session: 'CDPSession | None' = None
+		self.document: Node | None = None
+		self.stale = True
+
+		self._nodes: dict[int, Node] = {}
+		""" NodeId -> raw CDP node (every node reachable from `document`)"""
+		self._incomplete: set[int] = set()
+		""" NodeIds whose children were not sent yet and must be requested before the next read"""
+
+		# Counters
+		self.full_fetches = 0
+		self.incremental_reads = 0
+		self.events_applied = 0
+
+	@property
+	def session_id(self) -> SessionID | None:
+		return self.cdp_session.session_id if self.cdp_session else None
+
+	# --- Public API ---
+
+	async def get_document(self, target_id: TargetID) -> GetDocumentReturns:
+		"""Return the current document of `target_id`, fetching it in full only when the mirror cannot be trusted."""
+		if (
+			self.cdp_session is None
+			or self.target_id != target_id
+			or self.cdp_session.cdp_client is not self.browser_session.cdp_client
+		):
+			await self._attach(target_id)
+
+		if not self.stale and len(self._incomplete) > self.max_pending_subtrees:
+			self.logger.debug(f'Live DOM mirror has {len(self._incomplete)} incomplete subtrees, refetching document')
+			self.stale = True
+
+		if not self.stale and self._incomplete:
+			await self._request_incomplete_subtrees()
+
+		if self.stale or self.document is None:
+			await self._fetch_document()
+		else:
+			self.incremental_reads += 1
+
+		assert self.document is not None
+		return {'root': self.document}
+
+	def invalidate(self) -> None:
+		"""Force a full fetch on the next `get_document()`."""
+		self.stale = True
+
+	def stats(self) -> dict[str, Any]:
+		"""Counters for logging / telemetry."""
+		return {
+			'full_fetches': self.full_fetches,
+			'incremental_reads': self.incremental_reads,
+			'events_applied': self.events_applied,
+			'mirrored_nodes': len(self._nodes),
+		}
+
+	async def close(self) -> None:
+		"""Detach the dedicated CDP session."""
+		cdp_session = self.cdp_session
+		self.cdp_session = None
+		self.target_id = None
+		self._reset(None)
+		if cdp_session is not None:
+			try:
+				await cdp_session.cdp_client.send.Target.detachFromTarget(params={'sessionId': cdp_session.session_id})
+			except Exception as e:
+				self.logger.debug(f'Failed to detach live DOM mirror session: {e}')
+
+	# --- CDP plumbing ---
+
+	async def _attach(self, target_id: TargetID) -> None:
+		from browser_use.browser.session import CDPSession
+
+		await self.close()
+
+		cdp_client = self.browser_session.cdp_client
+		self.cdp_session = await CDPSession.for_target(cdp_client, target_id, domains=['DOM'])
+		self.target_id = target_id
+
+		# One handler per method per client: the handlers filter on our own session id
+		cdp_client.register.DOM.documentUpdated(self.on_document_updated)
+		cdp_client.register.DOM.setChildNodes(self.on_set_child_nodes)
+		cdp_client.register.DOM.childNodeInserted(self.on_child_node_inserted)
+		cdp_client.register.DOM.childNodeRemoved(self.on_child_node_removed)
+		cdp_client.register.DOM.childNodeCountUpdated(self.on_child_node_count_updated)
+		cdp_client.register.DOM.attributeModified(self.on_attribute_modified)
+		cdp_client.register.DOM.attributeRemoved(self.on_attribute_removed)
+		cdp_client.register.DOM.characterDataModified(self.on_character_data_modified)
+		cdp_client.register.DOM.shadowRootPushed(self.on_shadow_root_pushed)
+		cdp_client.register.DOM.shadowRootPopped(self.on_shadow_root_popped)
+		self.logger.debug(f'Live DOM mirror attached to target {target_id[-4:]} (session {self.session_id})')
+
+	async def _fetch_document(self) -> None:
+		assert self.cdp_session is not None
+		result = await self.cdp_session.cdp_client.send.DOM.getDocument(
+			params={'depth': -1, 'pierce': True}, session_id=self.cdp_session.session_id
+		)
+		self._reset(result['root'])
+		self.full_fetches += 1
+
+	async def _request_incomplete_subtrees(self) -> None:
+		"""Ask for the children of nodes that were inserted without them; they arrive as `DOM.setChildNodes` events."""
+		assert self.cdp_session is not None
+		node_ids = list(self._incomplete)
+		results = await asyncio.gather(
+			*(
+				self.cdp_session.cdp_client.send.DOM.requestChildNodes(
+					params={'nodeId': node_id, 'depth': -1, 'pierce': True}, session_id=self.cdp_session.session_id
+				)
+				for node_id in node_ids
+			),
+			return_exceptions=True,
+		)
+		for node_id, result in zip(node_ids, results):
+			if isinstance(result, Exception):
+				self.logger.debug(f'Live DOM mirror failed to request children of node {node_id}: {result}')
+				self.stale = True
+			elif node_id in self._incomplete and node_id in self._nodes:
+				# The node has no children after all (or they were removed before the request was served)
+				self._incomplete.discard(node_id)
+				self._nodes[node_id]['children'] = []
+
+	# --- Tree bookkeeping ---
+
+	def _reset(self, document: Node | None) -> None:
+		self.document = document
+		self._nodes = {}
+		self._incomplete = set()
+		self.stale = document is None
+		if document is not None:
+			self._index(document)
+
+	def _index(self, node: Node) -> None:
+		"""Register a node and everything nested in it."""
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			self._nodes[current['nodeId']] = current
+			if current.get('childNodeCount') and 'children' not in current:
+				self._incomplete.add(current['nodeId'])
+			for key in _NESTED_LIST_KEYS:
+				nested = current.get(key)
+				if nested:
+					stack.extend(nested)
+			for key in _NESTED_NODE_KEYS:
+				nested = current.get(key)
+				if nested:
+					stack.append(nested)
+
+	def _unindex(self, node: Node) -> None:
+		"""Forget a node and everything nested in it."""
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			self._nodes.pop(current['nodeId'], None)
+			self._incomplete.discard(current['nodeId'])
+			for key in _NESTED_LIST_KEYS:
+				nested = current.get(key)
+				if nested:
+					stack.extend(nested)
+			for key in _NESTED_NODE_KEYS:
+				nested = current.get(key)
+				if nested:
+					stack.append(nested)
+
+	@staticmethod
+	def _contains_frame_owner(node: Node) -> bool:
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			if current.get('nodeName', '').upper() in _FRAME_OWNER_NAMES:
+				return True
+			for key in _NESTED_LIST_KEYS:
+				nested = current.get(key)
+				if nested:
+					stack.extend(nested)
+		return False
+
+	def _lookup(self, node_id: int, event_name: str) -> Node | None:
+		"""Find a mirrored node, marking the mirror stale if an event refers to a node we never saw."""
+		node = self._nodes.get(node_id)
+		if node is None:
+			self.logger.debug(f'Live DOM mirror got {event_name} for unknown node {node_id}, will refetch document')
+			self.stale = True
+		return node
+
+	def _accepts(self, session_id: str | None) -> bool:
+		if self.stale or session_id != self.session_id:
+			return False
+		self.events_applied += 1
+		return True
+
+	# --- Event handlers (signature matches cdp_use event handlers) ---
+
+	def on_document_updated(self, event: DocumentUpdatedEvent, session_id: str | None = None) -> None:
+		if session_id == self.session_id:
+			self.stale = True
+
+	def on_set_child_nodes(self, event: SetChildNodesEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		parent = self._lookup(event['parentId'], 'setChildNodes')
+		if parent is None:
+			return
+		for child in parent.get('children') or []:
+			self._unindex(child)
+		parent['children'] = event['nodes']
+		parent['childNodeCount'] = len(event['nodes'])
+		self._incomplete.discard(event['parentId'])
+		for child in event['nodes']:
+			self._index(child)
+
+	def on_child_node_inserted(self, event: ChildNodeInsertedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		parent = self._lookup(event['parentNodeId'], 'childNodeInserted')
+		if parent is None:
+			return
+		node = event['node']
+		if self._contains_frame_owner(node):
+			self.logger.debug('Live DOM mirror got an inserted frame, will refetch document')
+			self.stale = True
+			return
+
+		node['parentId'] = event['parentNodeId']
+		children = parent.setdefault('children', [])
+		position = 0
+		if event['previousNodeId']:
+			position = next((i + 1 for i, child in enumerate(children) if child['nodeId'] == event['previousNodeId']), -1)
+			if position < 0:
+				self.logger.debug(f'Live DOM mirror got childNodeInserted after unknown sibling {event["previousNodeId"]}')
+				self.stale = True
+				return
+		children.insert(position, node)
+		parent['childNodeCount'] = len(children)
+		self._index(node)
+
+	def on_child_node_removed(self, event: ChildNodeRemovedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		parent = self._lookup(event['parentNodeId'], 'childNodeRemoved')
+		node = self._lookup(event['nodeId'], 'childNodeRemoved')
+		if parent is None or node is None:
+			return
+		children = parent.get('children') or []
+		parent['children'] = [child for child in children if child['nodeId'] != event['nodeId']]
+		parent['childNodeCount'] = len(parent['children'])
+		self._unindex(node)
+
+	def on_child_node_count_updated(self, event: ChildNodeCountUpdatedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		node = self._lookup(event['nodeId'], 'childNodeCountUpdated')
+		if node is None:
+			return
+		node['childNodeCount'] = event['childNodeCount']
+		if event['childNodeCount'] and not node.get('children'):
+			self._incomplete.add(event['nodeId'])
+
+	def on_attribute_modified(self, event: AttributeModifiedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		node = self._lookup(event['nodeId'], 'attributeModified')
+		if node is None:
+			return
+		attributes = node.setdefault('attributes', [])
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				attributes[i + 1] = event['value']
+				return
+		attributes.extend((event['name'], event['value']))
+
+	def on_attribute_removed(self, event: AttributeRemovedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		node = self._lookup(event['nodeId'], 'attributeRemoved')
+		if node is None:
+			return
+		attributes = node.get('attributes') or []
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				del attributes[i : i + 2]
+				return
+
+	def on_character_data_modified(self, event: CharacterDataModifiedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		node = self._lookup(event['nodeId'], 'characterDataModified')
+		if node is not None:
+			node['nodeValue'] = event['characterData']
+
+	def on_shadow_root_pushed(self, event: ShadowRootPushedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		host = self._lookup(event['hostId'], 'shadowRootPushed')
+		if host is None:
+			return
+		host.setdefault('shadowRoots', []).append(event['root'])
+		self._index(event['root'])
+
+	def on_shadow_root_popped(self, event: ShadowRootPoppedEvent, session_id: str | None = None) -> None:
+		if not self._accepts(session_id):
+			return
+		host = self._lookup(event['hostId'], 'shadowRootPopped')
+		root = self._lookup(event['rootId'], 'shadowRootPopped')
+		if host is None or root is None:
+			return
+		host['shadowRoots'] = [
+			shadow_root for shadow_root in host.get('shadowRoots') or [] if shadow_root['nodeId'] != event['rootId']
+		]
+		self._unindex(root)
@@ -0,0 +1,139 @@
+"""
+Offloading of the CPU-bound DOM build + serialization to worker processes.
+
+On hosts that run many agents in one event loop, building the enhanced tree, paint order filtering and
+serialization of every agent compete for the same interpreter. With `DomService(process_pool=...)` the raw CDP
+payloads are sent to a worker instead, which builds and serializes the page and sends back the serialized state.
+
+Sending back the whole enhanced tree would cost about as much to unpickle as building it, so the worker first prunes
+it with `prune_for_transfer` to the nodes the serialized state and the actions on its selector map still read.
+
+Workers are started with the `spawn` method: forking a process that runs an event loop and websocket threads can copy
+held locks into the children.
+"""
+
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from browser_use.dom.views import EnhancedDOMTreeNode, SerializedDOMState
+
+_shared_pools: dict[int, ProcessPoolExecutor] = {}
+_shared_pool_users: dict[int, int] = {}
+
+
+def acquire_shared_process_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+	"""Process pool shared by all browser sessions of this process with the same size, created on first use.
+
+	Every call must be paired with a `release_shared_process_pool()`, the pool is shut down when its last user
+	released it (or at exit).
+	"""
+	max_workers = max_workers or os.cpu_count() or 1
+	pool = _shared_pools.get(max_workers)
+	if pool is None:
+		pool = _shared_pools[max_workers] = ProcessPoolExecutor(
+			max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+		)
+	_shared_pool_users[max_workers] = _shared_pool_users.get(max_workers, 0) + 1
+	return pool
+
+
+def release_shared_process_pool(pool: ProcessPoolExecutor) -> None:
+	"""Give back a pool from `acquire_shared_process_pool()`, shutting it down if nobody else uses it."""
+	for max_workers, shared_pool in list(_shared_pools.items()):
+		if shared_pool is pool:
+			_shared_pool_users[max_workers] -= 1
+			if _shared_pool_users[max_workers] <= 0:
+				del _shared_pools[max_workers], _shared_pool_users[max_workers]
+				pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_shared_process_pools() -> None:
+	"""Shut down all shared pools, for sessions that were never stopped."""
+	pools = list(_shared_pools.values())
+	_shared_pools.clear()
+	_shared_pool_users.clear()
+	for pool in pools:
+		pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _strip(node: EnhancedDOMTreeNode) -> None:
+	"""Reduce a sibling that nothing reads to what `xpath` of its siblings needs: its node type and name."""
+	node.children_nodes = None
+	node.shadow_roots = None
+	node.content_document = None
+	node.snapshot_node = None
+	node.ax_node = None
+	node.attributes = {}
+
+
+def prune_for_transfer(serialized_dom_state: SerializedDOMState, root: EnhancedDOMTreeNode) -> int:
+	"""Drop the parts of the enhanced tree that neither the serialized state nor actions on its elements read.
+
+	Kept in full: every node the simplified tree points to, the whole subtree of every selector map element
+	(children text, iframe documents for scroll info), every file input (upload_file looks for one near the element
+	it is given, often a hidden one) and all their ancestors. Other children of kept nodes are stripped down to
+	their tag, so xpaths stay the same. Mutates the tree in place, only call it on a tree that
+	is about to be sent elsewhere. Returns the number of nodes kept.
+	"""
+	keep: set[int] = set()
+
+	def keep_with_ancestors(node: EnhancedDOMTreeNode | None) -> None:
+		while node is not None and id(node) not in keep:
+			keep.add(id(node))
+			node = node.parent_node
+
+	keep_with_ancestors(root)
+	simplified_stack = [serialized_dom_state._root] if serialized_dom_state._root else []
+	while simplified_stack:
+		simplified = simplified_stack.pop()
+		keep_with_ancestors(simplified.original_node)
+		simplified_stack.extend(simplified.children)
+
+	for element in serialized_dom_state.selector_map.values():
+		subtree = [element]
+		while subtree:
+			node = subtree.pop()
+			keep_with_ancestors(node)
+			subtree.extend(node.children_and_shadow_roots)
+			if node.content_document:
+				subtree.append(node.content_document)
+
+	stack = [root]
+	visited: set[int] = set()
+	while stack:
+		node = stack.pop()
+		if id(node) in visited:
+			continue
+		visited.add(id(node))
+		if node.node_name.upper() == 'INPUT' and node.attributes.get('type', '').lower() == 'file':
+			keep_with_ancestors(node)
+		stack.extend(node.children_and_shadow_roots)
+		if node.content_document:
+			stack.append(node.content_document)
+
+	stack = [root]
+	visited.clear()
+	while stack:
+		node = stack.pop()
+		if id(node) in visited:
+			continue  # the same node can be attached twice, see DomService.build_enhanced_tree
+		visited.add(id(node))
+
+		for child in node.children_nodes or ():
+			if id(child) in keep:
+				stack.append(child)
+			else:
+				_strip(child)
+		if node.shadow_roots:
+			node.shadow_roots = [shadow_root for shadow_root in node.shadow_roots if id(shadow_root) in keep] or None
+			stack.extend(node.shadow_roots or ())
+		if node.content_document is not None:
+			if id(node.content_document) in keep:
+				stack.append(node.content_document)
+			else:
+				node.content_document = None
+
+	return len(keep)
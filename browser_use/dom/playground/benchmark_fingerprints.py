@@ -0,0 +1,83 @@
+"""
+Benchmark element fingerprints: walking to the root and hashing the branch path per call vs. one top-down pass.
+
+Mirrors what a step with two indexed actions does in `Agent.multi_act`: hash every selector-map element of the
+cached state, then hash every element of the fresh state after the first action, plus `hash()` for the interacted
+element records. `rounds` controls how many times the selector map is hashed.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_fingerprints [num_nodes ...]
+"""
+
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+
+def _all_nodes(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	nodes = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		nodes.append(node)
+		stack.extend(node.children_and_shadow_roots)
+		if node.content_document:
+			stack.append(node.content_document)
+	return nodes
+
+
+def _hash_selector_map(elements: list[EnhancedDOMTreeNode], rounds: int) -> list[tuple[int, int]]:
+	hashes = []
+	for _ in range(rounds):
+		hashes = [(element.parent_branch_hash(), hash(element)) for element in elements]
+	return hashes
+
+
+def _forget_fingerprints(nodes: list[EnhancedDOMTreeNode]) -> None:
+	for node in nodes:
+		node._parent_branch_hash = None
+		node._element_hash = None
+
+
+def main(sizes: list[int], rounds: int = 2) -> None:
+	browser_session = SimpleNamespace(logger=logging.getLogger('benchmark'), agent_focus=None)
+	dom_service = DomService(browser_session)  # type: ignore[arg-type]
+
+	print(f'{"nodes":>8} | {"elements":>8} | {"selector map":>12} | {"walk ms":>8} | {"precompute ms":>13} | {"speedup":>7}')
+	for size in sizes:
+		root, _ = dom_service.build_enhanced_tree(make_synthetic_page(size, scroll_y=500), 'benchmark')
+		state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+		elements = list(state.selector_map.values())
+		nodes = _all_nodes(root)
+		num_elements = sum(1 for node in nodes if node.node_type == NodeType.ELEMENT_NODE)
+
+		# walk-based: every call walks to the root and hashes the full path (nothing memoized between rounds)
+		walk_time = 0.0
+		walk_hashes = []
+		for _ in range(rounds):
+			_forget_fingerprints(nodes)
+			start = time.perf_counter()
+			walk_hashes = _hash_selector_map(elements, 1)
+			walk_time += time.perf_counter() - start
+
+		_forget_fingerprints(nodes)
+		start = time.perf_counter()
+		DomService.compute_fingerprints(root)
+		precomputed_hashes = _hash_selector_map(elements, rounds)
+		precompute_time = time.perf_counter() - start
+
+		assert precomputed_hashes == walk_hashes
+		print(
+			f'{size:>8} | {num_elements:>8} | {len(elements):>12} | {walk_time * 1000:>8.1f} | '
+			f'{precompute_time * 1000:>13.1f} | {walk_time / precompute_time:>6.2f}x'
+		)
+
+
+if __name__ == '__main__':
+	main([int(arg) for arg in sys.argv[1:]] or [2_000, 10_000, 50_000])
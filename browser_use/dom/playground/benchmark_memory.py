@@ -0,0 +1,98 @@
+"""
+Benchmark the memory held by one DOM state: bytes per node of the enhanced tree and of the simplified tree.
+
+Measures with tracemalloc what stays allocated after `build_enhanced_tree` and after `DOMTreeSerializer` once the
+raw payloads are dropped, i.e. what an agent keeps alive per step. The synthetic payloads are decoded from JSON, so
+strings are separate objects like in CDP responses.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_memory [num_nodes ...]
+"""
+
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+from dataclasses import replace
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, SimplifiedNode
+
+
+def count_nodes(root: EnhancedDOMTreeNode) -> int:
+	count = 0
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		count += 1
+		stack.extend(node.children_nodes or [])
+		stack.extend(node.shadow_roots or [])
+		if node.content_document:
+			stack.append(node.content_document)
+	return count
+
+
+def count_simplified_nodes(root: SimplifiedNode | None) -> int:
+	count = 0
+	stack = [root] if root else []
+	while stack:
+		node = stack.pop()
+		count += 1
+		stack.extend(node.children)
+	return count
+
+
+def _allocated() -> int:
+	gc.collect()
+	return tracemalloc.get_traced_memory()[0]
+
+
+def measure(dom_service: DomService, num_nodes: int) -> dict[str, float]:
+	trees = make_synthetic_page(num_nodes, with_iframe=True)
+	payloads = {name: json.dumps(getattr(trees, name)) for name in ('snapshot', 'dom_tree', 'ax_tree')}
+
+	tracemalloc.start()
+	try:
+		baseline = _allocated()
+		# decoded under tracing and dropped after the build: counts payload strings the nodes keep alive
+		decoded = replace(trees, **{name: json.loads(payload) for name, payload in payloads.items()})
+		root, _ = dom_service.build_enhanced_tree(decoded, 'benchmark')
+		DomService.compute_fingerprints(root)
+		del decoded
+		tree_bytes = _allocated() - baseline
+
+		state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+		simplified_bytes = _allocated() - baseline - tree_bytes
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	nodes = count_nodes(root)
+	simplified_nodes = count_simplified_nodes(state._root)
+	return {
+		'nodes': nodes,
+		'tree_bytes_per_node': tree_bytes / nodes,
+		'simplified_nodes': simplified_nodes,
+		'simplified_bytes_per_node': simplified_bytes / max(simplified_nodes, 1),
+		'peak_mb': (peak - baseline) / 1e6,
+	}
+
+
+def main(sizes: list[int]) -> None:
+	dom_service = DomService(SimpleNamespace(logger=logging.getLogger('benchmark'), agent_focus=None))  # type: ignore[arg-type]
+
+	print(f'{"nodes":>8} | {"tree B/node":>11} | {"simplified":>10} | {"simpl. B/node":>13} | {"peak MB":>8}')
+	for size in sizes:
+		result = measure(dom_service, size)
+		print(
+			f'{result["nodes"]:>8} | {result["tree_bytes_per_node"]:>11.0f} | {result["simplified_nodes"]:>10} | '
+			f'{result["simplified_bytes_per_node"]:>13.0f} | {result["peak_mb"]:>8.1f}'
+		)
+
+
+if __name__ == '__main__':
+	main([int(arg) for arg in sys.argv[1:]] or [2_000, 10_000])
@@ -0,0 +1,73 @@
+"""
+Benchmark several agents serializing their pages on one event loop, in-process vs offloaded to a process pool.
+
+Reports the wall time for all agents and the longest time the event loop was blocked, which is what delays every
+other agent's CDP traffic and timers on a multi-agent host.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_offload [num_agents] [num_nodes]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.service import DomService
+
+
+def _dom_service(num_nodes: int, seed: int, process_pool: Executor | None) -> DomService:
+	browser_session = SimpleNamespace(logger=logging.getLogger('benchmark'), agent_focus=None, current_target_id='benchmark')
+	dom_service = DomService(browser_session, process_pool=process_pool)  # type: ignore[arg-type]
+	# generated up front, so only the DOM processing is measured
+	trees = make_synthetic_page(num_nodes, seed=seed)
+
+	async def _get_all_trees(target_id, use_live_dom_mirror=False):
+		return trees
+
+	dom_service._get_all_trees = _get_all_trees  # type: ignore[method-assign]
+	return dom_service
+
+
+async def _max_loop_stall(stop: asyncio.Event, interval: float = 0.005) -> float:
+	stall = 0.0
+	while not stop.is_set():
+		start = time.perf_counter()
+		await asyncio.sleep(interval)
+		stall = max(stall, time.perf_counter() - start - interval)
+	return stall
+
+
+async def run(num_agents: int, num_nodes: int, process_pool: Executor | None) -> tuple[float, float]:
+	"""(wall time, longest event loop stall) in seconds for `num_agents` concurrent serializations"""
+	dom_services = [_dom_service(num_nodes, seed, process_pool) for seed in range(num_agents)]
+	stop = asyncio.Event()
+	monitor = asyncio.create_task(_max_loop_stall(stop))
+	await asyncio.sleep(0)
+
+	start = time.perf_counter()
+	await asyncio.gather(*(dom_service.get_serialized_dom_tree() for dom_service in dom_services))
+	wall = time.perf_counter() - start
+
+	stop.set()
+	return wall, await monitor
+
+
+async def main(num_agents: int, num_nodes: int) -> None:
+	with ProcessPoolExecutor(max_workers=num_agents) as process_pool:
+		# start the workers and import the DOM modules in them before measuring
+		await run(num_agents, 100, process_pool)
+
+		print(f'{num_agents} agents x {num_nodes} nodes')
+		print(f'{"mode":>10} | {"wall s":>7} | {"max loop stall ms":>17}')
+		for mode, pool in (('in-process', None), ('offloaded', process_pool)):
+			wall, stall = await run(num_agents, num_nodes, pool)
+			print(f'{mode:>10} | {wall:>7.2f} | {stall * 1000:>17.1f}')
+
+
+if __name__ == '__main__':
+	args = [int(arg) for arg in sys.argv[1:]]
+	asyncio.run(main(*(args + [4, 2_000][len(args) :])))
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark for the paint-order occlusion engines (RectUnionPure vs RectUnionGrid).
+
+Each workload is a list of rectangles in paint order (last painted first, like PaintOrderRemover walks them);
+every rectangle is checked with `contains` and then `add`ed, mirroring `PaintOrderRemover.calculate_paint_order`.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_paint_order [num_rects ...]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from browser_use.dom.serializer.paint_order import Rect, RectUnionGrid, RectUnionPure
+
+# RectUnionPure is quadratic (about a minute for a 10k-cell data grid), skip it above this size unless sizes are passed explicitly
+PURE_ENGINE_LIMIT = 1_000
+
+
+def data_grid(n: int, seed: int = 0) -> list[Rect]:
+	"""Spreadsheet-like grid of cells with a sticky header row and a few popovers on top."""
+	rng = random.Random(seed)
+	columns = 12
+	cell_w, cell_h = 110.0, 28.0
+	rects = [
+		Rect(c * cell_w, r * cell_h, (c + 1) * cell_w, (r + 1) * cell_h) for r in range(n // columns + 1) for c in range(columns)
+	]
+	rects = rects[:n]
+	header = [Rect(c * cell_w, 0, (c + 1) * cell_w, cell_h) for c in range(columns)]
+	popovers = [Rect(x := rng.uniform(0, 1000), y := rng.uniform(0, n // columns * cell_h), x + 300, y + 200) for _ in range(10)]
+	return popovers + header + rects
+
+
+def feed(n: int, seed: int = 0) -> list[Rect]:
+	"""Infinite feed: cards with nested text/button rects, an overlay modal covering the first screen."""
+	rng = random.Random(seed)
+	rects = [Rect(0, 0, 1280, 720)]  # modal backdrop, painted last
+	y = 0.0
+	while len(rects) < n:
+		card_h = rng.uniform(150, 400)
+		rects.append(Rect(100, y, 900, y + card_h))
+		for i in range(rng.randint(3, 8)):
+			top = y + 10 + i * 20
+			rects.append(Rect(110, top, 110 + rng.uniform(100, 700), top + 18))
+		y += card_h + 10
+	return rects[:n]
+
+
+def random_overlap(n: int, seed: int = 0) -> list[Rect]:
+	"""Uniformly scattered, heavily overlapping rectangles of mixed sizes."""
+	rng = random.Random(seed)
+	height = max(2000.0, n * 4.0)
+	rects = []
+	for _ in range(n):
+		x, y = rng.uniform(0, 1280), rng.uniform(0, height)
+		w, h = rng.choice((rng.uniform(5, 60), rng.uniform(60, 400))), rng.uniform(5, 120)
+		rects.append(Rect(x, y, x + w, y + h))
+	return rects
+
+
+WORKLOADS: dict[str, Callable[[int], list[Rect]]] = {'data_grid': data_grid, 'feed': feed, 'random_overlap': random_overlap}
+
+
+def run(engine: type[RectUnionPure] | type[RectUnionGrid], rects: list[Rect]) -> tuple[float, int]:
+	"""Return (seconds, number of covered rects)."""
+	union = engine()
+	covered = 0
+	start = time.perf_counter()
+	for rect in rects:
+		if union.contains(rect):
+			covered += 1
+		union.add(rect)
+	return time.perf_counter() - start, covered
+
+
+def main(sizes: list[int], force_pure: bool = False) -> None:
+	print(f'{"workload":>15} | {"rects":>7} | {"rect_union ms":>13} | {"grid ms":>9} | {"speedup":>8} | {"covered":>7}')
+	for name, workload in WORKLOADS.items():
+		for size in sizes:
+			rects = workload(size)
+			grid_time, grid_covered = run(RectUnionGrid, rects)
+			if force_pure or size <= PURE_ENGINE_LIMIT:
+				pure_time, pure_covered = run(RectUnionPure, rects)
+				assert pure_covered == grid_covered, (name, size, pure_covered, grid_covered)
+				pure_ms, speedup = f'{pure_time * 1000:.1f}', f'{pure_time / grid_time:.1f}x'
+			else:
+				pure_ms, speedup = 'skipped', '-'
+			print(f'{name:>15} | {size:>7} | {pure_ms:>13} | {grid_time * 1000:>9.1f} | {speedup:>8} | {grid_covered:>7}')
+
+
+if __name__ == '__main__':
+	args = [int(arg) for arg in sys.argv[1:]]
+	main(args or [1_000, 10_000, 50_000], force_pure=bool(args))
@@ -0,0 +1,60 @@
+"""
+Benchmark the columnar snapshot index against the eager dict-of-objects lookup.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_snapshot [num_nodes ...]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from browser_use.dom.enhanced_snapshot import build_eager_snapshot_lookup, build_snapshot_lookup
+from browser_use.dom.playground.synthetic import make_synthetic_page
+
+
+def _measure(fn, repeat: int = 5) -> tuple[float, int]:
+	"""Return (best wall time in seconds, peak traced bytes) for fn()."""
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		best = min(best, time.perf_counter() - start)
+
+	tracemalloc.start()
+	result = fn()
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del result
+	return best, peak
+
+
+def main(sizes: list[int]) -> None:
+	print(
+		f'{"nodes":>8} | {"eager ms":>9} | {"columnar ms":>11} | {"+serializer reads ms":>20} | {"eager MB":>8} | {"columnar MB":>11}'
+	)
+	for size in sizes:
+		snapshot = make_synthetic_page(size).snapshot
+
+		eager_time, eager_peak = _measure(lambda: build_eager_snapshot_lookup(snapshot))
+		columnar_time, columnar_peak = _measure(lambda: build_snapshot_lookup(snapshot))
+
+		# the tree builder looks up every DOM node, the serializer reads bounds/styles of a fraction of them
+		def columnar_with_reads():
+			index = build_snapshot_lookup(snapshot)
+			for i, backend_node_id in enumerate(index):
+				view = index[backend_node_id]
+				if i % 4 == 0:
+					_ = view.bounds, view.computed_styles, view.paint_order
+			return index
+
+		reads_time, _ = _measure(columnar_with_reads)
+
+		print(
+			f'{size:>8} | {eager_time * 1000:>9.1f} | {columnar_time * 1000:>11.1f} | {reads_time * 1000:>20.1f} | '
+			f'{eager_peak / 1e6:>8.1f} | {columnar_peak / 1e6:>11.1f}'
+		)
+
+
+if __name__ == '__main__':
+	main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 30_000, 80_000])
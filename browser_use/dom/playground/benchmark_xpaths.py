@@ -0,0 +1,48 @@
+"""
+Benchmark selector-map xpaths: walking to the root and rescanning the siblings per element vs. one batched pass.
+
+The walk-based numbers are what every access cost before xpaths were memoized (history items, interacted element
+records, debugging each read `xpath` again). Long lists with many same-tag siblings are the worst case for the walk.
+
+Usage:
+	python -m browser_use.dom.playground.benchmark_xpaths [num_nodes ...]
+"""
+
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+
+
+def main(sizes: list[int]) -> None:
+	browser_session = SimpleNamespace(logger=logging.getLogger('benchmark'), agent_focus=None)
+	dom_service = DomService(browser_session)  # type: ignore[arg-type]
+
+	print(f'{"nodes":>8} | {"selector map":>12} | {"walk ms":>8} | {"batch ms":>8} | {"speedup":>7}')
+	for size in sizes:
+		root, _ = dom_service.build_enhanced_tree(make_synthetic_page(size, with_iframe=True), 'benchmark')
+		state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+		elements = list(state.selector_map.values())
+
+		start = time.perf_counter()
+		walk_xpaths = [element._build_xpath() for element in elements]
+		walk_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		DomService.compute_xpaths(elements)
+		batch_xpaths = [element.xpath for element in elements]
+		batch_time = time.perf_counter() - start
+
+		assert batch_xpaths == walk_xpaths
+		print(
+			f'{size:>8} | {len(elements):>12} | {walk_time * 1000:>8.1f} | {batch_time * 1000:>8.1f} | '
+			f'{walk_time / batch_time:>6.1f}x'
+		)
+
+
+if __name__ == '__main__':
+	main([int(arg) for arg in sys.argv[1:]] or [2_000, 10_000, 50_000])
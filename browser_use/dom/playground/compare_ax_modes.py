@@ -0,0 +1,100 @@
+"""
+Compare the AX tree modes ('full', 'lazy', 'off') for latency and element-detection parity.
+
+Without arguments it runs offline on synthetic pages: the lazy / off AX trees are derived from the full one (keeping
+only candidate nodes / nothing), so only parity is measured. With URLs it opens a browser and measures the CDP fetch
+latency of each mode on the live pages as well.
+
+Usage:
+	python -m browser_use.dom.playground.compare_ax_modes [url ...]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import replace
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import AXTreeMode, TargetAllTrees
+
+AX_TREE_MODES: tuple[AXTreeMode, ...] = ('full', 'lazy', 'off')
+
+
+def with_ax_mode(trees: TargetAllTrees, mode: AXTreeMode) -> TargetAllTrees:
+	"""Trim a full AX tree down to what the given mode would have fetched."""
+	if mode == 'full':
+		return trees
+	if mode == 'off':
+		return replace(trees, ax_tree={'nodes': []})
+	candidates = set(DomService._get_ax_candidate_backend_node_ids(trees.dom_tree, trees.snapshot))
+	nodes = [node for node in trees.ax_tree['nodes'] if node.get('backendDOMNodeId') in candidates]
+	return replace(trees, ax_tree={'nodes': nodes})
+
+
+def selector_map_parity(dom_service: DomService, trees_by_mode: dict[AXTreeMode, TargetAllTrees]) -> dict[AXTreeMode, tuple]:
+	"""Return {mode: (elements, missing vs full, extra vs full)} comparing selector maps by backend node id."""
+	backend_node_ids: dict[AXTreeMode, set[int]] = {}
+	for mode, trees in trees_by_mode.items():
+		root, _ = dom_service.build_enhanced_tree(trees, 'compare')
+		state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+		backend_node_ids[mode] = {node.backend_node_id for node in state.selector_map.values()}
+
+	full = backend_node_ids['full']
+	return {mode: (len(ids), len(full - ids), len(ids - full)) for mode, ids in backend_node_ids.items()}
+
+
+def print_row(page: str, mode: AXTreeMode, parity: tuple, latency_ms: float | None = None) -> None:
+	elements, missing, extra = parity
+	latency = f'{latency_ms:.1f}' if latency_ms is not None else '-'
+	print(f'{page[:40]:>40} | {mode:>4} | {latency:>10} | {elements:>8} | {missing:>7} | {extra:>5}')
+
+
+def offline(sizes: list[int]) -> None:
+	dom_service = DomService(SimpleNamespace(logger=logging.getLogger('compare'), agent_focus=None))  # type: ignore[arg-type]
+	for size in sizes:
+		# the builder mutates snapshot bounds in place, so every mode gets its own payload
+		trees_by_mode = {mode: with_ax_mode(make_synthetic_page(size, with_iframe=True), mode) for mode in AX_TREE_MODES}
+		for mode, parity in selector_map_parity(dom_service, trees_by_mode).items():
+			print_row(f'synthetic {size} nodes', mode, parity)
+
+
+async def live(urls: list[str], repeat: int = 3) -> None:
+	from browser_use.browser import BrowserProfile, BrowserSession
+	from browser_use.browser.events import NavigateToUrlEvent
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+	await browser_session.start()
+	try:
+		for url in urls:
+			await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+			await asyncio.sleep(2)
+			assert browser_session.agent_focus is not None
+			target_id = browser_session.agent_focus.target_id
+
+			trees_by_mode: dict[AXTreeMode, TargetAllTrees] = {}
+			latency: dict[AXTreeMode, float] = {}
+			for mode in AX_TREE_MODES:
+				dom_service = DomService(browser_session, ax_tree_mode=mode)
+				best = float('inf')
+				for _ in range(repeat):
+					start = time.perf_counter()
+					trees_by_mode[mode] = await dom_service._get_all_trees(target_id)
+					best = min(best, time.perf_counter() - start)
+				latency[mode] = best * 1000
+
+			for mode, parity in selector_map_parity(DomService(browser_session), trees_by_mode).items():
+				print_row(url, mode, parity, latency[mode])
+	finally:
+		await browser_session.kill()
+
+
+if __name__ == '__main__':
+	print(f'{"page":>40} | {"mode":>4} | {"latency ms":>10} | {"elements":>8} | {"missing":>7} | {"extra":>5}')
+	if sys.argv[1:]:
+		asyncio.run(live(sys.argv[1:]))
+	else:
+		offline([2_000, 10_000])
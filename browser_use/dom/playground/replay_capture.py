@@ -0,0 +1,55 @@
+"""
+Replay a DOM capture file offline: build and serialize every recorded step and report where the time goes.
+
+Record one by running an agent with `BrowserProfile(dom_capture_path='tmp/page.domcap')`, or write the steps of a
+synthetic page with `--synthetic`.
+
+Usage:
+	python -m browser_use.dom.playground.replay_capture tmp/page.domcap
+	python -m browser_use.dom.playground.replay_capture --synthetic tmp/synthetic.domcap [num_nodes]
+"""
+
+import asyncio
+import sys
+import time
+
+from browser_use.dom.capture import DOMCaptureRecorder, offline_dom_service, read_dom_captures
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+
+
+def write_synthetic(path: str, num_nodes: int) -> None:
+	recorder = DOMCaptureRecorder(path)
+	for scroll_y in (0, 500, 1_000):
+		recorder.write('synthetic', make_synthetic_page(num_nodes, scroll_y=scroll_y, with_iframe=True))
+	print(f'wrote {recorder.steps} steps, {recorder.bytes_written / 1e6:.2f} MB to {path}')
+
+
+async def main(path: str) -> None:
+	dom_service = offline_dom_service()
+	previous_state = None
+
+	print(f'{"step":>4} | {"build ms":>8} | {"serialize ms":>12} | {"elements":>8} | {"chars":>8} | url')
+	for step, capture in enumerate(read_dom_captures(path)):
+		start = time.perf_counter()
+		root = await dom_service.get_dom_tree(capture.target_id, trees=capture.trees)
+		build = time.perf_counter() - start
+
+		start = time.perf_counter()
+		previous_state, _ = DOMTreeSerializer(
+			root, previous_state, paint_order_filtering=dom_service.paint_order_filtering
+		).serialize_accessible_elements()
+		text = previous_state.llm_representation()
+		serialize = time.perf_counter() - start
+
+		print(
+			f'{step:>4} | {build * 1000:>8.1f} | {serialize * 1000:>12.1f} | {len(previous_state.selector_map):>8} | '
+			f'{len(text):>8} | {capture.url or ""}'
+		)
+
+
+if __name__ == '__main__':
+	if sys.argv[1:2] == ['--synthetic']:
+		write_synthetic(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 2_000)
+	else:
+		asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,304 @@
+"""
+Synthetic CDP payloads for benchmarking the DOM pipeline without a browser.
+
+`make_synthetic_page(n)` returns a `TargetAllTrees` whose DOM tree, DOMSnapshot and AX tree look like what
+Chrome returns for a long feed-style page with roughly `n` nodes (rows of links, buttons, inputs and text,
+some hidden, some off-screen, one scrollable panel).
+"""
+
+import random
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+from browser_use.dom.views import NodeType, TargetAllTrees
+
+VIEWPORT_WIDTH = 1280
+VIEWPORT_HEIGHT = 720
+ROW_HEIGHT = 40
+NODES_PER_ROW = 9  # div + a + text + button + text + input + span + text + text(spacer)
+
+
+class _Builder:
+	def __init__(self, seed: int):
+		self.rng = random.Random(seed)
+		self.next_id = 1
+		self.strings: list[str] = []
+		self.string_ids: dict[str, int] = {}
+		self.snap_nodes: dict[str, list] = {
+			'parentIndex': [],
+			'nodeType': [],
+			'nodeName': [],
+			'nodeValue': [],
+			'backendNodeId': [],
+			'attributes': [],
+		}
+		self.clickable: list[int] = []
+		self.layout: dict[str, list] = {
+			'nodeIndex': [],
+			'styles': [],
+			'bounds': [],
+			'text': [],
+			'paintOrders': [],
+			'offsetRects': [],
+			'scrollRects': [],
+			'clientRects': [],
+		}
+		self.ax_nodes: list[dict] = []
+		self.paint_order = 0
+
+	def s(self, value: str) -> int:
+		if value not in self.string_ids:
+			self.string_ids[value] = len(self.strings)
+			self.strings.append(value)
+		return self.string_ids[value]
+
+	def node(
+		self,
+		parent: dict | None,
+		parent_index: int,
+		node_type: NodeType,
+		name: str,
+		value: str = '',
+		attributes: dict[str, str] | None = None,
+		bounds: tuple[float, float, float, float] | None = None,
+		styles: dict[str, str] | None = None,
+		clickable: bool = False,
+		ax_role: str | None = None,
+		ax_name: str | None = None,
+		scroll: tuple[float, float, float, float] | None = None,
+		content_document_of: dict | None = None,
+	) -> tuple[dict, int]:
+		node_id = self.next_id
+		self.next_id += 1
+		attrs = attributes or {}
+		dom_node: dict = {
+			'nodeId': node_id,
+			'backendNodeId': node_id,
+			'nodeType': node_type.value,
+			'nodeName': name,
+			'localName': name.lower() if node_type == NodeType.ELEMENT_NODE else '',
+			'nodeValue': value,
+		}
+		if node_type == NodeType.ELEMENT_NODE:
+			dom_node['attributes'] = [item for pair in attrs.items() for item in pair]
+		if content_document_of is not None:
+			content_document_of['contentDocument'] = dom_node
+		elif parent is not None:
+			dom_node['parentId'] = parent['nodeId']
+			parent.setdefault('children', []).append(dom_node)
+			parent['childNodeCount'] = len(parent['children'])
+
+		snapshot_index = len(self.snap_nodes['backendNodeId'])
+		self.snap_nodes['parentIndex'].append(parent_index)
+		self.snap_nodes['nodeType'].append(node_type.value)
+		self.snap_nodes['nodeName'].append(self.s(name))
+		self.snap_nodes['nodeValue'].append(self.s(value) if value else -1)
+		self.snap_nodes['backendNodeId'].append(node_id)
+		self.snap_nodes['attributes'].append([self.s(item) for pair in attrs.items() for item in pair])
+		if clickable:
+			self.clickable.append(snapshot_index)
+
+		if bounds is not None:
+			computed = {'display': 'block', 'visibility': 'visible', 'opacity': '1', 'cursor': 'auto'}
+			computed.update(styles or {})
+			self.layout['nodeIndex'].append(snapshot_index)
+			self.layout['styles'].append([self.s(computed.get(style, '')) for style in REQUIRED_COMPUTED_STYLES])
+			self.layout['bounds'].append(list(bounds))
+			self.layout['text'].append(self.s(value) if value else -1)
+			self.layout['paintOrders'].append(self.paint_order)
+			self.paint_order += 1
+			self.layout['offsetRects'].append(list(bounds))
+			self.layout['scrollRects'].append(list(scroll) if scroll else [])
+			self.layout['clientRects'].append([0, 0, bounds[2], bounds[3]] if scroll else [])
+
+		if ax_role:
+			self.ax_nodes.append(
+				{
+					'nodeId': str(node_id),
+					'ignored': False,
+					'role': {'type': 'role', 'value': ax_role},
+					'name': {'type': 'computedString', 'value': ax_name or ''},
+					'properties': [{'name': 'focusable', 'value': {'type': 'booleanOrUndefined', 'value': True}}],
+					'backendDOMNodeId': node_id,
+				}
+			)
+		return dom_node, snapshot_index
+
+
+def _add_iframe(b: _Builder, body: dict, body_idx: int) -> None:
+	"""400x300 iframe at (600, 50) whose document is scrolled down by 100px; half of its rows are out of its viewport."""
+	iframe, iframe_idx = b.node(
+		body, body_idx, NodeType.ELEMENT_NODE, 'IFRAME', attributes={'src': '/frame'}, bounds=(600, 50, 400, 300)
+	)
+	document, document_idx = b.node(iframe, iframe_idx, NodeType.DOCUMENT_NODE, '#document', content_document_of=iframe)
+	html, html_idx = b.node(
+		document, document_idx, NodeType.ELEMENT_NODE, 'HTML', bounds=(0, 0, 400, 800), scroll=(0, 100, 400, 800)
+	)
+	html['frameId'] = 'CHILDFRAME'
+	frame_body, frame_body_idx = b.node(html, html_idx, NodeType.ELEMENT_NODE, 'BODY', bounds=(0, 0, 400, 800))
+	for i in range(16):
+		b.node(
+			frame_body,
+			frame_body_idx,
+			NodeType.ELEMENT_NODE,
+			'BUTTON',
+			attributes={'type': 'button'},
+			bounds=(10, i * 50, 120, 30),
+			styles={'cursor': 'pointer'},
+			clickable=True,
+			ax_role='button',
+			ax_name=f'Frame button {i}',
+		)
+
+
+def make_synthetic_page(
+	num_nodes: int = 10_000,
+	seed: int = 0,
+	scroll_y: float = 0.0,
+	with_iframe: bool = False,
+	cross_origin_iframes: int = 0,
+	section_every: int = 0,
+) -> TargetAllTrees:
+	"""Build synthetic `DOM.getDocument` / `DOMSnapshot.captureSnapshot` / AX payloads with about `num_nodes` nodes.
+
+	`with_iframe` adds a scrolled same-origin iframe (with its content document inlined, like `pierce=True`).
+	`cross_origin_iframes` adds that many visible 400x300 iframes without content document (frame ids `OOPIF-<i>`),
+	like out-of-process iframes whose documents live in their own targets.
+	`section_every` starts a new section with an H2 heading ("Section <k>") in every that many rows.
+	"""
+	b = _Builder(seed)
+	rows = max(1, num_nodes // NODES_PER_ROW)
+	page_height = rows * ROW_HEIGHT + 200
+
+	document, doc_idx = b.node(None, -1, NodeType.DOCUMENT_NODE, '#document')
+	html, html_idx = b.node(
+		document,
+		doc_idx,
+		NodeType.ELEMENT_NODE,
+		'HTML',
+		bounds=(0, 0, VIEWPORT_WIDTH, page_height),
+		scroll=(0, scroll_y, VIEWPORT_WIDTH, page_height),
+	)
+	html['frameId'] = 'MAINFRAME'
+	head, _ = b.node(html, html_idx, NodeType.ELEMENT_NODE, 'HEAD')
+	body, body_idx = b.node(html, html_idx, NodeType.ELEMENT_NODE, 'BODY', bounds=(0, 0, VIEWPORT_WIDTH, page_height))
+	panel, panel_idx = b.node(
+		body,
+		body_idx,
+		NodeType.ELEMENT_NODE,
+		'DIV',
+		attributes={'class': 'side-panel'},
+		bounds=(VIEWPORT_WIDTH - 300, 0, 300, VIEWPORT_HEIGHT),
+		styles={'overflow': 'auto', 'overflow-y': 'auto', 'background-color': 'rgb(255, 255, 255)'},
+		scroll=(0, 0, 300, VIEWPORT_HEIGHT * 3),
+	)
+	for i in range(10):
+		b.node(panel, panel_idx, NodeType.TEXT_NODE, '#text', f'Panel entry {i}', bounds=(VIEWPORT_WIDTH - 290, 20 * i, 200, 18))
+
+	if with_iframe:
+		_add_iframe(b, body, body_idx)
+	for i in range(cross_origin_iframes):
+		iframe, _ = b.node(
+			body,
+			body_idx,
+			NodeType.ELEMENT_NODE,
+			'IFRAME',
+			attributes={'src': f'https://ads.example.net/slot/{i}'},
+			bounds=(20 + (i % 2) * 420, 50 + (i % 5) * 60, 400, 300),
+		)
+		iframe['frameId'] = f'OOPIF-{i}'
+
+	for row in range(rows):
+		y = 100 + row * ROW_HEIGHT
+		hidden = b.rng.random() < 0.05
+		row_styles = {'display': 'none'} if hidden else {'background-color': 'rgb(250, 250, 250)'}
+		div, div_idx = b.node(
+			body,
+			body_idx,
+			NodeType.ELEMENT_NODE,
+			'DIV',
+			attributes={'class': f'row row-{row % 7}', 'id': f'row-{row}'},
+			bounds=(0, y, VIEWPORT_WIDTH - 320, ROW_HEIGHT),
+			styles=row_styles,
+		)
+		if section_every and row % section_every == 0:
+			heading, heading_idx = b.node(div, div_idx, NodeType.ELEMENT_NODE, 'H2', bounds=(600, y + 5, 200, 24))
+			section = f'Section {row // section_every}'
+			b.node(heading, heading_idx, NodeType.TEXT_NODE, '#text', section, bounds=(600, y + 5, 200, 24))
+		link, link_idx = b.node(
+			div,
+			div_idx,
+			NodeType.ELEMENT_NODE,
+			'A',
+			attributes={'href': f'/item/{row}', 'class': 'item-link'},
+			bounds=(10, y + 5, 300, 20),
+			styles={'cursor': 'pointer'},
+			clickable=True,
+			ax_role='link',
+			ax_name=f'Item {row}',
+		)
+		b.node(link, link_idx, NodeType.TEXT_NODE, '#text', f'Item {row}', bounds=(10, y + 5, 300, 20))
+		button, button_idx = b.node(
+			div,
+			div_idx,
+			NodeType.ELEMENT_NODE,
+			'BUTTON',
+			attributes={'type': 'button', 'aria-label': f'Add item {row} to cart'},
+			bounds=(320, y + 5, 80, 24),
+			styles={'cursor': 'pointer', 'background-color': 'rgb(0, 120, 255)'},
+			clickable=True,
+			ax_role='button',
+			ax_name='Add',
+		)
+		b.node(button, button_idx, NodeType.TEXT_NODE, '#text', 'Add', bounds=(330, y + 8, 30, 18))
+		b.node(
+			div,
+			div_idx,
+			NodeType.ELEMENT_NODE,
+			'INPUT',
+			attributes={'type': 'text', 'name': f'qty-{row}', 'placeholder': 'Qty'},
+			bounds=(420, y + 5, 60, 24),
+			styles={'background-color': 'rgb(255, 255, 255)'},
+			ax_role='textbox',
+			ax_name='Qty',
+		)
+		span, span_idx = b.node(
+			div,
+			div_idx,
+			NodeType.ELEMENT_NODE,
+			'SPAN',
+			attributes={'class': 'price'},
+			bounds=(500, y + 5, 80, 20),
+		)
+		b.node(span, span_idx, NodeType.TEXT_NODE, '#text', f'${row}.99', bounds=(500, y + 5, 60, 20))
+		b.node(div, div_idx, NodeType.TEXT_NODE, '#text', ' ')
+
+	snapshot = {
+		'documents': [
+			{
+				'documentURL': b.s('https://example.com/feed'),
+				'title': b.s('Synthetic feed'),
+				'baseURL': b.s('https://example.com/feed'),
+				'contentLanguage': -1,
+				'encodingName': b.s('UTF-8'),
+				'publicId': -1,
+				'systemId': -1,
+				'frameId': b.s('MAINFRAME'),
+				'nodes': {**b.snap_nodes, 'isClickable': {'index': b.clickable}},
+				'layout': {**b.layout, 'stackingContexts': {'index': [0]}},
+				'textBoxes': {'layoutIndex': [], 'bounds': [], 'start': [], 'length': []},
+				'scrollOffsetX': 0,
+				'scrollOffsetY': scroll_y,
+				'contentWidth': VIEWPORT_WIDTH,
+				'contentHeight': page_height,
+			}
+		],
+		'strings': b.strings,
+	}
+
+	return TargetAllTrees(
+		snapshot=snapshot,  # type: ignore[arg-type]
+		dom_tree={'root': document},  # type: ignore[typeddict-item]
+		ax_tree={'nodes': b.ax_nodes},  # type: ignore[typeddict-item]
+		device_pixel_ratio=1.0,
+		cdp_timing={},
+	)
@@ -1,199 +1,172 @@
+import re
+
 from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
 
+# Never indexed, decided before any other rule
+NON_INTERACTIVE_TAGS = frozenset({'html', 'body'})
+
+# Frames are only interactive if they're large enough to potentially need scrolling
+FRAME_TAGS = frozenset({'iframe', 'frame'})
+MIN_INTERACTIVE_FRAME_SIZE = 100
+
+# Search-related substrings of class names, ids and data-* values, matched by one compiled pattern
+SEARCH_INDICATORS = (
+	'search',
+	'magnify',
+	'glass',
+	'lookup',
+	'find',
+	'query',
+	'search-icon',
+	'search-btn',
+	'search-button',
+	'searchbox',
+)
+SEARCH_INDICATOR_PATTERN = re.compile('|'.join(re.escape(indicator) for indicator in SEARCH_INDICATORS))
+
+# AX property name -> (verdict, whether the verdict needs a truthy property value), first matching property decides
+AX_PROPERTY_VERDICTS: dict[str, tuple[bool, bool]] = {
+	# aria disabled / hidden
+	'disabled': (False, True),
+	'hidden': (False, True),
+	# Direct interactiveness indicators
+	'focusable': (True, True),
+	'editable': (True, True),
+	'settable': (True, True),
+	# Interactive state properties (presence indicates interactive widget)
+	'checked': (True, False),
+	'expanded': (True, False),
+	'pressed': (True, False),
+	'selected': (True, False),
+	# Form-related interactiveness
+	'required': (True, True),
+	'autocomplete': (True, True),
+	# Elements with keyboard shortcuts are interactive
+	'keyshortcuts': (True, True),
+}
+
+# Note: 'label' is left out - labels with a "for" attribute can shadow the real clickable element (e.g. apartments.com)
+INTERACTIVE_TAGS = frozenset({'button', 'input', 'select', 'textarea', 'a', 'details', 'summary', 'option', 'optgroup'})
+
+# Event handlers or interactive attributes
+INTERACTIVE_ATTRIBUTES = frozenset({'onclick', 'onmousedown', 'onmouseup', 'onkeydown', 'onkeyup', 'tabindex'})
+
+INTERACTIVE_ROLES = frozenset(
+	{
+		'button',
+		'link',
+		'menuitem',
+		'option',
+		'radio',
+		'checkbox',
+		'tab',
+		'textbox',
+		'combobox',
+		'slider',
+		'spinbutton',
+		'search',
+		'searchbox',
+	}
+)
+INTERACTIVE_AX_ROLES = INTERACTIVE_ROLES | {'listbox'}
+
+# Icon-sized elements with any of these attributes are likely interactive icons
+ICON_MIN_SIZE, ICON_MAX_SIZE = 10, 50
+ICON_ATTRIBUTES = frozenset({'class', 'role', 'onclick', 'data-action', 'aria-label'})
+
 
 class ClickableElementDetector:
 	@staticmethod
 	def is_interactive(node: EnhancedDOMTreeNode) -> bool:
-		"""Check if this node is clickable/interactive using enhanced scoring."""
+		"""Check if this node is clickable/interactive using enhanced scoring.
+
+		The rules are checked in order against the precompiled tables above, the first rule that matches decides.
+		"""
 
 		# Skip non-element nodes
 		if node.node_type != NodeType.ELEMENT_NODE:
 			return False
 
-		# # if ax ignored skip
-		# if node.ax_node and node.ax_node.ignored:
-		# 	return False
-
-		# remove html and body nodes
-		if node.tag_name in {'html', 'body'}:
+		tag_name = node.node_name.lower()
+		if tag_name in NON_INTERACTIVE_TAGS:
 			return False
 
-		# IFRAME elements should be interactive if they're large enough to potentially need scrolling
-		# Small iframes (< 100px width or height) are unlikely to have scrollable content
-		if node.tag_name and node.tag_name.upper() == 'IFRAME' or node.tag_name.upper() == 'FRAME':
-			if node.snapshot_node and node.snapshot_node.bounds:
-				width = node.snapshot_node.bounds.width
-				height = node.snapshot_node.bounds.height
-				# Only include iframes larger than 100x100px
-				if width > 100 and height > 100:
-					return True
+		snapshot_node = node.snapshot_node
+		bounds = snapshot_node.bounds if snapshot_node else None
+		if (
+			tag_name in FRAME_TAGS
+			and bounds
+			and bounds.width > MIN_INTERACTIVE_FRAME_SIZE
+			and bounds.height > MIN_INTERACTIVE_FRAME_SIZE
+		):
+			return True
 
-		# RELAXED SIZE CHECK: Allow all elements including size 0 (they might be interactive overlays, etc.)
-		# Note: Size 0 elements can still be interactive (e.g., invisible clickable overlays)
-		# Visibility is determined separately by CSS styles, not just bounding box size
-
-		# SEARCH ELEMENT DETECTION: Check for search-related classes and attributes
-		if node.attributes:
-			search_indicators = {
-				'search',
-				'magnify',
-				'glass',
-				'lookup',
-				'find',
-				'query',
-				'search-icon',
-				'search-btn',
-				'search-button',
-				'searchbox',
-			}
-
-			# Check class names for search indicators
-			class_list = node.attributes.get('class', '').lower().split()
-			if any(indicator in ' '.join(class_list) for indicator in search_indicators):
-				return True
+		# RELAXED SIZE CHECK: size 0 elements can still be interactive (e.g. invisible clickable overlays), visibility
+		# is determined separately by CSS styles, not by the bounding box size
 
-			# Check id for search indicators
-			element_id = node.attributes.get('id', '').lower()
-			if any(indicator in element_id for indicator in search_indicators):
+		# SEARCH ELEMENT DETECTION: search-related class names, id and data attributes
+		attributes = node.attributes
+		if attributes:
+			search = SEARCH_INDICATOR_PATTERN.search
+			if search(attributes.get('class', '').lower()) or search(attributes.get('id', '').lower()):
 				return True
-
-			# Check data attributes for search functionality
-			for attr_name, attr_value in node.attributes.items():
-				if attr_name.startswith('data-') and any(indicator in attr_value.lower() for indicator in search_indicators):
+			for attr_name, attr_value in attributes.items():
+				if attr_name.startswith('data-') and search(attr_value.lower()):
 					return True
 
 		# Enhanced accessibility property checks - direct clear indicators only
-		if node.ax_node and node.ax_node.properties:
-			for prop in node.ax_node.properties:
-				try:
-					# aria disabled
-					if prop.name == 'disabled' and prop.value:
-						return False
-
-					# aria hidden
-					if prop.name == 'hidden' and prop.value:
-						return False
-
-					# Direct interactiveness indicators
-					if prop.name in ['focusable', 'editable', 'settable'] and prop.value:
-						return True
-
-					# Interactive state properties (presence indicates interactive widget)
-					if prop.name in ['checked', 'expanded', 'pressed', 'selected']:
-						# These properties only exist on interactive elements
-						return True
-
-					# Form-related interactiveness
-					if prop.name in ['required', 'autocomplete'] and prop.value:
-						return True
-
-					# Elements with keyboard shortcuts are interactive
-					if prop.name == 'keyshortcuts' and prop.value:
-						return True
-				except (AttributeError, ValueError):
-					# Skip properties we can't process
-					continue
-
-				# ENHANCED TAG CHECK: Include truly interactive elements
-		# Note: 'label' removed - labels are handled by other attribute checks below - other wise labels with "for" attribute can destroy the real clickable element on apartments.com
-		interactive_tags = {
-			'button',
-			'input',
-			'select',
-			'textarea',
-			'a',
-			'details',
-			'summary',
-			'option',
-			'optgroup',
-		}
-		if node.tag_name in interactive_tags:
+		ax_node = node.ax_node
+		if ax_node and ax_node.properties:
+			for prop in ax_node.properties:
+				rule = AX_PROPERTY_VERDICTS.get(prop.name)
+				if rule is not None and (prop.value or not rule[1]):
+					return rule[0]
+
+		# ENHANCED TAG CHECK: Include truly interactive elements
+		if tag_name in INTERACTIVE_TAGS:
 			return True
 
-		# SVG elements need special handling - only interactive if they have explicit handlers
-		# svg_tags = {'svg', 'path', 'circle', 'rect', 'polygon', 'ellipse', 'line', 'polyline', 'g'}
-		# if node.tag_name in svg_tags:
-		# 	# Only consider SVG elements interactive if they have:
-		# 	# 1. Explicit event handlers
-		# 	# 2. Interactive role attributes
-		# 	# 3. Cursor pointer style
-		# 	if node.attributes:
-		# 		# Check for event handlers
-		# 		if any(attr.startswith('on') for attr in node.attributes):
-		# 			return True
-		# 		# Check for interactive roles
-		# 		if node.attributes.get('role') in {'button', 'link', 'menuitem'}:
-		# 			return True
-		# 		# Check for cursor pointer (indicating clickability)
-		# 		if node.attributes.get('style') and 'cursor: pointer' in node.attributes.get('style', ''):
-		# 			return True
-		# 	# Otherwise, SVG elements are decorative
-		# 	return False
-
-		# Tertiary check: elements with interactive attributes
-		if node.attributes:
-			# Check for event handlers or interactive attributes
-			interactive_attributes = {'onclick', 'onmousedown', 'onmouseup', 'onkeydown', 'onkeyup', 'tabindex'}
-			if any(attr in node.attributes for attr in interactive_attributes):
+		# Tertiary check: elements with interactive attributes or ARIA roles
+		if attributes:
+			if not INTERACTIVE_ATTRIBUTES.isdisjoint(attributes):
+				return True
+			if attributes.get('role') in INTERACTIVE_ROLES:
 				return True
-
-			# Check for interactive ARIA roles
-			if 'role' in node.attributes:
-				interactive_roles = {
-					'button',
-					'link',
-					'menuitem',
-					'option',
-					'radio',
-					'checkbox',
-					'tab',
-					'textbox',
-					'combobox',
-					'slider',
-					'spinbutton',
-					'search',
-					'searchbox',
-				}
-				if node.attributes['role'] in interactive_roles:
-					return True
 
 		# Quaternary check: accessibility tree roles
-		if node.ax_node and node.ax_node.role:
-			interactive_ax_roles = {
-				'button',
-				'link',
-				'menuitem',
-				'option',
-				'radio',
-				'checkbox',
-				'tab',
-				'textbox',
-				'combobox',
-				'slider',
-				'spinbutton',
-				'listbox',
-				'search',
-				'searchbox',
-			}
-			if node.ax_node.role in interactive_ax_roles:
-				return True
+		if ax_node and ax_node.role in INTERACTIVE_AX_ROLES:
+			return True
 
 		# ICON AND SMALL ELEMENT CHECK: Elements that might be icons
 		if (
-			node.snapshot_node
-			and node.snapshot_node.bounds
-			and 10 <= node.snapshot_node.bounds.width <= 50  # Icon-sized elements
-			and 10 <= node.snapshot_node.bounds.height <= 50
+			bounds
+			and attributes
+			and ICON_MIN_SIZE <= bounds.width <= ICON_MAX_SIZE
+			and ICON_MIN_SIZE <= bounds.height <= ICON_MAX_SIZE
+			and not ICON_ATTRIBUTES.isdisjoint(attributes)
 		):
-			# Check if this small element has interactive properties
-			if node.attributes:
-				# Small elements with these attributes are likely interactive icons
-				icon_attributes = {'class', 'role', 'onclick', 'data-action', 'aria-label'}
-				if any(attr in node.attributes for attr in icon_attributes):
-					return True
-
-		# Final fallback: cursor style indicates interactivity (for cases Chrome missed)
-		if node.snapshot_node and node.snapshot_node.cursor_style and node.snapshot_node.cursor_style == 'pointer':
 			return True
 
-		return False
+		# Final fallback: cursor style indicates interactivity (for cases Chrome missed)
+		return bool(snapshot_node and snapshot_node.cursor_style == 'pointer')
+
+	@classmethod
+	def classify_tree(cls, root: EnhancedDOMTreeNode) -> dict[int, bool]:
+		"""node_id -> is_interactive for every node of the tree, including shadow roots and iframe documents.
+
+		Classifies in one pass without recursion. On duplicate node ids the first node in document order wins.
+		"""
+		is_interactive = cls.is_interactive
+		verdicts: dict[int, bool] = {}
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			if node.node_id not in verdicts:
+				verdicts[node.node_id] = is_interactive(node)
+			if node.content_document:
+				stack.append(node.content_document)
+			if node.shadow_roots:
+				stack.extend(reversed(node.shadow_roots))
+			if node.children_nodes:
+				stack.extend(reversed(node.children_nodes))
+		return verdicts
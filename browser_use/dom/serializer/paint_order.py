@@ -1,5 +1,7 @@
+import math
 from collections import defaultdict
 from dataclasses import dataclass
+from typing import Literal
 
 from browser_use.dom.views import SimplifiedNode
 
@@ -7,6 +9,8 @@ from browser_use.dom.views import SimplifiedNode
 Helper class for maintaining a union of rectangles (used for order of elements calculation)
 """
 
+PaintOrderEngine = Literal['grid', 'rect_union']
+
 
 @dataclass(frozen=True, slots=True)
 class Rect:
@@ -32,6 +36,56 @@ class Rect:
 		return self.x1 <= other.x1 and self.y1 <= other.y1 and self.x2 >= other.x2 and self.y2 >= other.y2
 
 
+def _split_diff(a: Rect, b: Rect) -> list[Rect]:
+	r"""
+	Return list of up to 4 rectangles = a \ b.
+	Assumes a intersects b.
+	"""
+	parts = []
+
+	# Bottom slice
+	if a.y1 < b.y1:
+		parts.append(Rect(a.x1, a.y1, a.x2, b.y1))
+	# Top slice
+	if b.y2 < a.y2:
+		parts.append(Rect(a.x1, b.y2, a.x2, a.y2))
+
+	# Middle (vertical) strip: y overlap is [max(a.y1,b.y1), min(a.y2,b.y2)]
+	y_lo = max(a.y1, b.y1)
+	y_hi = min(a.y2, b.y2)
+
+	# Left slice
+	if a.x1 < b.x1:
+		parts.append(Rect(a.x1, y_lo, b.x1, y_hi))
+	# Right slice
+	if b.x2 < a.x2:
+		parts.append(Rect(b.x2, y_lo, a.x2, y_hi))
+
+	return parts
+
+
+def _is_covered(r: Rect, rects: list[Rect]) -> bool:
+	"""True iff r is fully covered by the union of rects (which may overlap)."""
+	if not rects:
+		return False
+
+	stack = [r]
+	for s in rects:
+		new_stack = []
+		for piece in stack:
+			if s.contains(piece):
+				# piece completely gone
+				continue
+			if piece.intersects(s):
+				new_stack.extend(_split_diff(piece, s))
+			else:
+				new_stack.append(piece)
+		if not new_stack:  # everything eaten – covered
+			return True
+		stack = new_stack
+	return False  # something survived
+
+
 class RectUnionPure:
 	"""
 	Maintains a *disjoint* set of rectangles.
@@ -45,55 +99,14 @@ class RectUnionPure:
 
 	# -----------------------------------------------------------------
 	def _split_diff(self, a: Rect, b: Rect) -> list[Rect]:
-		r"""
-		Return list of up to 4 rectangles = a \ b.
-		Assumes a intersects b.
-		"""
-		parts = []
-
-		# Bottom slice
-		if a.y1 < b.y1:
-			parts.append(Rect(a.x1, a.y1, a.x2, b.y1))
-		# Top slice
-		if b.y2 < a.y2:
-			parts.append(Rect(a.x1, b.y2, a.x2, a.y2))
-
-		# Middle (vertical) strip: y overlap is [max(a.y1,b.y1), min(a.y2,b.y2)]
-		y_lo = max(a.y1, b.y1)
-		y_hi = min(a.y2, b.y2)
-
-		# Left slice
-		if a.x1 < b.x1:
-			parts.append(Rect(a.x1, y_lo, b.x1, y_hi))
-		# Right slice
-		if b.x2 < a.x2:
-			parts.append(Rect(b.x2, y_lo, a.x2, y_hi))
-
-		return parts
+		return _split_diff(a, b)
 
 	# -----------------------------------------------------------------
 	def contains(self, r: Rect) -> bool:
 		"""
 		True iff r is fully covered by the current union.
 		"""
-		if not self._rects:
-			return False
-
-		stack = [r]
-		for s in self._rects:
-			new_stack = []
-			for piece in stack:
-				if s.contains(piece):
-					# piece completely gone
-					continue
-				if piece.intersects(s):
-					new_stack.extend(self._split_diff(piece, s))
-				else:
-					new_stack.append(piece)
-			if not new_stack:  # everything eaten – covered
-				return True
-			stack = new_stack
-		return False  # something survived
+		return _is_covered(r, self._rects)
 
 	# -----------------------------------------------------------------
 	def add(self, r: Rect) -> bool:
@@ -128,13 +141,101 @@ class RectUnionPure:
 		return True
 
 
+class RectUnionGrid:
+	"""
+	Union of rectangles indexed by a uniform grid, with the same `contains` / `add` semantics as `RectUnionPure`.
+
+	Rectangles are stored as inserted (no splitting into disjoint slivers), bucketed into every grid cell they touch.
+	`contains` only subtracts the rectangles that share a cell with the query, largest first, so the cost depends on
+	the local density of the page instead of on the total number of rectangles. Rectangles spanning more than
+	`max_cells_per_rect` cells (page backgrounds, full-width containers) are kept in a small separate list that is
+	checked on every query instead of being copied into thousands of cells.
+
+	Answers only differ from RectUnionPure for zero-area queries (lines and points), where RectUnionPure's answer
+	depends on how it happened to fragment the union into slivers.
+	"""
+
+	__slots__ = ('_cell_size', '_max_cells_per_rect', '_cells', '_large', '_count')
+
+	def __init__(self, cell_size: float = 256.0, max_cells_per_rect: int = 64):
+		self._cell_size = cell_size
+		self._max_cells_per_rect = max_cells_per_rect
+		self._cells: dict[tuple[int, int], list[Rect]] = {}
+		self._large: list[Rect] = []
+		self._count = 0
+
+	def __len__(self) -> int:
+		return self._count
+
+	def _cell_range(self, r: Rect) -> tuple[int, int, int, int]:
+		size = self._cell_size
+		return math.floor(r.x1 / size), math.floor(r.y1 / size), math.floor(r.x2 / size), math.floor(r.y2 / size)
+
+	def _candidates(self, r: Rect) -> list[Rect]:
+		"""Stored rectangles that touch r (closed bounds, so edge-only contact counts like in RectUnionPure)."""
+		cx1, cy1, cx2, cy2 = self._cell_range(r)
+		seen: set[int] = set()
+		candidates: list[Rect] = []
+		cells = self._cells
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(cells):
+			# huge query: walking the occupied cells is cheaper than walking the range
+			buckets = [bucket for (cx, cy), bucket in cells.items() if cx1 <= cx <= cx2 and cy1 <= cy <= cy2]
+		else:
+			buckets = [cells[key] for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1) if (key := (cx, cy)) in cells]
+		for bucket in buckets:
+			for s in bucket:
+				if id(s) not in seen:
+					seen.add(id(s))
+					candidates.append(s)
+		candidates.extend(self._large)
+		candidates = [s for s in candidates if s.x1 <= r.x2 and r.x1 <= s.x2 and s.y1 <= r.y2 and r.y1 <= s.y2]
+		# big rectangles first: they usually swallow the query in one step
+		candidates.sort(key=Rect.area, reverse=True)
+		return candidates
+
+	def contains(self, r: Rect) -> bool:
+		"""
+		True iff r is fully covered by the current union.
+		"""
+		if not self._count:
+			return False
+		return _is_covered(r, self._candidates(r))
+
+	def add(self, r: Rect) -> bool:
+		"""
+		Insert r unless it is already covered.
+		Returns True if the union grew.
+		"""
+		if self.contains(r):
+			return False
+
+		self._count += 1
+		cx1, cy1, cx2, cy2 = self._cell_range(r)
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self._max_cells_per_rect:
+			self._large.append(r)
+			return True
+
+		cells = self._cells
+		for cx in range(cx1, cx2 + 1):
+			for cy in range(cy1, cy2 + 1):
+				bucket = cells.get((cx, cy))
+				if bucket is None:
+					cells[(cx, cy)] = [r]
+				else:
+					bucket.append(r)
+		return True
+
+
 class PaintOrderRemover:
 	"""
 	Calculates which elements should be removed based on the paint order parameter.
+
+	`engine` selects the occlusion structure: 'grid' (RectUnionGrid, default) or 'rect_union' (RectUnionPure).
 	"""
 
-	def __init__(self, root: SimplifiedNode):
+	def __init__(self, root: SimplifiedNode, engine: PaintOrderEngine = 'grid'):
 		self.root = root
+		self.engine = engine
 
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
@@ -158,7 +259,7 @@ class PaintOrderRemover:
 			if node.original_node.snapshot_node and node.original_node.snapshot_node.paint_order is not None:
 				grouped_by_paint_order[node.original_node.snapshot_node.paint_order].append(node)
 
-		rect_union = RectUnionPure()
+		rect_union = RectUnionGrid() if self.engine == 'grid' else RectUnionPure()
 
 		for paint_order, nodes in sorted(grouped_by_paint_order.items(), key=lambda x: -x[0]):
 			rects_to_add = []
@@ -1,13 +1,16 @@
 # @file purpose: Serializes enhanced DOM trees to string format for LLM consumption
 
+from collections.abc import Iterator
+from difflib import SequenceMatcher
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
-from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.serializer.paint_order import PaintOrderEngine, PaintOrderRemover
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	DOMRect,
 	DOMSelectorMap,
 	EnhancedDOMTreeNode,
+	InteractiveElementsDiff,
 	NodeType,
 	PropagatingBounds,
 	SerializedDOMState,
@@ -16,6 +19,21 @@ from browser_use.dom.views import (
 
 DISABLED_ELEMENTS = {'style', 'script', 'head', 'meta', 'link', 'title'}
 
+# Rough characters-per-token ratio used to turn token budgets into character budgets
+APPROX_CHARS_PER_TOKEN = 4
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# Line categories counted in off-screen summaries, in output order, with their (singular, plural) labels
+OFFSCREEN_SUMMARY_LABELS = {
+	'link': ('link', 'links'),
+	'button': ('button', 'buttons'),
+	'input': ('input', 'inputs'),
+	'interactive': ('other interactive element', 'other interactive elements'),
+	'other': ('container', 'containers'),
+	'text': ('text line', 'text lines'),
+}
+
 
 class DOMTreeSerializer:
 	"""Serializes enhanced DOM trees to string format."""
@@ -41,12 +59,14 @@ class DOMTreeSerializer:
 		previous_cached_state: SerializedDOMState | None = None,
 		enable_bbox_filtering: bool = True,
 		containment_threshold: float | None = None,
-		paint_order_filtering: bool = True,
+		paint_order_filtering: bool | PaintOrderEngine = True,
 	):
 		self.root_node = root_node
 		self._interactive_counter = 1
 		self._selector_map: DOMSelectorMap = {}
-		self._previous_cached_selector_map = previous_cached_state.selector_map if previous_cached_state else None
+		self._previous_cached_state = previous_cached_state
+		# backend node id -> index in the previous selector map, resolved once per serialization
+		self._previous_backend_node_ids: dict[int, int] = {}
 		# Add timing tracking
 		self.timing_info: dict[str, float] = {}
 		# Cache for clickable element detection to avoid redundant calls
@@ -66,7 +86,14 @@ class DOMTreeSerializer:
 		self._interactive_counter = 1
 		self._selector_map = {}
 		self._semantic_groups = []
-		self._clickable_cache = {}  # Clear cache for new serialization
+		self._previous_backend_node_ids = (
+			self._previous_cached_state.backend_node_id_to_index if self._previous_cached_state else {}
+		)
+
+		# Classify every node in one pass, the three passes below only look the verdicts up
+		start_clickable = time.time()
+		self._clickable_cache = ClickableElementDetector.classify_tree(self.root_node)
+		self.timing_info['clickable_detection_time'] = time.time() - start_clickable
 
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
@@ -77,7 +104,8 @@ class DOMTreeSerializer:
 		# Step 2: Remove elements based on paint order
 		start_step3 = time.time()
 		if self.paint_order_filtering and simplified_tree:
-			PaintOrderRemover(simplified_tree).calculate_paint_order()
+			engine: PaintOrderEngine = 'rect_union' if self.paint_order_filtering == 'rect_union' else 'grid'
+			PaintOrderRemover(simplified_tree, engine=engine).calculate_paint_order()
 		end_step3 = time.time()
 		self.timing_info['calculate_paint_order'] = end_step3 - start_step3
 
@@ -105,24 +133,18 @@ class DOMTreeSerializer:
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		elements_diff = self._diff_interactive_elements() if self._previous_cached_state else None
+		return (
+			SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map, elements_diff=elements_diff),
+			self.timing_info,
+		)
 
 	def _is_interactive_cached(self, node: EnhancedDOMTreeNode) -> bool:
-		"""Cached version of clickable element detection to avoid redundant calls."""
-		if node.node_id not in self._clickable_cache:
-			import time
-
-			start_time = time.time()
-			result = ClickableElementDetector.is_interactive(node)
-			end_time = time.time()
-
-			if 'clickable_detection_time' not in self.timing_info:
-				self.timing_info['clickable_detection_time'] = 0
-			self.timing_info['clickable_detection_time'] += end_time - start_time
-
-			self._clickable_cache[node.node_id] = result
-
-		return self._clickable_cache[node.node_id]
+		"""Clickable element detection, precomputed for the whole tree by `ClickableElementDetector.classify_tree`."""
+		result = self._clickable_cache.get(node.node_id)
+		if result is None:
+			result = self._clickable_cache[node.node_id] = ClickableElementDetector.is_interactive(node)
+		return result
 
 	def _create_simplified_tree(self, node: EnhancedDOMTreeNode, depth: int = 0) -> SimplifiedNode | None:
 		"""Step 1: Create a simplified tree with enhanced element detection."""
@@ -249,15 +271,30 @@ class DOMTreeSerializer:
 				self._interactive_counter += 1
 
 				# Check if node is new
-				if self._previous_cached_selector_map:
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
-					if node.original_node.backend_node_id not in previous_backend_node_ids:
-						node.is_new = True
+				if self._previous_backend_node_ids and node.original_node.backend_node_id not in self._previous_backend_node_ids:
+					node.is_new = True
 
 		# Process children
 		for child in node.children:
 			self._assign_interactive_indices_and_mark_new_nodes(child)
 
+	def _diff_interactive_elements(self) -> InteractiveElementsDiff:
+		"""Compare the new selector map with the previous one by backend node id."""
+		diff = InteractiveElementsDiff()
+		previous_ids = self._previous_backend_node_ids
+		current_ids: set[int] = set()
+
+		for index, node in self._selector_map.items():
+			current_ids.add(node.backend_node_id)
+			previous_index = previous_ids.get(node.backend_node_id)
+			if previous_index is None:
+				diff.added.append(index)
+			elif previous_index != index:
+				diff.moved[previous_index] = index
+
+		diff.removed = [index for backend_node_id, index in previous_ids.items() if backend_node_id not in current_ids]
+		return diff
+
 	def _apply_bounding_box_filtering(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
 		"""Filter children contained within propagating parent bounds."""
 		if not node:
@@ -412,97 +449,394 @@ class DOMTreeSerializer:
 		return False
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> str:
+		"""Serialize the optimized tree to string format.
+
+		With `viewport_margin` only lines near the viewport are serialized, see `iter_serialized_lines`.
+		"""
 		if not node:
 			return ''
+		return '\n'.join(
+			DOMTreeSerializer.iter_serialized_lines(node, include_attributes, depth, viewport_margin, viewport_height)
+		)
 
-		# Skip rendering excluded nodes, but process their children
-		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			formatted_text = []
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-				if child_text:
-					formatted_text.append(child_text)
-			return '\n'.join(formatted_text)
-
-		formatted_text = []
-		depth_str = depth * '\t'
-		next_depth = depth
-
-		if node.original_node.node_type == NodeType.ELEMENT_NODE:
-			# Skip displaying nodes marked as should_display=False
-			if not node.should_display:
-				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-					if child_text:
-						formatted_text.append(child_text)
-				return '\n'.join(formatted_text)
-
-			# Add element with interactive_index if clickable, scrollable, or iframe
-			is_any_scrollable = node.original_node.is_actually_scrollable or node.original_node.is_scrollable
-			should_show_scroll = node.original_node.should_show_scroll_info
-			if (
-				node.interactive_index is not None
-				or is_any_scrollable
-				or node.original_node.tag_name.upper() == 'IFRAME'
-				or node.original_node.tag_name.upper() == 'FRAME'
-			):
-				next_depth += 1
-
-				# Build attributes string
-				attributes_html_str = DOMTreeSerializer._build_attributes_string(node.original_node, include_attributes, '')
-
-				# Build the line
-				if should_show_scroll and node.interactive_index is None:
-					# Scrollable container but not clickable
-					line = f'{depth_str}|SCROLL|<{node.original_node.tag_name}'
-				elif node.interactive_index is not None:
-					# Clickable (and possibly scrollable)
-					new_prefix = '*' if node.is_new else ''
-					scroll_prefix = '|SCROLL+' if should_show_scroll else '['
-					line = f'{depth_str}{new_prefix}{scroll_prefix}{node.interactive_index}]<{node.original_node.tag_name}'
-				elif node.original_node.tag_name.upper() == 'IFRAME':
-					# Iframe element (not interactive)
-					line = f'{depth_str}|IFRAME|<{node.original_node.tag_name}'
-				elif node.original_node.tag_name.upper() == 'FRAME':
-					# Frame element (not interactive)
-					line = f'{depth_str}|FRAME|<{node.original_node.tag_name}'
+	@staticmethod
+	def iter_serialized_lines(
+		node: SimplifiedNode,
+		include_attributes: list[str],
+		depth: int = 0,
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> Iterator[str]:
+		"""Lazily yield the lines of `serialize_tree`, in document order.
+
+		With `viewport_margin` (in CSS pixels), lines above or below the viewport extended by the margin are replaced
+		by one summary line per section of the page they belong to (heading, counts of links, buttons, inputs, ...).
+		Pass the `PageInfo.viewport_height` as `viewport_height`, the snapshot only has the document's client rect.
+		"""
+		for _, _, line in DOMTreeSerializer._iter_lines(node, include_attributes, depth, viewport_margin, viewport_height):
+			yield line
+
+	@staticmethod
+	def _iter_lines(
+		node: SimplifiedNode,
+		include_attributes: list[str],
+		depth: int = 0,
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> Iterator[tuple[SimplifiedNode | None, int, str]]:
+		"""Yield (node, depth, line) for every serialized line, node is None for off-screen summary lines."""
+		if viewport_margin is not None and viewport_height is None:
+			viewport = DOMTreeSerializer._find_viewport(node)
+			viewport_height = viewport.height if viewport else None
+		if viewport_margin is None or viewport_height is None:
+			for line_node, line_depth in DOMTreeSerializer._iter_line_nodes(node, depth):
+				yield line_node, line_depth, DOMTreeSerializer._format_line(line_node, include_attributes, line_depth)
+			return
+
+		# absolute_position is relative to the top-level viewport
+		window_top = -viewport_margin
+		window_bottom = viewport_height + viewport_margin
+
+		# Consecutive off-screen lines on the same side of the window are summarized together, a run that starts
+		# in the middle of a section is labeled with the heading of that section
+		run: list[tuple[SimplifiedNode, int, str | None]] = []
+		run_side = 0
+		run_heading: str | None = None
+		section_heading: str | None = None
+		side = 0
+		for line_node, line_depth in DOMTreeSerializer._iter_line_nodes(node, depth):
+			position = line_node.original_node.absolute_position
+			# Lines without layout (e.g. inside display: contents) go with the line before them
+			if position is not None:
+				if position.y + position.height < window_top:
+					side = -1
+				elif position.y > window_bottom:
+					side = 1
 				else:
-					line = f'{depth_str}<{node.original_node.tag_name}'
+					side = 0
+
+			if run and side != run_side:
+				for summary_depth, summary in DOMTreeSerializer._summarize_offscreen(run, run_side > 0, run_heading):
+					yield None, summary_depth, summary
+				run = []
+
+			heading = DOMTreeSerializer._heading_text(line_node)
+			if side:
+				if not run:
+					run_heading = section_heading
+				run.append((line_node, line_depth, heading))
+				run_side = side
+			else:
+				yield line_node, line_depth, DOMTreeSerializer._format_line(line_node, include_attributes, line_depth)
+			if heading is not None:
+				section_heading = heading
+
+		if run:
+			for summary_depth, summary in DOMTreeSerializer._summarize_offscreen(run, run_side > 0, run_heading):
+				yield None, summary_depth, summary
 
-				if attributes_html_str:
-					line += f' {attributes_html_str}'
+	@staticmethod
+	def _summarize_offscreen(
+		run: list[tuple[SimplifiedNode, int, str | None]], below: bool, heading: str | None
+	) -> Iterator[tuple[int, str]]:
+		"""One summary line per section of an off-screen run, a section starts at every heading."""
+		depth = run[0][1]
+		depth_str = depth * '\t'
+		where = 'below' if below else 'above'
+		sections: list[tuple[str | None, dict[str, int]]] = []
+		for line_node, _, line_heading in run:
+			if line_heading is not None or not sections:
+				sections.append((line_heading or heading, dict.fromkeys(OFFSCREEN_SUMMARY_LABELS, 0)))
+			sections[-1][1][DOMTreeSerializer._summary_category(line_node)] += 1
+
+		for heading, counts in sections:
+			parts = [
+				f'{count} {singular if count == 1 else plural}'
+				for (singular, plural), count in zip(OFFSCREEN_SUMMARY_LABELS.values(), counts.values())
+				if count
+			]
+			section = f' "{heading}"' if heading else ''
+			yield depth, f'{depth_str}... off-screen {where}{section}: {", ".join(parts)} ...'
 
-				line += ' />'
+	@staticmethod
+	def _heading_text(node: SimplifiedNode) -> str | None:
+		"""The text of a text line inside an h1-h6 (or role=heading) element, capped for summaries."""
+		original = node.original_node
+		if original.node_type != NodeType.TEXT_NODE:
+			return None
+		parent = original.parent_node
+		for _ in range(3):
+			if parent is None:
+				return None
+			if parent.tag_name in HEADING_TAGS or (parent.attributes and parent.attributes.get('role') == 'heading'):
+				return cap_text_length(original.node_value.strip(), 60).replace('"', "'")
+			parent = parent.parent_node
+		return None
 
-				# Add scroll information only when we should show it
-				if should_show_scroll:
-					scroll_info_text = node.original_node.get_scroll_info_text()
-					if scroll_info_text:
-						line += f' ({scroll_info_text})'
+	@staticmethod
+	def _summary_category(node: SimplifiedNode) -> str:
+		"""Key of `OFFSCREEN_SUMMARY_LABELS` a line counts towards."""
+		original = node.original_node
+		if original.node_type == NodeType.TEXT_NODE:
+			return 'text'
+		if node.interactive_index is None:
+			return 'other'
+		tag = original.tag_name
+		role = original.attributes.get('role') if original.attributes else None
+		if tag == 'a' or role == 'link':
+			return 'link'
+		if tag == 'button' or role == 'button':
+			return 'button'
+		if tag in ('input', 'textarea', 'select'):
+			return 'input'
+		return 'interactive'
 
-				formatted_text.append(line)
+	@staticmethod
+	def serialize_tree_budgeted(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+		prioritize_viewport: bool = False,
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> tuple[str, bool]:
+		"""
+		Serialize the tree until a character or (estimated) token budget is used up.
 
-		elif node.original_node.node_type == NodeType.TEXT_NODE:
-			# Include visible text
-			is_visible = node.original_node.snapshot_node and node.original_node.is_visible
-			if (
-				is_visible
-				and node.original_node.node_value
-				and node.original_node.node_value.strip()
-				and len(node.original_node.node_value.strip()) > 1
-			):
-				clean_text = node.original_node.node_value.strip()
-				formatted_text.append(f'{depth_str}{clean_text}')
+		Lines are never cut in half: serialization stops at the last line that fits. With `prioritize_viewport`
+		the budget is spent on interactive elements inside the viewport first, then on the rest of the in-viewport
+		content, then on everything else; the selected lines are still emitted in document order.
+		With `viewport_margin` the budget applies to the windowed lines of `iter_serialized_lines` in document order,
+		they already are the in-viewport content, so `prioritize_viewport` has no effect.
 
-		# Process children
-		for child in node.children:
-			child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-			if child_text:
-				formatted_text.append(child_text)
+		Returns the text and whether anything was left out.
+		"""
+		if not node:
+			return '', False
+
+		budget = DOMTreeSerializer._char_budget(max_chars, max_tokens)
+		if budget is None:
+			return DOMTreeSerializer.serialize_tree(node, include_attributes, 0, viewport_margin, viewport_height), False
+
+		if not prioritize_viewport or viewport_margin is not None:
+			lines: list[str] = []
+			used = 0
+			for line in DOMTreeSerializer.iter_serialized_lines(node, include_attributes, 0, viewport_margin, viewport_height):
+				used += len(line) + (1 if lines else 0)
+				if used > budget:
+					return '\n'.join(lines), True
+				lines.append(line)
+			return '\n'.join(lines), False
+
+		# Walking the tree is cheap compared to formatting lines, so bucket the line nodes by priority first
+		# and only format as many of them as fit into the budget
+		viewport = DOMTreeSerializer._find_viewport(node)
+		tiers: tuple[list[tuple[int, SimplifiedNode, int]], ...] = ([], [], [])
+		for position, (line_node, line_depth) in enumerate(DOMTreeSerializer._iter_line_nodes(node)):
+			tiers[DOMTreeSerializer._line_priority(line_node, viewport)].append((position, line_node, line_depth))
+
+		selected: dict[int, str] = {}
+		used = 0
+		truncated = False
+		for tier in tiers:
+			for position, line_node, line_depth in tier:
+				line = DOMTreeSerializer._format_line(line_node, include_attributes, line_depth)
+				cost = len(line) + (1 if selected else 0)
+				if used + cost > budget:
+					truncated = True
+					break
+				used += cost
+				selected[position] = line
+			if truncated:
+				break
+
+		return '\n'.join(selected[position] for position in sorted(selected)), truncated
+
+	@staticmethod
+	def serialize_diff(
+		previous: SimplifiedNode | None,
+		current: SimplifiedNode | None,
+		include_attributes: list[str],
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> str:
+		"""Serialize only the lines that differ between two trees, runs of unchanged lines are collapsed.
+
+		Lines are matched in document order by their text and, for element lines, the element's backend node id.
+		An element that kept its line but got a different index counts as removed and added again, so every index
+		in the output is the current one. Lines prefixed `+ ` are new, `- ` are gone; new-element markers are left
+		out, they are relative to the previous step, not to `previous`. With `viewport_margin` both trees are compared
+		by their windowed lines, off-screen summaries included.
+		"""
+		previous_lines = DOMTreeSerializer._diff_lines(previous, include_attributes, viewport_margin, viewport_height)
+		current_lines = DOMTreeSerializer._diff_lines(current, include_attributes, viewport_margin, viewport_height)
+		matcher = SequenceMatcher(None, previous_lines, current_lines, autojunk=False)
+
+		output: list[str] = []
+		for operation, previous_start, previous_end, current_start, current_end in matcher.get_opcodes():
+			if operation == 'equal':
+				count = previous_end - previous_start
+				output.append(f'... {count} unchanged line{"s" if count != 1 else ""} ...')
+				continue
+			output.extend(f'- {line}' for _, line in previous_lines[previous_start:previous_end])
+			output.extend(f'+ {line}' for _, line in current_lines[current_start:current_end])
+		return '\n'.join(output)
+
+	@staticmethod
+	def _diff_lines(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		viewport_margin: float | None = None,
+		viewport_height: float | None = None,
+	) -> list[tuple[int, str]]:
+		"""(backend node id of element lines or 0, line without new-element marker) for every line of the tree"""
+		if not node:
+			return []
+		lines = []
+		line_nodes = DOMTreeSerializer._iter_lines(node, include_attributes, 0, viewport_margin, viewport_height)
+		for line_node, depth, line in line_nodes:
+			if line_node is None or line_node.original_node.node_type == NodeType.TEXT_NODE:
+				lines.append((0, line))
+				continue
+			if line_node.is_new and line_node.interactive_index is not None:
+				line = line[:depth] + line[depth + 1 :]
+			lines.append((line_node.original_node.backend_node_id, line))
+		return lines
+
+	@staticmethod
+	def _char_budget(max_chars: int | None, max_tokens: int | None) -> int | None:
+		"""Combine a character and a token budget into a single character budget (None means unlimited)."""
+		budgets = [] if max_chars is None else [max_chars]
+		if max_tokens is not None:
+			budgets.append(max_tokens * APPROX_CHARS_PER_TOKEN)
+		return max(min(budgets), 0) if budgets else None
+
+	@staticmethod
+	def _iter_line_nodes(node: SimplifiedNode, depth: int = 0) -> Iterator[tuple[SimplifiedNode, int]]:
+		"""Yield (node, depth) for every node that renders a line, in document order, without recursion."""
+		stack: list[tuple[SimplifiedNode, int]] = [(node, depth)]
+		while stack:
+			current, current_depth = stack.pop()
+			next_depth = current_depth
+
+			# Skip rendering excluded nodes and nodes marked as should_display=False, but process their children
+			if not current.excluded_by_parent:
+				original = current.original_node
+				if original.node_type == NodeType.ELEMENT_NODE:
+					if current.should_display and DOMTreeSerializer._renders_element_line(current):
+						yield current, current_depth
+						next_depth += 1
+				elif original.node_type == NodeType.TEXT_NODE:
+					# Include visible text
+					if original.snapshot_node and original.is_visible and original.node_value:
+						clean_text = original.node_value.strip()
+						if len(clean_text) > 1:
+							yield current, current_depth
+
+			if current.children:
+				stack.extend([(child, next_depth) for child in reversed(current.children)])
+
+	@staticmethod
+	def _renders_element_line(node: SimplifiedNode) -> bool:
+		"""Elements get their own line if they are clickable, scrollable, or an iframe."""
+		original = node.original_node
+		return (
+			node.interactive_index is not None
+			or original.is_actually_scrollable
+			or original.is_scrollable
+			or original.tag_name.upper() == 'IFRAME'
+			or original.tag_name.upper() == 'FRAME'
+		)
+
+	@staticmethod
+	def _format_line(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
+		"""Format a single line for a node yielded by `_iter_line_nodes`."""
+		depth_str = depth * '\t'
 
-		return '\n'.join(formatted_text)
+		if node.original_node.node_type == NodeType.TEXT_NODE:
+			return f'{depth_str}{node.original_node.node_value.strip()}'
+
+		should_show_scroll = node.original_node.should_show_scroll_info
+
+		# Build attributes string
+		attributes_html_str = DOMTreeSerializer._build_attributes_string(node.original_node, include_attributes, '')
+
+		# Build the line
+		if should_show_scroll and node.interactive_index is None:
+			# Scrollable container but not clickable
+			line = f'{depth_str}|SCROLL|<{node.original_node.tag_name}'
+		elif node.interactive_index is not None:
+			# Clickable (and possibly scrollable)
+			new_prefix = '*' if node.is_new else ''
+			scroll_prefix = '|SCROLL+' if should_show_scroll else '['
+			line = f'{depth_str}{new_prefix}{scroll_prefix}{node.interactive_index}]<{node.original_node.tag_name}'
+		elif node.original_node.tag_name.upper() == 'IFRAME':
+			# Iframe element (not interactive)
+			line = f'{depth_str}|IFRAME|<{node.original_node.tag_name}'
+		elif node.original_node.tag_name.upper() == 'FRAME':
+			# Frame element (not interactive)
+			line = f'{depth_str}|FRAME|<{node.original_node.tag_name}'
+		else:
+			line = f'{depth_str}<{node.original_node.tag_name}'
+
+		if attributes_html_str:
+			line += f' {attributes_html_str}'
+
+		line += ' />'
+
+		# Add scroll information only when we should show it
+		if should_show_scroll:
+			scroll_info_text = node.original_node.get_scroll_info_text()
+			if scroll_info_text:
+				line += f' ({scroll_info_text})'
+
+		return line
+
+	@staticmethod
+	def _find_viewport(node: SimplifiedNode) -> DOMRect | None:
+		"""Find the top-level viewport from the first HTML element's client rect.
+
+		The rect is in the coordinates of `absolute_position`, which already has the frame scroll offsets subtracted,
+		so it starts at (0, 0). The client rect of the document element can be as tall as the document itself.
+		"""
+		stack = [node.original_node]
+		while stack:
+			current = stack.pop()
+			if current.node_type == NodeType.ELEMENT_NODE and current.node_name.upper() == 'HTML':
+				snapshot = current.snapshot_node
+				if snapshot and snapshot.scrollRects and snapshot.clientRects:
+					return DOMRect(x=0.0, y=0.0, width=snapshot.clientRects.width, height=snapshot.clientRects.height)
+				return None
+			if current.node_type == NodeType.DOCUMENT_NODE or current.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+				stack.extend(reversed(current.children_nodes or []))
+		return None
+
+	@staticmethod
+	def _line_priority(node: SimplifiedNode, viewport: DOMRect | None) -> int:
+		"""0 = interactive and in the viewport, 1 = other in-viewport content, 2 = everything else."""
+		original = node.original_node
+		if viewport is None:
+			in_viewport = bool(original.is_visible)
+		else:
+			position = original.absolute_position
+			in_viewport = (
+				position is not None
+				and position.x < viewport.x + viewport.width
+				and position.x + position.width > viewport.x
+				and position.y < viewport.y + viewport.height
+				and position.y + position.height > viewport.y
+			)
+		if not in_viewport:
+			return 2
+		return 0 if node.interactive_index is not None else 1
 
 	@staticmethod
 	def _build_attributes_string(node: EnhancedDOMTreeNode, include_attributes: list[str], text: str) -> str:
@@ -1,34 +1,122 @@
 import asyncio
+import hashlib
 import logging
+import pickle
 import time
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from sys import intern
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
+from cdp_use.cdp.dom.commands import GetDocumentReturns
 from cdp_use.cdp.dom.types import Node
-from cdp_use.cdp.target import TargetID
+from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
+from cdp_use.cdp.target import TargetID, TargetInfo
 
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
 	build_snapshot_lookup,
 )
+from browser_use.dom.offload import prune_for_transfer
+from browser_use.dom.serializer.paint_order import PaintOrderEngine
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.views import (
+	AXTreeMode,
+	CrossOriginIframeContext,
 	CurrentPageTargets,
+	DOMFingerprintStats,
 	DOMRect,
 	EnhancedAXNode,
 	EnhancedAXProperty,
 	EnhancedDOMTreeNode,
 	NodeType,
+	PendingCrossOriginIframe,
 	SerializedDOMState,
 	TargetAllTrees,
+	branch_element_hash,
+	fingerprint,
 )
 
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
+	from browser_use.dom.capture import DOMCaptureRecorder
+	from browser_use.dom.live_mirror import LiveDOMMirror
 
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
+# Stack actions / attachment slots for the iterative tree builder
+_ENTER, _EXIT = 0, 1
+_SLOT_ROOT, _SLOT_CHILD, _SLOT_SHADOW_ROOT, _SLOT_CONTENT_DOCUMENT = 0, 1, 2, 3
+
+# Frame program operations for the batched visibility pass
+_FRAME_OFFSET, _FRAME_VIEWPORT = 0, 1
+
+# Lazy AX mode: elements whose accessibility data can change what ClickableElementDetector / the serializer decide
+AX_CANDIDATE_TAGS = {'button', 'input', 'select', 'textarea', 'a', 'details', 'summary', 'option', 'optgroup', 'label'}
+AX_CANDIDATE_ATTRIBUTES = {'role', 'tabindex', 'contenteditable', 'onclick', 'aria-label'}
+AX_PARTIAL_TREE_BATCH_SIZE = 100
+
+
+def _freeze(value):
+	"""Hashable copy of a CDP payload (dicts and lists -> tuples), flat lists of scalars are copied in one go"""
+	if isinstance(value, dict):
+		return tuple((key, _freeze(item)) for key, item in value.items())
+	if isinstance(value, list):
+		if value and isinstance(value[0], (dict, list)):
+			return tuple(_freeze(item) for item in value)
+		return tuple(value)
+	return value
+
+
+def _build_and_serialize(
+	trees: TargetAllTrees,
+	target_id: TargetID,
+	session_id: str | None,
+	previous_backend_node_ids: dict[int, int] | None,
+	paint_order_filtering: bool | PaintOrderEngine,
+) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]]:
+	"""Worker process side of `DomService(process_pool=...)`: build, serialize and prune the tree of one page."""
+	# There is no browser session in the worker, building only reads the session id of the focused target
+	browser_session = SimpleNamespace(agent_focus=SimpleNamespace(session_id=session_id) if session_id else None)
+	dom_service = DomService(
+		browser_session,  # type: ignore[arg-type]
+		logger=logging.getLogger(__name__),
+		paint_order_filtering=paint_order_filtering,
+	)
+
+	start = time.time()
+	enhanced_dom_tree, _ = dom_service.build_enhanced_tree(trees, target_id)
+	dom_service.compute_fingerprints(enhanced_dom_tree)
+	timing = {'build_enhanced_tree': time.time() - start}
+
+	# The serializer only reads which elements the previous state had
+	previous_cached_state = None
+	if previous_backend_node_ids is not None:
+		previous_cached_state = SerializedDOMState(_root=None, selector_map={})
+		previous_cached_state._backend_node_id_to_index = previous_backend_node_ids
+
+	start = time.time()
+	serialized_dom_state, serializer_timing = DOMTreeSerializer(
+		enhanced_dom_tree, previous_cached_state, paint_order_filtering=paint_order_filtering
+	).serialize_accessible_elements()
+	timing.update(serializer_timing)
+	timing['serialize_dom_tree_total'] = time.time() - start
+
+	# Done before pruning, which strips the siblings of the elements' ancestors
+	start = time.time()
+	dom_service.compute_xpaths(serialized_dom_state.selector_map.values())
+	timing['compute_xpaths'] = time.time() - start
+
+	start = time.time()
+	prune_for_transfer(serialized_dom_state, enhanced_dom_tree)
+	timing['prune_for_transfer'] = time.time() - start
+	return serialized_dom_state, enhanced_dom_tree, timing
+
 
 class DomService:
 	"""
@@ -46,9 +134,16 @@ class DomService:
 		browser_session: 'BrowserSession',
 		logger: logging.Logger | None = None,
 		cross_origin_iframes: bool = False,
-		paint_order_filtering: bool = True,
+		paint_order_filtering: bool | PaintOrderEngine = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		iterative_tree_builder: bool = True,
+		live_dom_mirror: 'LiveDOMMirror | None' = None,
+		ax_tree_mode: AXTreeMode = 'full',
+		max_concurrent_iframe_fetches: int = 4,
+		reuse_unchanged_dom: bool = False,
+		process_pool: Executor | None = None,
+		capture_recorder: 'DOMCaptureRecorder | None' = None,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -56,6 +151,20 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.iterative_tree_builder = iterative_tree_builder
+		# Only the iterative builder reads the raw tree without yielding to the event loop, so only it may use the
+		# mirror (mutation events patch the mirrored nodes in place between awaits)
+		self.live_dom_mirror = live_dom_mirror if iterative_tree_builder else None
+		self.ax_tree_mode = ax_tree_mode
+		self.max_concurrent_iframe_fetches = max_concurrent_iframe_fetches
+		# Cross-origin iframe documents come from other targets, which the page fingerprint does not cover
+		self.reuse_unchanged_dom = reuse_unchanged_dom and not cross_origin_iframes
+		self.fingerprint_stats = DOMFingerprintStats()
+		self._last_dom_fingerprint: tuple[TargetID, int] | None = None
+		self._last_serialized: tuple[SerializedDOMState, EnhancedDOMTreeNode] | None = None
+		# Cross-origin iframe documents are fetched while building, which needs the browser session
+		self.process_pool = process_pool if iterative_tree_builder and not cross_origin_iframes else None
+		self.capture_recorder = capture_recorder
 
 	async def __aenter__(self):
 		return self
@@ -115,7 +224,7 @@ class DomService:
 					# test whether property name can go into the enum (sometimes Chrome returns some random properties)
 					properties.append(
 						EnhancedAXProperty(
-							name=property['name'],
+							name=intern(property['name']),
 							value=property.get('value', {}).get('value', None),
 							# related_nodes=[],  # TODO: add related nodes
 						)
@@ -123,10 +232,11 @@ class DomService:
 				except ValueError:
 					pass
 
+		role = ax_node.get('role', {}).get('value', None)
 		enhanced_ax_node = EnhancedAXNode(
 			ax_node_id=ax_node['nodeId'],
 			ignored=ax_node['ignored'],
-			role=ax_node.get('role', {}).get('value', None),
+			role=intern(role) if role else role,
 			name=ax_node.get('name', {}).get('value', None),
 			description=ax_node.get('description', {}).get('value', None),
 			properties=properties,
@@ -134,29 +244,10 @@ class DomService:
 		return enhanced_ax_node
 
 	async def _get_viewport_ratio(self, target_id: TargetID) -> float:
-		"""Get viewport dimensions, device pixel ratio, and scroll position using CDP."""
-		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=True)
-
+		"""Get the device pixel ratio from the page probe shared with the rest of the browser state request."""
 		try:
-			# Get the layout metrics which includes the visual viewport
-			metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
-
-			visual_viewport = metrics.get('visualViewport', {})
-
-			# IMPORTANT: Use CSS viewport instead of device pixel viewport
-			# This fixes the coordinate mismatch on high-DPI displays
-			css_visual_viewport = metrics.get('cssVisualViewport', {})
-			css_layout_viewport = metrics.get('cssLayoutViewport', {})
-
-			# Use CSS pixels (what JavaScript sees) instead of device pixels
-			width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1920.0))
-
-			# Calculate device pixel ratio
-			device_width = visual_viewport.get('clientWidth', width)
-			css_width = css_visual_viewport.get('clientWidth', width)
-			device_pixel_ratio = device_width / css_width if css_width > 0 else 1.0
-
-			return float(device_pixel_ratio)
+			probe = await self.browser_session.get_page_probe(target_id)
+			return probe.device_pixel_ratio
 		except Exception as e:
 			self.logger.debug(f'Viewport size detection failed: {e}')
 			# Fallback to default viewport size
@@ -286,56 +377,72 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
-	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
+	@staticmethod
+	def _get_ax_candidate_backend_node_ids(dom_tree: GetDocumentReturns, snapshot: CaptureSnapshotReturns) -> list[int]:
+		"""Backend node ids of the elements that need accessibility data in lazy AX mode.
+
+		These are elements with an interactive tag, an interactivity-related or aria-* attribute, or that the snapshot
+		marks as clickable. Everything else is only ever decided on DOM / snapshot data by `ClickableElementDetector`.
+		"""
+		candidates: set[int] = set()
+		for document in snapshot.get('documents', []):
+			nodes = document['nodes']
+			backend_node_ids = nodes.get('backendNodeId', [])
+			for row in nodes.get('isClickable', {}).get('index', []):
+				if row < len(backend_node_ids):
+					candidates.add(backend_node_ids[row])
+
+		stack: list[Node] = [dom_tree['root']]
+		while stack:
+			node = stack.pop()
+			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['backendNodeId'] not in candidates:
+				attribute_names = node.get('attributes', [])[::2]
+				if node['nodeName'].lower() in AX_CANDIDATE_TAGS or any(
+					name in AX_CANDIDATE_ATTRIBUTES or name.startswith('aria-') for name in attribute_names
+				):
+					candidates.add(node['backendNodeId'])
+			stack.extend(node.get('children', ()))
+			stack.extend(node.get('shadowRoots', ()))
+			if 'contentDocument' in node:
+				stack.append(node['contentDocument'])
+		return list(candidates)
+
+	async def _get_partial_ax_tree(self, target_id: TargetID, backend_node_ids: list[int]) -> GetFullAXTreeReturns:
+		"""Fetch the AX nodes of just the given elements with batched `Accessibility.getPartialAXTree` calls."""
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
-		# Wait for the page to be ready first
-		try:
-			ready_state = await cdp_session.cdp_client.send.Runtime.evaluate(
-				params={'expression': 'document.readyState'}, session_id=cdp_session.session_id
+		merged_nodes: list[AXNode] = []
+		for start in range(0, len(backend_node_ids), AX_PARTIAL_TREE_BATCH_SIZE):
+			batch = backend_node_ids[start : start + AX_PARTIAL_TREE_BATCH_SIZE]
+			results = await asyncio.gather(
+				*(
+					cdp_session.cdp_client.send.Accessibility.getPartialAXTree(
+						params={'backendNodeId': backend_node_id, 'fetchRelatives': False}, session_id=cdp_session.session_id
+					)
+					for backend_node_id in batch
+				),
+				return_exceptions=True,
 			)
-		except Exception as e:
-			pass  # Page might not be ready yet
-		# DEBUG: Log before capturing snapshot
-		self.logger.debug(f'🔍 DEBUG: Capturing DOM snapshot for target {target_id}')
+			for result in results:
+				# nodes can disappear between getDocument and this call, they just get no AX data
+				if not isinstance(result, BaseException):
+					merged_nodes.extend(result['nodes'])
+
+		return {'nodes': merged_nodes}
 
-		# Get actual scroll positions for all iframes before capturing snapshot
-		iframe_scroll_positions = {}
+	async def _get_all_trees(self, target_id: TargetID, use_live_dom_mirror: bool = False) -> TargetAllTrees:
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+
+		# One probe for readyState, iframe scroll positions and layout metrics, the device pixel ratio below reuses it
 		try:
-			scroll_result = await cdp_session.cdp_client.send.Runtime.evaluate(
-				params={
-					'expression': """
-					(() => {
-						const scrollData = {};
-						const iframes = document.querySelectorAll('iframe');
-						iframes.forEach((iframe, index) => {
-							try {
-								const doc = iframe.contentDocument || iframe.contentWindow.document;
-								if (doc) {
-									scrollData[index] = {
-										scrollTop: doc.documentElement.scrollTop || doc.body.scrollTop || 0,
-										scrollLeft: doc.documentElement.scrollLeft || doc.body.scrollLeft || 0
-									};
-								}
-							} catch (e) {
-								// Cross-origin iframe, can't access
-							}
-						});
-						return scrollData;
-					})()
-					""",
-					'returnByValue': True,
-				},
-				session_id=cdp_session.session_id,
-			)
-			if scroll_result and 'result' in scroll_result and 'value' in scroll_result['result']:
-				iframe_scroll_positions = scroll_result['result']['value']
-				for idx, scroll_data in iframe_scroll_positions.items():
-					self.logger.debug(
-						f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
-					)
+			probe = await self.browser_session.get_page_probe(target_id)
+			self.logger.debug(f'🔍 DEBUG: Capturing DOM snapshot for target {target_id} (readyState={probe.ready_state})')
+			for idx, scroll_data in probe.iframe_scroll_positions.items():
+				self.logger.debug(
+					f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
+				)
 		except Exception as e:
-			self.logger.debug(f'Failed to get iframe scroll positions: {e}')
+			self.logger.debug(f'Failed to probe page before capturing the snapshot: {e}')
 
 		# Define CDP request factories to avoid duplication
 		def create_snapshot_request():
@@ -350,20 +457,33 @@ class DomService:
 				session_id=cdp_session.session_id,
 			)
 
-		def create_dom_tree_request():
+		live_dom_mirror = self.live_dom_mirror if use_live_dom_mirror else None
+
+		def create_full_dom_tree_request():
 			return cdp_session.cdp_client.send.DOM.getDocument(
 				params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
 			)
 
+		async def create_dom_tree_request():
+			if live_dom_mirror is None:
+				return await create_full_dom_tree_request()
+			try:
+				return await live_dom_mirror.get_document(target_id)
+			except Exception as e:
+				self.logger.debug(f'Live DOM mirror failed, fetching full document instead: {e}')
+				await live_dom_mirror.close()
+				return await create_full_dom_tree_request()
+
 		start = time.time()
 
-		# Create initial tasks
+		# Create initial tasks (lazy / off AX modes do not fetch the full AX tree of every frame)
 		tasks = {
 			'snapshot': asyncio.create_task(create_snapshot_request()),
 			'dom_tree': asyncio.create_task(create_dom_tree_request()),
-			'ax_tree': asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
 			'device_pixel_ratio': asyncio.create_task(self._get_viewport_ratio(target_id)),
 		}
+		if self.ax_tree_mode == 'full':
+			tasks['ax_tree'] = asyncio.create_task(self._get_ax_tree_for_all_frames(target_id))
 
 		# Wait for all tasks with timeout
 		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
@@ -377,9 +497,10 @@ class DomService:
 			retry_map = {
 				tasks['snapshot']: lambda: asyncio.create_task(create_snapshot_request()),
 				tasks['dom_tree']: lambda: asyncio.create_task(create_dom_tree_request()),
-				tasks['ax_tree']: lambda: asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
 				tasks['device_pixel_ratio']: lambda: asyncio.create_task(self._get_viewport_ratio(target_id)),
 			}
+			if 'ax_tree' in tasks:
+				retry_map[tasks['ax_tree']] = lambda: asyncio.create_task(self._get_ax_tree_for_all_frames(target_id))
 
 			# Create new tasks only for the ones that didn't complete
 			for key, task in tasks.items():
@@ -413,10 +534,23 @@ class DomService:
 
 		snapshot = results['snapshot']
 		dom_tree = results['dom_tree']
-		ax_tree = results['ax_tree']
 		device_pixel_ratio = results['device_pixel_ratio']
+		if self.ax_tree_mode == 'lazy':
+			ax_start = time.time()
+			candidates = self._get_ax_candidate_backend_node_ids(dom_tree, snapshot)
+			ax_tree = await self._get_partial_ax_tree(target_id, candidates)
+			self.logger.debug(
+				f'🔍 DEBUG: Lazy AX mode fetched {len(ax_tree["nodes"])} AX nodes for {len(candidates)} candidates '
+				f'in {time.time() - ax_start:.3f}s'
+			)
+		elif self.ax_tree_mode == 'off':
+			ax_tree = {'nodes': []}
+		else:
+			ax_tree = results['ax_tree']
 		end = time.time()
 		cdp_timing = {'cdp_calls_total': end - start}
+		if live_dom_mirror is not None:
+			self.logger.debug(f'🔍 DEBUG: Live DOM mirror stats: {live_dom_mirror.stats()}')
 
 		# DEBUG: Log snapshot info and limit documents to prevent explosion
 		if snapshot and 'documents' in snapshot:
@@ -451,6 +585,8 @@ class DomService:
 		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
 		initial_total_frame_offset: DOMRect | None = None,
 		iframe_depth: int = 0,
+		cross_origin_context: CrossOriginIframeContext | None = None,
+		trees: TargetAllTrees | None = None,
 	) -> EnhancedDOMTreeNode:
 		"""Get the DOM tree for a specific target.
 
@@ -459,9 +595,478 @@ class DomService:
 			initial_html_frames: List of HTML frame nodes encountered so far
 			initial_total_frame_offset: Accumulated coordinate offset
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
+			cross_origin_context: Set when fetching a cross-origin iframe document, shared with the page tree build
+			trees: Already fetched CDP payloads of the target, fetched here if not given
 		"""
 
-		trees = await self._get_all_trees(target_id)
+		if trees is None and cross_origin_context is not None:
+			# only the CDP fetch holds the semaphore, nested iframes are resolved after releasing it
+			async with cross_origin_context.semaphore:
+				trees = await self._get_all_trees(target_id)
+		elif trees is None:
+			# the mirror follows the page target only, cross-origin iframe documents are always fetched in full
+			trees = await self._get_all_trees(target_id, use_live_dom_mirror=iframe_depth == 0)
+
+		if not self.iterative_tree_builder:
+			enhanced_dom_tree_node = await self._build_enhanced_tree_recursive(
+				trees, target_id, initial_html_frames, initial_total_frame_offset, iframe_depth
+			)
+			if iframe_depth == 0:
+				self.compute_fingerprints(enhanced_dom_tree_node)
+			return enhanced_dom_tree_node
+
+		enhanced_dom_tree_node, pending_iframes = self.build_enhanced_tree(
+			trees, target_id, initial_html_frames, initial_total_frame_offset, iframe_depth
+		)
+		if pending_iframes:
+			context = cross_origin_context or CrossOriginIframeContext(
+				semaphore=asyncio.Semaphore(self.max_concurrent_iframe_fetches)
+			)
+			await asyncio.gather(*(self._resolve_cross_origin_iframe(pending, context) for pending in pending_iframes))
+
+		# cross-origin iframe documents are stitched into the page tree above, fingerprint the whole tree once
+		if iframe_depth == 0:
+			self.compute_fingerprints(enhanced_dom_tree_node)
+
+		return enhanced_dom_tree_node
+
+	def build_enhanced_tree(
+		self,
+		trees: TargetAllTrees,
+		target_id: TargetID,
+		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
+		initial_total_frame_offset: DOMRect | None = None,
+		iframe_depth: int = 0,
+	) -> tuple[EnhancedDOMTreeNode, list[PendingCrossOriginIframe]]:
+		"""Build the enhanced DOM tree from raw CDP trees in a single iterative, synchronous pass.
+
+		Nodes are created in the same (pre-)order as the recursive builder, but with an explicit stack instead of
+		one coroutine per node. HTML frame lists and frame offsets are shared between nodes and only copied when a
+		frame boundary changes them. Visibility is computed afterwards in one batched pass over the nodes in the
+		post-order the recursive builder uses (see `compute_visibility`).
+
+		Cross-origin iframes that need their own `get_dom_tree` call are not fetched here; they are returned as
+		placeholders so the caller can resolve them afterwards (concurrently).
+		"""
+		dom_tree = trees.dom_tree
+		ax_tree = trees.ax_tree
+
+		ax_tree_lookup: dict[int, AXNode] = {
+			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
+		}
+
+		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+		""" NodeId (NOT backend node id) -> enhanced dom tree node"""
+
+		snapshot_lookup = build_snapshot_lookup(trees.snapshot, trees.device_pixel_ratio)
+		session_id = self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None
+		pending_iframes: list[PendingCrossOriginIframe] = []
+		node_types = {node_type.value: node_type for node_type in NodeType}
+		build_ax_node = self._build_enhanced_ax_node
+
+		root_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
+		if initial_total_frame_offset is not None:
+			root_frame_offset = DOMRect(
+				initial_total_frame_offset.x,
+				initial_total_frame_offset.y,
+				initial_total_frame_offset.width,
+				initial_total_frame_offset.height,
+			)
+
+		root_holder: list[EnhancedDOMTreeNode] = []
+		post_order: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]] = []
+		iframe_candidates: list[tuple[Node, EnhancedDOMTreeNode, DOMRect]] = []
+
+		# Stack entries are either ENTER (create a node and schedule its subtree) or EXIT (post-order bookkeeping).
+		# ENTER: (_ENTER, cdp_node, html_frames, total_frame_offset, owner, slot)
+		# EXIT:  (_EXIT, cdp_node, html_frames, total_frame_offset, enhanced_node, None)
+		stack: list[tuple] = [(_ENTER, dom_tree['root'], initial_html_frames or [], root_frame_offset, None, _SLOT_ROOT)]
+
+		while stack:
+			action, node, html_frames, total_frame_offset, owner, slot = stack.pop()
+
+			if action == _EXIT:
+				post_order.append((owner, html_frames))
+				if self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument') is None:
+					iframe_candidates.append((node, owner, total_frame_offset))
+				continue
+
+			# memoize the mf (I don't know if some nodes are duplicated)
+			memoized_node = enhanced_dom_tree_node_lookup.get(node['nodeId'])
+			if memoized_node is not None:
+				dom_tree_node = memoized_node
+			else:
+				ax_node = ax_tree_lookup.get(node['backendNodeId'])
+
+				attributes: dict[str, str] = {}
+				raw_attributes = node.get('attributes')
+				if raw_attributes:
+					for i in range(0, len(raw_attributes), 2):
+						attributes[intern(raw_attributes[i])] = raw_attributes[i + 1]
+
+				snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
+				absolute_position = None
+				if snapshot_data and snapshot_data.bounds:
+					absolute_position = DOMRect(
+						x=snapshot_data.bounds.x + total_frame_offset.x,
+						y=snapshot_data.bounds.y + total_frame_offset.y,
+						width=snapshot_data.bounds.width,
+						height=snapshot_data.bounds.height,
+					)
+
+				dom_tree_node = EnhancedDOMTreeNode(
+					node_id=node['nodeId'],
+					backend_node_id=node['backendNodeId'],
+					node_type=node_types[node['nodeType']],
+					node_name=intern(node['nodeName']),
+					node_value=node['nodeValue'],
+					attributes=attributes,
+					is_scrollable=node.get('isScrollable', None),
+					frame_id=node.get('frameId', None),
+					session_id=session_id,
+					target_id=target_id,
+					content_document=None,
+					shadow_root_type=node.get('shadowRootType') or None,
+					shadow_roots=None,
+					parent_node=None,
+					children_nodes=None,
+					ax_node=build_ax_node(ax_node) if ax_node else None,
+					snapshot_node=snapshot_data,
+					is_visible=None,
+					absolute_position=absolute_position,
+					element_index=None,
+				)
+				enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+
+				if node.get('parentId'):
+					dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[node['parentId']]
+
+			# attach to the owner exactly like the recursive builder does
+			if slot == _SLOT_CHILD:
+				owner.children_nodes.append(dom_tree_node)
+			elif slot == _SLOT_SHADOW_ROOT:
+				dom_tree_node.parent_node = owner
+				owner.shadow_roots.append(dom_tree_node)
+			elif slot == _SLOT_CONTENT_DOCUMENT:
+				owner.content_document = dom_tree_node
+				dom_tree_node.parent_node = owner
+			else:
+				root_holder.append(dom_tree_node)
+
+			if memoized_node is not None:
+				continue  # already built, its subtree is not walked again
+
+			# Frame bookkeeping: only copy the frame list / offset when this node changes them
+			node_name_upper = node['nodeName'].upper()
+			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
+				html_frames = [*html_frames, dom_tree_node]
+				if snapshot_data and snapshot_data.scrollRects:
+					total_frame_offset = DOMRect(
+						total_frame_offset.x - snapshot_data.scrollRects.x,
+						total_frame_offset.y - snapshot_data.scrollRects.y,
+						total_frame_offset.width,
+						total_frame_offset.height,
+					)
+			if (node_name_upper == 'IFRAME' or node_name_upper == 'FRAME') and snapshot_data and snapshot_data.bounds:
+				html_frames = [*html_frames, dom_tree_node]
+				total_frame_offset = DOMRect(
+					total_frame_offset.x + snapshot_data.bounds.x,
+					total_frame_offset.y + snapshot_data.bounds.y,
+					total_frame_offset.width,
+					total_frame_offset.height,
+				)
+
+			stack.append((_EXIT, node, html_frames, total_frame_offset, dom_tree_node, None))
+
+			children = node.get('children')
+			if children:
+				dom_tree_node.children_nodes = []
+				for child in reversed(children):
+					stack.append((_ENTER, child, html_frames, total_frame_offset, dom_tree_node, _SLOT_CHILD))
+
+			shadow_roots = node.get('shadowRoots')
+			if shadow_roots:
+				dom_tree_node.shadow_roots = []
+				for shadow_root in reversed(shadow_roots):
+					stack.append((_ENTER, shadow_root, html_frames, total_frame_offset, dom_tree_node, _SLOT_SHADOW_ROOT))
+
+			content_document = node.get('contentDocument')
+			if content_document:
+				stack.append((_ENTER, content_document, html_frames, total_frame_offset, dom_tree_node, _SLOT_CONTENT_DOCUMENT))
+
+		self.compute_visibility(post_order)
+
+		for node, dom_tree_node, total_frame_offset in iframe_candidates:
+			pending = self._get_pending_cross_origin_iframe(node, dom_tree_node, total_frame_offset, iframe_depth)
+			if pending:
+				pending_iframes.append(pending)
+
+		return root_holder[0], pending_iframes
+
+	@staticmethod
+	def _frame_program(html_frames: list[EnhancedDOMTreeNode]) -> list[tuple]:
+		"""Flatten a frame chain into the offset / viewport steps `is_element_visible_according_to_all_parents` applies."""
+		program: list[tuple] = []
+		for frame in reversed(html_frames):
+			snapshot_node = frame.snapshot_node
+			if frame.node_type != NodeType.ELEMENT_NODE or not snapshot_node:
+				continue
+			frame_name = frame.node_name.upper()
+			if (frame_name == 'IFRAME' or frame_name == 'FRAME') and snapshot_node.bounds:
+				program.append((_FRAME_OFFSET, snapshot_node.bounds.x, snapshot_node.bounds.y))
+			if frame.node_name == 'HTML' and snapshot_node.scrollRects and snapshot_node.clientRects:
+				scroll_rects = snapshot_node.scrollRects
+				client_rects = snapshot_node.clientRects
+				program.append((_FRAME_VIEWPORT, scroll_rects.x, scroll_rects.y, client_rects.width, client_rects.height))
+		return program
+
+	@classmethod
+	def compute_visibility(cls, nodes: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]]) -> None:
+		"""Set `is_visible` for many (node, html_frames) pairs at once.
+
+		Same result and the same in-place adjustment of `snapshot_node.bounds` as calling
+		`is_element_visible_according_to_all_parents` on each pair in order, but styles are read from a
+		precomputed per-document mask (`hidden_by_style`) and every distinct frame chain is flattened once into a
+		short list of offset / viewport steps instead of being re-walked per node.
+
+		`nodes` must be in post-order: a frame's own bounds are only adjusted after all nodes inside it.
+		"""
+		programs: dict[int, list[tuple]] = {}
+		for node, html_frames in nodes:
+			snapshot_node = node.snapshot_node
+			if not snapshot_node or snapshot_node.hidden_by_style:
+				node.is_visible = False
+				continue
+
+			bounds = snapshot_node.bounds
+			if not bounds:
+				node.is_visible = False  # If there are no bounds, the element is not visible
+				continue
+
+			# frame chains are shared list objects (see build_enhanced_tree), so id() identifies a chain
+			program = programs.get(id(html_frames))
+			if program is None:
+				program = programs[id(html_frames)] = cls._frame_program(html_frames)
+
+			visible = True
+			x = bounds.x
+			y = bounds.y
+			for step in program:
+				if step[0] == _FRAME_OFFSET:
+					x += step[1]
+					y += step[2]
+					continue
+				_, scroll_x, scroll_y, viewport_width, viewport_height = step
+				adjusted_x = x - scroll_x
+				adjusted_y = y - scroll_y
+				if not (
+					adjusted_x < viewport_width
+					and adjusted_x + bounds.width > 0
+					and adjusted_y < viewport_height
+					and adjusted_y + bounds.height > 0
+				):
+					visible = False
+					break
+				x = adjusted_x
+				y = adjusted_y
+
+			bounds.x = x
+			bounds.y = y
+			node.is_visible = visible
+
+	@staticmethod
+	def compute_trees_fingerprint(trees: TargetAllTrees) -> int:
+		"""Fingerprint of a page's snapshot, AX tree and device pixel ratio, equal only if the serialized state would be.
+
+		The snapshot carries the structure, attributes, text, layout bounds, paint order and scroll offsets of every
+		node, so the DOM tree payload (the same nodes) is left out. Must run before building, which rewrites bounds.
+		"""
+		return hash((_freeze(trees.snapshot), _freeze(trees.ax_tree), trees.device_pixel_ratio))
+
+	@staticmethod
+	def compute_fingerprints(root: EnhancedDOMTreeNode) -> None:
+		"""Precompute `parent_branch_hash()` and `hash()` for every element in one top-down pass.
+
+		Both are SHA-256 digests of the branch path (tag names from the root down to the element), so instead of
+		walking up to the root and hashing the whole path per element, the parent's hasher is copied and only the
+		element's own tag is fed to it. The values are identical to the walk-based ones, so element hashes stored
+		in older histories still match. Non-element nodes share their element parent's branch hash; their
+		`hash()` is still computed on demand.
+		"""
+		empty_branch_hash = fingerprint(hashlib.sha256())
+
+		# (node, hasher fed with the branch path so far or None while the path is empty, branch hash of that path)
+		stack: list[tuple[EnhancedDOMTreeNode, hashlib._Hash | None, int]] = [(root, None, empty_branch_hash)]
+		while stack:
+			node, branch_hasher, branch_hash = stack.pop()
+			if node._parent_branch_hash is not None:
+				continue  # the same node can be attached twice, see build_enhanced_tree
+
+			if node.node_type == NodeType.ELEMENT_NODE:
+				if branch_hasher is None:
+					branch_hasher = hashlib.sha256(node.tag_name.encode())
+				else:
+					branch_hasher = branch_hasher.copy()
+					branch_hasher.update(f'/{node.tag_name}'.encode())
+				branch_hash = fingerprint(branch_hasher)
+				node._element_hash = branch_element_hash(branch_hasher, node.attributes)
+			node._parent_branch_hash = branch_hash
+
+			if node.content_document:
+				stack.append((node.content_document, branch_hasher, branch_hash))
+			for shadow_root in node.shadow_roots or ():
+				stack.append((shadow_root, branch_hasher, branch_hash))
+			for child in node.children_nodes or ():
+				stack.append((child, branch_hasher, branch_hash))
+
+	@staticmethod
+	def compute_xpaths(nodes: Iterable[EnhancedDOMTreeNode]) -> None:
+		"""Precompute `xpath` for many elements at once, e.g. for every element of a selector map.
+
+		The walk-based `xpath` goes up to the root and rescans the siblings of every ancestor for each element.
+		Here every ancestor is resolved once, top-down from the closest ancestor that is already known, and the
+		same-tag positions of all children of a parent come from a single scan of that parent. The values are
+		identical to the walk-based ones; only the given nodes keep theirs memoized.
+		"""
+		# id(parent) -> id(child element) -> 1-based position among its same-tag siblings, 0 if it is the only one
+		positions: dict[int, dict[int, int]] = {}
+		# id(node) -> xpath, for the ancestors resolved during this call
+		known: dict[int, str] = {}
+
+		def element_position(element: EnhancedDOMTreeNode) -> int:
+			parent = element.parent_node
+			if not parent or not parent.children_nodes:
+				return 0
+			sibling_positions = positions.get(id(parent))
+			if sibling_positions is None:
+				tag_counts: dict[str, int] = {}
+				tagged: dict[int, tuple[str, int]] = {}
+				for child in parent.children_nodes:
+					if child.node_type == NodeType.ELEMENT_NODE:
+						tag = child.node_name.lower()
+						tag_counts[tag] = tag_counts.get(tag, 0) + 1
+						tagged.setdefault(id(child), (tag, tag_counts[tag]))
+				sibling_positions = {
+					child_id: position if tag_counts[tag] > 1 else 0 for child_id, (tag, position) in tagged.items()
+				}
+				positions[id(parent)] = sibling_positions
+			return sibling_positions.get(id(element), 0)
+
+		for node in nodes:
+			if node._xpath is not None:
+				continue
+
+			# Walk up until a node with a known xpath or the end of the path (same stops as `xpath`)
+			chain: list[EnhancedDOMTreeNode] = []
+			prefix = ''
+			current = node
+			while current is not None and (
+				current.node_type == NodeType.ELEMENT_NODE or current.node_type == NodeType.DOCUMENT_FRAGMENT_NODE
+			):
+				cached = known.get(id(current), current._xpath)
+				if cached is not None:
+					prefix = cached
+					break
+				chain.append(current)
+				if (
+					current.node_type == NodeType.ELEMENT_NODE
+					and current.parent_node
+					and current.parent_node.node_name.lower() == 'iframe'
+				):
+					break  # the path starts below the iframe, this element is not part of it
+				current = current.parent_node
+
+			# Shadow roots pass through, every other element adds its segment to the path of its parent
+			for current in reversed(chain):
+				is_path_start = current.parent_node is not None and current.parent_node.node_name.lower() == 'iframe'
+				if current.node_type == NodeType.ELEMENT_NODE and not is_path_start:
+					tag_name = current.node_name.lower()
+					position = element_position(current)
+					segment = f'{tag_name}[{position}]' if position > 0 else tag_name
+					prefix = f'{prefix}/{segment}' if prefix else segment
+				known[id(current)] = prefix
+			node._xpath = prefix
+
+	def _get_pending_cross_origin_iframe(
+		self, node: Node, dom_tree_node: EnhancedDOMTreeNode, total_frame_offset: DOMRect, iframe_depth: int
+	) -> PendingCrossOriginIframe | None:
+		"""Decide whether a cross-origin iframe without content document should be fetched via its own target."""
+		# Check iframe depth to prevent infinite recursion
+		if iframe_depth >= self.max_iframe_depth:
+			self.logger.debug(
+				f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
+			)
+			return None
+
+		# Only process the iframe if it is visible and large enough (>= 200px in both dimensions)
+		if not dom_tree_node.is_visible:
+			self.logger.debug('Skipping invisible cross-origin iframe')
+			return None
+		if not dom_tree_node.snapshot_node or not dom_tree_node.snapshot_node.bounds:
+			self.logger.debug('Skipping cross-origin iframe: no bounds available')
+			return None
+
+		bounds = dom_tree_node.snapshot_node.bounds
+		if bounds.width < 200 or bounds.height < 200:
+			self.logger.debug(
+				f'Skipping small cross-origin iframe: width={bounds.width}, height={bounds.height} (needs >= 200px)'
+			)
+			return None
+
+		frame_id = node.get('frameId', None)
+		if not frame_id:
+			return None
+
+		self.logger.debug(f'Processing cross-origin iframe: visible=True, width={bounds.width}, height={bounds.height}')
+		return PendingCrossOriginIframe(
+			node=dom_tree_node,
+			frame_id=frame_id,
+			total_frame_offset=DOMRect(
+				total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
+			),
+			iframe_depth=iframe_depth,
+		)
+
+	async def _get_target_infos(self) -> dict[TargetID, TargetInfo]:
+		targets = await self.browser_session.cdp_client.send.Target.getTargets()
+		return {target['targetId']: target for target in targets['targetInfos']}
+
+	async def _resolve_cross_origin_iframe(self, pending: PendingCrossOriginIframe, context: CrossOriginIframeContext) -> None:
+		"""Fetch the DOM tree of a cross-origin iframe from its own target and stitch it into the tree."""
+		# The first iframe starts the fetches, concurrent ones await the same tasks
+		if context.all_frames is None:
+			context.all_frames = asyncio.create_task(self.browser_session.get_all_frames())
+		all_frames, _ = await context.all_frames
+		frame_info = all_frames.get(pending.frame_id)
+		if not frame_info or not frame_info.get('frameTargetId'):
+			return
+
+		if context.target_infos is None:
+			context.target_infos = asyncio.create_task(self._get_target_infos())
+		iframe_document_target = (await context.target_infos).get(frame_info['frameTargetId'])
+		if not iframe_document_target:
+			return
+
+		self.logger.debug(f'Getting content document for iframe {pending.frame_id} at depth {pending.iframe_depth + 1}')
+		content_document = await self.get_dom_tree(
+			target_id=iframe_document_target.get('targetId'),
+			# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+			initial_total_frame_offset=pending.total_frame_offset,
+			iframe_depth=pending.iframe_depth + 1,
+			cross_origin_context=context,
+		)
+		pending.node.content_document = content_document
+		content_document.parent_node = pending.node
+
+	async def _build_enhanced_tree_recursive(
+		self,
+		trees: TargetAllTrees,
+		target_id: TargetID,
+		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
+		initial_total_frame_offset: DOMRect | None = None,
+		iframe_depth: int = 0,
+	) -> EnhancedDOMTreeNode:
+		"""Original recursive, coroutine-per-node builder. Kept behind `iterative_tree_builder=False` for comparison."""
 
 		dom_tree = trees.dom_tree
 		ax_tree = trees.ax_tree
@@ -517,7 +1122,7 @@ class DomService:
 			if 'attributes' in node and node['attributes']:
 				attributes = {}
 				for i in range(0, len(node['attributes']), 2):
-					attributes[node['attributes'][i]] = node['attributes'][i + 1]
+					attributes[intern(node['attributes'][i])] = node['attributes'][i + 1]
 
 			shadow_root_type = None
 			if 'shadowRootType' in node and node['shadowRootType']:
@@ -541,7 +1146,7 @@ class DomService:
 				node_id=node['nodeId'],
 				backend_node_id=node['backendNodeId'],
 				node_type=NodeType(node['nodeType']),
-				node_name=node['nodeName'],
+				node_name=intern(node['nodeName']),
 				node_value=node['nodeValue'],
 				attributes=attributes or {},
 				is_scrollable=node.get('isScrollable', None),
@@ -715,23 +1320,116 @@ class DomService:
 	) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]]:
 		"""Get the serialized DOM tree representation for LLM consumption.
 
+		With `reuse_unchanged_dom`, the page payloads are fingerprinted first, and if nothing changed since
+		`previous_cached_state` was built, it is reused instead of building and serializing the tree again.
+		With a `process_pool`, building and serializing run in a worker and the returned enhanced tree only holds
+		the nodes the serialized state reads (see `prune_for_transfer`), pages too deeply nested to send to a worker
+		are built in process. With a `capture_recorder`, the page payloads of every call are recorded for offline
+		replay (see `browser_use.dom.capture`).
+
 		Returns:
 			Tuple of (serialized_dom_state, enhanced_dom_tree_root, timing_info)
 		"""
 
 		# Use current target (None means use current)
-		assert self.browser_session.current_target_id is not None
-		enhanced_dom_tree = await self.get_dom_tree(target_id=self.browser_session.current_target_id)
-
-		start = time.time()
-		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering
-		).serialize_accessible_elements()
-
-		end = time.time()
-		serialize_total_timing = {'serialize_dom_tree_total': end - start}
+		target_id = self.browser_session.current_target_id
+		assert target_id is not None
+
+		trees = None
+		dom_fingerprint = None
+		fingerprint_timing = {}
+		if self.reuse_unchanged_dom or self.capture_recorder is not None:
+			trees = await self._get_all_trees(target_id, use_live_dom_mirror=True)
+		if self.capture_recorder is not None:
+			assert trees is not None
+			await self.capture_recorder.record(target_id, trees)
+		if self.reuse_unchanged_dom:
+			assert trees is not None
+			start = time.time()
+			dom_fingerprint = (target_id, self.compute_trees_fingerprint(trees))
+			fingerprint_timing = {'dom_fingerprint': time.time() - start}
+			self.fingerprint_stats.checks += 1
+			self.fingerprint_stats.last_reused = False
+
+			reusable = self._last_serialized is not None and previous_cached_state is self._last_serialized[0]
+			# Elements marked as new would stay marked, re-serialize once so they are not reported as new again
+			if (
+				reusable
+				and dom_fingerprint == self._last_dom_fingerprint
+				and not (
+					previous_cached_state and previous_cached_state.elements_diff and previous_cached_state.elements_diff.added
+				)
+			):
+				assert previous_cached_state is not None and self._last_serialized is not None
+				self.fingerprint_stats.hits += 1
+				self.fingerprint_stats.last_reused = True
+				serialized_dom_state = previous_cached_state.reused()
+				enhanced_dom_tree = self._last_serialized[1]
+				self._last_serialized = (serialized_dom_state, enhanced_dom_tree)
+				self.logger.debug(
+					f'DOM unchanged, reusing previous state (fingerprint hit rate {self.fingerprint_stats.hit_rate:.0%})'
+				)
+				return serialized_dom_state, enhanced_dom_tree, fingerprint_timing
+
+		pooled = None
+		if self.process_pool is not None:
+			if trees is None:
+				trees = await self._get_all_trees(target_id, use_live_dom_mirror=True)
+			pooled = await self._build_and_serialize_in_pool(target_id, trees, previous_cached_state)
+		if pooled is not None:
+			serialized_dom_state, enhanced_dom_tree, serializer_timing = pooled
+			serialize_total_timing = {}
+		else:
+			enhanced_dom_tree = await self.get_dom_tree(target_id=target_id, trees=trees)
+
+			start = time.time()
+			serialized_dom_state, serializer_timing = DOMTreeSerializer(
+				enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering
+			).serialize_accessible_elements()
+
+			end = time.time()
+			serialize_total_timing = {'serialize_dom_tree_total': end - start}
+
+			start = time.time()
+			self.compute_xpaths(serialized_dom_state.selector_map.values())
+			serialize_total_timing['compute_xpaths'] = time.time() - start
+
+		if dom_fingerprint is not None:
+			self._last_dom_fingerprint = dom_fingerprint
+			self._last_serialized = (serialized_dom_state, enhanced_dom_tree)
 
 		# Combine all timing info
-		all_timing = {**serializer_timing, **serialize_total_timing}
+		all_timing = {**fingerprint_timing, **serializer_timing, **serialize_total_timing}
 
 		return serialized_dom_state, enhanced_dom_tree, all_timing
+
+	async def _build_and_serialize_in_pool(
+		self, target_id: TargetID, trees: TargetAllTrees, previous_cached_state: SerializedDOMState | None
+	) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]] | None:
+		"""Build and serialize the page in `process_pool`, None if it has to be done in process instead.
+
+		Pages nested deeper than pickle's recursion limit can not be sent to or back from a worker.
+		"""
+		assert self.process_pool is not None
+		start = time.time()
+		job = partial(
+			_build_and_serialize,
+			trees,
+			target_id,
+			self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None,
+			previous_cached_state.backend_node_id_to_index if previous_cached_state else None,
+			self.paint_order_filtering,
+		)
+		try:
+			serialized_dom_state, enhanced_dom_tree, timing = await asyncio.get_running_loop().run_in_executor(
+				self.process_pool, job
+			)
+		except (pickle.PicklingError, RecursionError) as e:
+			self.logger.warning(f'Could not offload the DOM build ({type(e).__name__}: {e}), building it in process')
+			return None
+		except BrokenProcessPool as e:
+			self.logger.warning(f'DOM process pool is broken ({e}), building the DOM in process from now on')
+			self.process_pool = None
+			return None
+		timing['dom_offload_total'] = time.time() - start
+		return serialized_dom_state, enhanced_dom_tree, timing
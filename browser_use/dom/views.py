@@ -1,7 +1,8 @@
+import asyncio
 import hashlib
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXPropertyName
@@ -14,6 +15,9 @@ from uuid_extensions import uuid7str
 from browser_use.dom.utils import cap_text_length
 from browser_use.observability import observe_debug
 
+AXTreeMode = Literal['full', 'lazy', 'off']
+"""How much accessibility data to fetch per step: every frame's full AX tree, only candidate interactive elements, or none"""
+
 # Serializer types
 DEFAULT_INCLUDE_ATTRIBUTES = [
 	'title',
@@ -70,6 +74,29 @@ class TargetAllTrees:
 	cdp_timing: dict[str, float]
 
 
+@dataclass(slots=True)
+class PendingCrossOriginIframe:
+	"""Cross-origin iframe found while building the tree whose document must be fetched from its own target."""
+
+	node: 'EnhancedDOMTreeNode'
+	frame_id: str
+	total_frame_offset: 'DOMRect'
+	iframe_depth: int
+
+
+@dataclass
+class CrossOriginIframeContext:
+	"""Shared by all cross-origin iframe fetches of one page tree build, including nested iframes.
+
+	The frame map and target list are fetched at most once per build, and `semaphore` bounds how many iframe
+	documents are fetched at the same time.
+	"""
+
+	semaphore: asyncio.Semaphore
+	all_frames: 'asyncio.Task[tuple[dict[str, dict], dict[str, str]]] | None' = None
+	target_infos: 'asyncio.Task[dict[TargetID, TargetInfo]] | None' = None
+
+
 @dataclass(slots=True)
 class PropagatingBounds:
 	"""Track bounds that propagate from parent elements to filter children."""
@@ -80,6 +107,18 @@ class PropagatingBounds:
 	depth: int  # How deep in tree this started (for debugging)
 
 
+def fingerprint(branch_hasher: 'hashlib._Hash') -> int:
+	"""Turn a SHA-256 hasher into a node fingerprint - the first 16 hex chars (8 bytes) of the digest as an int"""
+	return int.from_bytes(branch_hasher.digest()[:8], 'big')
+
+
+def branch_element_hash(branch_hasher: 'hashlib._Hash', attributes: dict[str, str]) -> int:
+	"""Element hash from a hasher fed with the parent branch path: sha256('<branch path>|<attributes>')"""
+	element_hasher = branch_hasher.copy()
+	element_hasher.update(('|' + ''.join(f'{key}={value}' for key, value in attributes.items())).encode())
+	return fingerprint(element_hasher)
+
+
 @dataclass(slots=True)
 class SimplifiedNode:
 	"""Simplified tree node for optimization."""
@@ -204,6 +243,17 @@ class EnhancedSnapshotNode:
 	stacking_contexts: int | None
 	"""Stacking contexts from the layout tree"""
 
+	@property
+	def hidden_by_style(self) -> bool:
+		"""Whether computed styles hide the element (display: none, visibility: hidden or opacity <= 0)."""
+		computed_styles = self.computed_styles or {}
+		if computed_styles.get('display', '').lower() == 'none' or computed_styles.get('visibility', '').lower() == 'hidden':
+			return True
+		try:
+			return float(computed_styles.get('opacity', '1')) <= 0
+		except (ValueError, TypeError):
+			return False
+
 
 # @dataclass(slots=True)
 # class SuperSelector:
@@ -221,13 +271,16 @@ class EnhancedSnapshotNode:
 # 	element_index: int | None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class EnhancedDOMTreeNode:
 	"""
 	Enhanced DOM tree node that contains information from AX, DOM, and Snapshot trees. It's mostly based on the types on DOM node type with enhanced data from AX and Snapshot trees.
 
 	@dev when serializing check if the value is a valid value first!
 
+	Nodes compare by identity (every node used to carry a unique uuid, so no two nodes were ever equal), and the
+	uuid is only generated when asked for. Tag names and attribute keys are interned by the tree builders.
+
 	Learn more about the fields:
 	- (DOM node) https://chromedevtools.github.io/devtools-protocol/tot/DOM/#type-BackendNode
 	- (AX node) https://chromedevtools.github.io/devtools-protocol/tot/Accessibility/#type-AXNode
@@ -295,7 +348,20 @@ class EnhancedDOMTreeNode:
 	# Interactive element index
 	element_index: int | None = None
 
-	uuid: str = field(default_factory=uuid7str)
+	_uuid: str | None = field(default=None, repr=False)
+
+	# Fingerprints, precomputed top-down by `DomService.compute_fingerprints` (or memoized on first use)
+	_parent_branch_hash: int | None = field(default=None, repr=False)
+	_element_hash: int | None = field(default=None, repr=False)
+
+	# XPath, precomputed for the selector map by `DomService.compute_xpaths` (or memoized on first use)
+	_xpath: str | None = field(default=None, repr=False)
+
+	@property
+	def uuid(self) -> str:
+		if self._uuid is None:
+			self._uuid = uuid7str()
+		return self._uuid
 
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
@@ -322,6 +388,11 @@ class EnhancedDOMTreeNode:
 	@property
 	def xpath(self) -> str:
 		"""Generate XPath for this DOM node, stopping at shadow boundaries or iframes."""
+		if self._xpath is None:
+			self._xpath = self._build_xpath()
+		return self._xpath
+
+	def _build_xpath(self) -> str:
 		segments = []
 		current_element = self
 
@@ -667,30 +738,20 @@ class EnhancedDOMTreeNode:
 
 		TODO: migrate this to use only backendNodeId + current SessionId
 		"""
-
-		# Get parent branch path
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-
-		# Get attributes hash
-		attributes_string = ''.join(f'{key}={value}' for key, value in self.attributes.items())
-
-		# Combine both for final hash
-		combined_string = f'{parent_branch_path_string}|{attributes_string}'
-		element_hash = hashlib.sha256(combined_string.encode()).hexdigest()
-
-		# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
-		return int(element_hash[:16], 16)
+		if self._element_hash is None:
+			# Get parent branch path
+			parent_branch_path_string = '/'.join(self._get_parent_branch_path())
+			self._element_hash = branch_element_hash(hashlib.sha256(parent_branch_path_string.encode()), self.attributes)
+		return self._element_hash
 
 	def parent_branch_hash(self) -> int:
 		"""
 		Hash the element based on its parent branch path and attributes.
 		"""
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		element_hash = hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
-
-		return int(element_hash[:16], 16)
+		if self._parent_branch_hash is None:
+			parent_branch_path_string = '/'.join(self._get_parent_branch_path())
+			self._parent_branch_hash = fingerprint(hashlib.sha256(parent_branch_path_string.encode()))
+		return self._parent_branch_hash
 
 	def _get_parent_branch_path(self) -> list[str]:
 		"""Get the parent branch path as a list of tag names from root to current element."""
@@ -709,6 +770,69 @@ class EnhancedDOMTreeNode:
 DOMSelectorMap = dict[int, EnhancedDOMTreeNode]
 
 
+@dataclass
+class DOMSerializationStats:
+	"""Counts `llm_representation` calls that had to serialize the tree vs. calls answered from the cache"""
+
+	serializations: int = 0
+	cache_hits: int = 0
+	chars_reused: int = 0
+
+	def __add__(self, other: 'DOMSerializationStats') -> 'DOMSerializationStats':
+		return DOMSerializationStats(
+			serializations=self.serializations + other.serializations,
+			cache_hits=self.cache_hits + other.cache_hits,
+			chars_reused=self.chars_reused + other.chars_reused,
+		)
+
+	def __sub__(self, other: 'DOMSerializationStats') -> 'DOMSerializationStats':
+		return DOMSerializationStats(
+			serializations=self.serializations - other.serializations,
+			cache_hits=self.cache_hits - other.cache_hits,
+			chars_reused=self.chars_reused - other.chars_reused,
+		)
+
+
+@dataclass
+class DOMFingerprintStats:
+	"""Counts state requests that reused the previous serialized state because the page fingerprint did not change"""
+
+	checks: int = 0
+	hits: int = 0
+	last_reused: bool = False
+	"""Whether the last state request reused the previous state"""
+
+	@property
+	def hit_rate(self) -> float:
+		return self.hits / self.checks if self.checks else 0.0
+
+
+@dataclass
+class InteractiveElementsDiff:
+	"""How the interactive elements changed compared to the previous `SerializedDOMState` (matched by backend node id)"""
+
+	added: list[int] = field(default_factory=list)
+	"""Indices (in the new selector map) of elements that were not interactive before"""
+	removed: list[int] = field(default_factory=list)
+	"""Indices (in the previous selector map) of elements that are gone"""
+	moved: dict[int, int] = field(default_factory=dict)
+	"""Previous index -> new index of elements that are still there under a different index"""
+
+	@property
+	def has_changes(self) -> bool:
+		return bool(self.added or self.removed or self.moved)
+
+
+@dataclass(slots=True)
+class CachedLLMRepresentation:
+	"""A serialized tree together with its size, as cached on `SerializedDOMState`"""
+
+	text: str
+	truncated: bool
+	char_count: int
+	estimated_tokens: int
+
+
 @dataclass
 class SerializedDOMState:
 	_root: SimplifiedNode | None
@@ -716,20 +840,164 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	elements_diff: InteractiveElementsDiff | None = None
+	"""Changes against the previous state, only set when the state was serialized with a previous state to compare to"""
+
+	truncated: bool = field(default=False, init=False, repr=False)
+	"""Whether the last budgeted `llm_representation` call left part of the tree out"""
+
+	serialization_stats: DOMSerializationStats = field(default_factory=DOMSerializationStats, init=False, repr=False)
+
+	_representation_cache: dict[tuple, CachedLLMRepresentation] = field(default_factory=dict, init=False, repr=False)
+	_cached_root: SimplifiedNode | None = field(default=None, init=False, repr=False)
+	_backend_node_id_to_index: dict[int, int] | None = field(default=None, init=False, repr=False)
+
+	@property
+	def backend_node_id_to_index(self) -> dict[int, int]:
+		"""backend node id -> interactive index, built once from `selector_map`"""
+		if self._backend_node_id_to_index is None:
+			self._backend_node_id_to_index = {node.backend_node_id: index for index, node in self.selector_map.items()}
+		return self._backend_node_id_to_index
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
 		include_attributes: list[str] | None = None,
+		*,
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+		prioritize_viewport: bool = False,
+		viewport_margin: int | None = None,
+		viewport_height: int | None = None,
 	) -> str:
-		"""Kinda ugly, but leaving this as an internal method because include_attributes are a parameter on the agent, so we need to leave it as a 2 step process"""
-		from browser_use.dom.serializer.serializer import DOMTreeSerializer
-
+		"""Kinda ugly, but leaving this as an internal method because include_attributes are a parameter on the agent, so we need to leave it as a 2 step process
+
+		`max_chars` / `max_tokens` stop serialization at the last whole line that fits (see `truncated`), and
+		`prioritize_viewport` spends that budget on interactive and in-viewport elements first.
+		`viewport_margin` (CSS pixels) only lists elements within that distance of the viewport and summarizes the
+		off-screen sections of the page (heading, counts of links, inputs, ...) in one line each, pass the
+		`PageInfo.viewport_height` along with it.
+		Results are cached per set of arguments until `_root` is replaced or `invalidate_cache` is called.
+		"""
+		self.truncated = False
 		if not self._root:
 			return 'Empty DOM tree (you might have to wait for the page to load)'
 
+		cached = self._get_representation(
+			include_attributes, max_chars, max_tokens, prioritize_viewport, viewport_margin, viewport_height
+		)
+		self.truncated = cached.truncated
+		return cached.text
+
+	def llm_representation_size(
+		self,
+		include_attributes: list[str] | None = None,
+		*,
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+		prioritize_viewport: bool = False,
+		viewport_margin: int | None = None,
+		viewport_height: int | None = None,
+	) -> tuple[int, int]:
+		"""(characters, estimated tokens) of `llm_representation` with the same arguments, served from the same cache"""
+		if not self._root:
+			return 0, 0
+		cached = self._get_representation(
+			include_attributes, max_chars, max_tokens, prioritize_viewport, viewport_margin, viewport_height
+		)
+		return cached.char_count, cached.estimated_tokens
+
+	def diff_representation(
+		self,
+		previous: 'SerializedDOMState',
+		include_attributes: list[str] | None = None,
+		viewport_margin: int | None = None,
+		viewport_height: int | None = None,
+	) -> str:
+		"""Only what changed since `previous` (added / removed / changed lines, unchanged runs collapsed).
+
+		Meant for a model that still has the `llm_representation` of `previous`, with the same `include_attributes`
+		and viewport window, in its context.
+		"""
+		from browser_use.dom.serializer.serializer import DOMTreeSerializer
+
+		return DOMTreeSerializer.serialize_diff(
+			previous._root, self._root, include_attributes or DEFAULT_INCLUDE_ATTRIBUTES, viewport_margin, viewport_height
+		)
+
+	def reused(self) -> 'SerializedDOMState':
+		"""Copy for the next step on an unchanged page: same tree, selector map and cached representations, empty diff
+
+		Elements marked as new (`*[`) stay marked in the shared tree, so only reuse states without added elements.
+		"""
+		state = SerializedDOMState(_root=self._root, selector_map=self.selector_map, elements_diff=InteractiveElementsDiff())
+		state._representation_cache = dict(self._representation_cache)
+		state._cached_root = self._cached_root
+		state._backend_node_id_to_index = self._backend_node_id_to_index
+		return state
+
+	def invalidate_cache(self) -> None:
+		"""Drop cached representations, needed only if the simplified tree is mutated in place"""
+		self._representation_cache.clear()
+		self._cached_root = None
+
+	def _get_representation(
+		self,
+		include_attributes: list[str] | None,
+		max_chars: int | None,
+		max_tokens: int | None,
+		prioritize_viewport: bool,
+		viewport_margin: int | None,
+		viewport_height: int | None,
+	) -> CachedLLMRepresentation:
+		from browser_use.dom.serializer.serializer import APPROX_CHARS_PER_TOKEN, DOMTreeSerializer
+
+		assert self._root is not None
+		if self._cached_root is not self._root:
+			self._representation_cache.clear()
+			self._cached_root = self._root
+
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
+		budgeted = max_chars is not None or max_tokens is not None
+		# Viewport prioritization only changes the output when there is a budget and no viewport window
+		key = (
+			tuple(include_attributes),
+			max_chars,
+			max_tokens,
+			prioritize_viewport and budgeted and viewport_margin is None,
+			viewport_margin,
+			viewport_height if viewport_margin is not None else None,
+		)
 
-		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
+		cached = self._representation_cache.get(key)
+		if cached is not None:
+			self.serialization_stats.cache_hits += 1
+			self.serialization_stats.chars_reused += cached.char_count
+			return cached
+
+		if budgeted:
+			text, truncated = DOMTreeSerializer.serialize_tree_budgeted(
+				self._root,
+				include_attributes,
+				max_chars=max_chars,
+				max_tokens=max_tokens,
+				prioritize_viewport=prioritize_viewport,
+				viewport_margin=viewport_margin,
+				viewport_height=viewport_height,
+			)
+		else:
+			text = DOMTreeSerializer.serialize_tree(self._root, include_attributes, 0, viewport_margin, viewport_height)
+			truncated = False
+
+		self.serialization_stats.serializations += 1
+		cached = CachedLLMRepresentation(
+			text=text,
+			truncated=truncated,
+			char_count=len(text),
+			estimated_tokens=len(text) // APPROX_CHARS_PER_TOKEN,
+		)
+		self._representation_cache[key] = cached
+		return cached
 
 
 @dataclass
@@ -95,7 +95,7 @@ def create_mock_state_message(temp_dir: str):
 	)
 
 	# Override the clickable_elements_to_string method to return our simple element
-	dom_state.llm_representation = lambda include_attributes=None: '[1]<button id="test-button">Click Me</button>'
+	dom_state.llm_representation = lambda include_attributes=None, **kwargs: '[1]<button id="test-button">Click Me</button>'
 
 	# Get the formatted message
 	message = agent_prompt.get_user_message(use_vision=False)
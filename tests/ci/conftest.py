@@ -4,9 +4,11 @@ Pytest configuration for browser-use CI tests.
 Sets up environment variables to ensure tests never connect to production services.
 """
 
+import logging
 import os
 import socketserver
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
@@ -35,6 +37,10 @@ from bubus import BaseEvent
 
 from browser_use import Agent
 from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, SerializedDOMState, TargetAllTrees
 from browser_use.sync.service import CloudSync
 
 
@@ -237,3 +243,46 @@ def event_collector():
 			self.event_order.clear()
 
 	return EventCollector()
+
+
+@pytest.fixture(scope='function')
+def dom_service():
+	"""Factory for DomServices on a stub browser session, to test the DOM pipeline on synthetic pages without a browser.
+
+	`get_serialized_dom_tree()` serves the given `pages` (e.g. from `make_synthetic_page`), one per call.
+	"""
+
+	def make(pages: list[TargetAllTrees] | None = None, **kwargs) -> DomService:
+		browser_session = SimpleNamespace(logger=logging.getLogger('tests.dom'), agent_focus=None, current_target_id='target')
+		service = DomService(browser_session, **kwargs)  # type: ignore[arg-type]
+
+		async def _get_all_trees(target_id, use_live_dom_mirror=False):
+			assert pages, 'no synthetic page left to serve'
+			return pages.pop(0)
+
+		service._get_all_trees = _get_all_trees  # type: ignore[method-assign]
+		return service
+
+	return make
+
+
+@pytest.fixture(scope='function')
+def synthetic_tree(dom_service):
+	"""Factory for the enhanced DOM tree of `make_synthetic_page(num_nodes, **page_kwargs)`"""
+
+	def build(num_nodes: int = 2_000, **page_kwargs) -> EnhancedDOMTreeNode:
+		root, _ = dom_service().build_enhanced_tree(make_synthetic_page(num_nodes, **page_kwargs), 'target')
+		return root
+
+	return build
+
+
+@pytest.fixture(scope='function')
+def synthetic_state(synthetic_tree):
+	"""Factory for the serialized DOM state of a synthetic page, diffed against `previous` if given"""
+
+	def serialize(num_nodes: int = 2_000, previous: SerializedDOMState | None = None, **page_kwargs) -> SerializedDOMState:
+		state, _ = DOMTreeSerializer(synthetic_tree(num_nodes, **page_kwargs), previous).serialize_accessible_elements()
+		return state
+
+	return serialize
@@ -0,0 +1,129 @@
+"""
+Tests for the page metadata probe shared by the DOM service, the page info and the screenshot highlighting during a
+browser state request.
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.page_probe import PageProbe
+from browser_use.browser.python_highlights import create_highlighted_screenshot_async
+from browser_use.browser.session import CDPSession
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.dom.service import DomService
+
+LAYOUT_METRICS = {
+	'layoutViewport': {'pageX': 0, 'pageY': 300, 'clientWidth': 1280, 'clientHeight': 720},
+	'visualViewport': {'clientWidth': 2560, 'clientHeight': 1440, 'pageX': 0, 'pageY': 300},
+	'cssVisualViewport': {'clientWidth': 1280, 'clientHeight': 720, 'pageX': 0, 'pageY': 300},
+	'cssLayoutViewport': {'clientWidth': 1280, 'clientHeight': 720, 'pageX': 0, 'pageY': 300},
+	'contentSize': {'width': 2560, 'height': 8000},
+}
+
+
+class FakeCDPClient(CDPClient):
+	"""Answers Runtime.evaluate and Page.getLayoutMetrics, counting the commands sent."""
+
+	def __init__(self):
+		self.calls: list[str] = []
+		self.evaluate_fails = False
+		self.send = SimpleNamespace(
+			Runtime=SimpleNamespace(evaluate=self._evaluate),
+			Page=SimpleNamespace(getLayoutMetrics=self._get_layout_metrics),
+		)
+
+	async def _evaluate(self, params=None, session_id=None):
+		self.calls.append('Runtime.evaluate')
+		await asyncio.sleep(0)
+		if self.evaluate_fails:
+			raise RuntimeError('Execution context was destroyed')
+		value = {
+			'readyState': 'complete',
+			'iframeScrollPositions': {'0': {'scrollTop': 40, 'scrollLeft': 0}},
+		}
+		return {'result': {'type': 'object', 'value': value}}
+
+	async def _get_layout_metrics(self, session_id=None):
+		self.calls.append('Page.getLayoutMetrics')
+		await asyncio.sleep(0)
+		return LAYOUT_METRICS
+
+
+@pytest.fixture
+def browser_session():
+	client = FakeCDPClient()
+	session = BrowserSession(cdp_url='ws://root', browser_profile=BrowserProfile())
+	session._cdp_client_root = client  # type: ignore[assignment]
+	session.agent_focus = CDPSession(cdp_client=client, target_id='page', session_id='page-session')  # type: ignore[arg-type]
+	session._cdp_session_pool['page'] = session.agent_focus
+	return session, client
+
+
+async def test_probe_reads_everything_in_one_evaluate_and_one_layout_metrics(browser_session):
+	session, client = browser_session
+	probe = await session.get_page_probe()
+	assert sorted(client.calls) == ['Page.getLayoutMetrics', 'Runtime.evaluate']
+	assert probe.ready_state == 'complete'
+	assert probe.iframe_scroll_positions == {'0': {'scrollTop': 40, 'scrollLeft': 0}}
+	assert probe.device_pixel_ratio == 2.0
+	assert probe.viewport_offset == (0, 300)
+
+	page_info = probe.page_info()
+	assert (page_info.viewport_width, page_info.viewport_height) == (1280, 720)
+	assert (page_info.page_width, page_info.page_height) == (1280, 4000)
+	assert (page_info.pixels_above, page_info.pixels_below) == (300, 4000 - 720 - 300)
+
+
+async def test_a_failing_script_still_gives_the_layout(browser_session):
+	session, client = browser_session
+	client.evaluate_fails = True
+	probe = await session.get_page_probe()
+	assert probe.ready_state is None and probe.iframe_scroll_positions == {}
+	assert probe.device_pixel_ratio == 2.0
+
+
+async def test_consumers_share_one_probe_while_sharing(browser_session):
+	session, client = browser_session
+	dom_service = DomService(session, logger=logging.getLogger('test_browser_page_probe'))
+	watchdog = DOMWatchdog(browser_session=session, event_bus=session.event_bus)
+
+	session.start_page_probe_sharing()
+	ratio, page_info, probe = await asyncio.gather(
+		dom_service._get_viewport_ratio('page'), watchdog._get_page_info(), session.get_page_probe()
+	)
+	session.stop_page_probe_sharing()
+
+	assert ratio == 2.0 and page_info == probe.page_info()
+	assert client.calls.count('Page.getLayoutMetrics') == 1
+	assert client.calls.count('Runtime.evaluate') == 1
+
+	await session.get_page_probe()
+	assert client.calls.count('Page.getLayoutMetrics') == 2
+
+
+async def test_a_timed_out_caller_does_not_cancel_the_shared_probe(browser_session):
+	session, client = browser_session
+	session.start_page_probe_sharing()
+	with pytest.raises(TimeoutError):
+		await asyncio.wait_for(session.get_page_probe(), timeout=0)
+	assert (await session.get_page_probe()).ready_state == 'complete'
+	assert client.calls.count('Page.getLayoutMetrics') == 1
+	session.stop_page_probe_sharing()
+
+
+async def test_highlighting_uses_the_probe_viewport(monkeypatch):
+	received = {}
+
+	async def create_highlighted_screenshot(screenshot_b64, selector_map, device_pixel_ratio, offset_x, offset_y, *args):
+		received.update(device_pixel_ratio=device_pixel_ratio, offset=(offset_x, offset_y))
+		return screenshot_b64
+
+	monkeypatch.setattr('browser_use.browser.python_highlights.create_highlighted_screenshot', create_highlighted_screenshot)
+	probe = PageProbe(target_id='page', layout_metrics=LAYOUT_METRICS)
+	assert await create_highlighted_screenshot_async('png', {}, page_probe=probe) == 'png'
+	assert received == {'device_pixel_ratio': 2.0, 'offset': (0, 300)}
@@ -0,0 +1,260 @@
+"""
+Tests for the page settle detection behind DOMWatchdog._wait_for_stable_network().
+
+Instead of always sleeping the page load times, the wait follows requests in flight and frame lifecycle events and
+returns as soon as the page settled, at most after the maximum wait.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.page_settle import PageSettleTracker
+from browser_use.browser.session import CDPSession
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+
+SESSION_ID = 'page-session'
+
+
+class FakeCDPClient(CDPClient):
+	"""Records registered event handlers and answers the commands of the settle detection."""
+
+	def __init__(self):
+		self.calls: list[str] = []
+		self.handlers: dict[str, object] = {}
+		self.dom_quiet_results: list[bool | Exception] = []
+		self.register = SimpleNamespace(
+			Network=SimpleNamespace(
+				**{name: self._registrar(f'Network.{name}') for name in ('requestWillBeSent', 'loadingFinished', 'loadingFailed')}
+			),
+			Page=SimpleNamespace(lifecycleEvent=self._registrar('Page.lifecycleEvent')),
+		)
+		self.send = SimpleNamespace(
+			Network=SimpleNamespace(enable=self._command('Network.enable')),
+			Page=SimpleNamespace(setLifecycleEventsEnabled=self._command('Page.setLifecycleEventsEnabled')),
+			Runtime=SimpleNamespace(evaluate=self._evaluate),
+		)
+
+	def _registrar(self, method: str):
+		def register(callback):
+			self.handlers[method] = callback
+
+		return register
+
+	def _command(self, method: str):
+		async def send(params=None, session_id=None):
+			self.calls.append(method)
+			return {}
+
+		return send
+
+	async def _evaluate(self, params=None, session_id=None):
+		self.calls.append('Runtime.evaluate')
+		await asyncio.sleep(0)
+		result = self.dom_quiet_results.pop(0) if self.dom_quiet_results else True
+		if isinstance(result, Exception):
+			raise result
+		return {'result': {'type': 'boolean', 'value': result}}
+
+	def emit(self, method: str, event: dict) -> None:
+		self.handlers[method](event, SESSION_ID)  # type: ignore[operator]
+
+
+def _request(request_id: str, url: str = 'https://example.com/api', type: str = 'XHR') -> dict:
+	return {'requestId': request_id, 'type': type, 'request': {'url': url}}
+
+
+@pytest.fixture
+def page():
+	client = FakeCDPClient()
+	cdp_session = CDPSession(cdp_client=client, target_id='page', session_id=SESSION_ID)  # type: ignore[arg-type]
+	return client, cdp_session
+
+
+async def test_an_idle_page_settles_without_sleeping_the_maximum(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+
+	for _ in range(2):
+		result = await tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0.05, max_wait=2.0)
+		assert not result.timed_out
+		assert result.waited < 0.5
+	assert client.calls.count('Network.enable') == 1
+	assert client.calls.count('Page.setLifecycleEventsEnabled') == 1
+
+
+async def test_requests_in_flight_keep_the_page_from_settling(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+
+	client.emit('Network.requestWillBeSent', _request('1'))
+	client.emit('Network.requestWillBeSent', _request('2'))
+	wait = asyncio.create_task(tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0, max_wait=2.0))
+	await asyncio.sleep(0.1)
+	client.emit('Network.loadingFinished', {'requestId': '1'})
+	await asyncio.sleep(0.1)
+	assert not wait.done()
+	client.emit('Network.loadingFailed', {'requestId': '2'})
+
+	result = await wait
+	assert result.network_idle and result.in_flight_requests == 0
+	assert 0.25 <= result.waited < 1.0
+
+
+async def test_a_page_idle_before_the_wait_still_gets_the_idle_time(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+	tracker._pages[SESSION_ID].last_activity -= 60  # nothing happened on the page for a minute
+
+	# the action before the wait sets off a request a little later
+	wait = asyncio.create_task(tracker.wait_until_settled(cdp_session, network_idle_time=0.2, dom_quiet_time=0, max_wait=2.0))
+	await asyncio.sleep(0.1)
+	assert not wait.done()
+	client.emit('Network.requestWillBeSent', _request('1'))
+	await asyncio.sleep(0.2)
+	assert not wait.done()
+	client.emit('Network.loadingFinished', {'requestId': '1'})
+
+	result = await wait
+	assert result.network_idle and 0.5 <= result.waited < 1.0
+
+
+async def test_frames_loading_keep_the_page_from_settling(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+
+	client.emit('Page.lifecycleEvent', {'frameId': 'main', 'loaderId': 'l', 'name': 'init', 'timestamp': 0})
+	wait = asyncio.create_task(tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0, max_wait=2.0))
+	await asyncio.sleep(0.1)
+	client.emit('Page.lifecycleEvent', {'frameId': 'main', 'loaderId': 'l', 'name': 'DOMContentLoaded', 'timestamp': 0})
+	assert not wait.done()
+	client.emit('Page.lifecycleEvent', {'frameId': 'main', 'loaderId': 'l', 'name': 'load', 'timestamp': 0})
+
+	result = await wait
+	assert result.network_idle and 0.15 <= result.waited < 1.0
+
+
+@pytest.mark.parametrize(
+	'request_event',
+	[
+		_request('ws', 'wss://example.com/socket', type='WebSocket'),
+		_request('sse', 'https://example.com/events', type='EventSource'),
+		_request('ga', 'https://www.google-analytics.com/g/collect?v=2'),
+		_request('img', 'data:image/png;base64,iVBORw0KGgo=', type='Image'),
+	],
+)
+async def test_streaming_and_analytics_requests_are_ignored(page, request_event):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+
+	client.emit('Network.requestWillBeSent', request_event)
+	result = await tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0, max_wait=2.0)
+	assert result.network_idle and result.waited < 0.5
+
+
+async def test_long_polling_requests_stop_counting(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker(long_poll_seconds=0.2)
+	await tracker.watch(cdp_session)
+
+	client.emit('Network.requestWillBeSent', _request('poll', 'https://example.com/updates?wait=30'))
+	result = await tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0, max_wait=2.0)
+	assert result.network_idle and result.in_flight_requests == 0
+	assert 0.2 <= result.waited < 1.0
+
+
+async def test_requests_that_never_finish_are_dropped(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker(long_poll_seconds=0.1)
+	await tracker.watch(cdp_session)
+
+	for i in range(100):
+		client.emit('Network.requestWillBeSent', _request(f'poll-{i}'))
+	await asyncio.sleep(0.15)
+	client.emit('Network.requestWillBeSent', _request('poll-100'))
+	assert list(tracker._pages[SESSION_ID].in_flight) == ['poll-100']
+
+
+async def test_sessions_leaving_the_pool_are_forgotten(watchdog):
+	dom_watchdog, client = watchdog
+	await dom_watchdog._wait_for_stable_network()
+	tracker = dom_watchdog._page_settle
+	assert tracker is not None
+	await tracker.watch(CDPSession(cdp_client=client, target_id='popup', session_id='popup-session'))  # type: ignore[arg-type]
+	assert set(tracker._pages) == {SESSION_ID, 'popup-session'}
+
+	# the popup session is not in the session pool (anymore), only the focused page is kept
+	await dom_watchdog._wait_for_stable_network()
+	assert set(tracker._pages) == {SESSION_ID}
+
+
+async def test_the_wait_is_capped_at_the_maximum(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+
+	client.emit('Network.requestWillBeSent', _request('slow'))
+	client.dom_quiet_results = [False]
+	result = await tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0.05, max_wait=0.2)
+	assert result.timed_out
+	assert (result.network_idle, result.dom_quiet, result.in_flight_requests) == (False, False, 1)
+	assert 0.2 <= result.waited < 0.5
+
+
+async def test_the_dom_check_survives_a_navigation(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+
+	client.dom_quiet_results = [RuntimeError('Inspected target navigated or closed'), True]
+	result = await tracker.wait_until_settled(cdp_session, network_idle_time=0, dom_quiet_time=0.05, max_wait=2.0)
+	assert result.dom_quiet
+	assert client.calls.count('Runtime.evaluate') == 2
+
+
+async def test_events_of_other_sessions_are_ignored(page):
+	client, cdp_session = page
+	tracker = PageSettleTracker()
+	await tracker.watch(cdp_session)
+
+	tracker.on_request_will_be_sent(_request('other'), 'other-session')
+	result = await tracker.wait_until_settled(cdp_session, network_idle_time=0.05, dom_quiet_time=0, max_wait=2.0)
+	assert result.network_idle and result.waited < 0.5
+
+
+@pytest.fixture
+def watchdog(page):
+	client, cdp_session = page
+	session = BrowserSession(
+		cdp_url='ws://root',
+		browser_profile=BrowserProfile(minimum_wait_page_load_time=0.05, wait_for_network_idle_page_load_time=0.05),
+	)
+	session.agent_focus = cdp_session
+	return DOMWatchdog(browser_session=session, event_bus=session.event_bus), client
+
+
+async def test_the_watchdog_reports_how_long_it_waited(watchdog):
+	dom_watchdog, client = watchdog
+	result = await dom_watchdog._wait_for_stable_network()
+	assert result is not None and not result.timed_out
+	assert 'Network.enable' in client.calls
+
+
+async def test_the_watchdog_falls_back_to_fixed_waits(watchdog):
+	dom_watchdog, client = watchdog
+	dom_watchdog.browser_session.browser_profile.page_settle_detection = False
+	assert await dom_watchdog._wait_for_stable_network() is None
+	assert client.calls == []
+
+	async def enable_fails(params=None, session_id=None):
+		raise RuntimeError("'Network.enable' wasn't found")
+
+	dom_watchdog.browser_session.browser_profile.page_settle_detection = True
+	client.send.Network.enable = enable_fails
+	assert await dom_watchdog._wait_for_stable_network() is None
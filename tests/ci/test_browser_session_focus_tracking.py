@@ -0,0 +1,157 @@
+"""
+Tests for the focus tracking that skips redundant Target.activateTarget / Runtime.runIfWaitingForDebugger commands in
+BrowserSession.get_or_create_cdp_session(focus=True), and for the count of CDP commands sent.
+"""
+
+import pytest
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser import session as session_module
+from browser_use.browser.session import CDPSession
+
+
+class FakeCDPClient(CDPClient):
+	"""Answers every CDP command with an empty result (or a session / target info), recording the commands sent."""
+
+	def __init__(self, url: str = 'ws://root', additional_headers=None):
+		self.url = url
+		self.msg_id = 0
+		self.calls: list[str] = []
+		self.send = _Send(self)
+
+	async def start(self):
+		pass
+
+	async def stop(self):
+		pass
+
+
+class _Send:
+	def __init__(self, client: FakeCDPClient):
+		self._client = client
+
+	def __getattr__(self, domain: str):
+		return _Domain(self._client, domain)
+
+
+class _Domain:
+	def __init__(self, client: FakeCDPClient, domain: str):
+		self._client = client
+		self._domain = domain
+
+	def __getattr__(self, method: str):
+		async def send(params=None, session_id=None):
+			self._client.msg_id += 1
+			self._client.calls.append(f'{self._domain}.{method}')
+			if method == 'attachToTarget':
+				return {'sessionId': f'session-{params["targetId"]}'}
+			if method == 'getTargetInfo':
+				return {'targetInfo': {'targetId': params['targetId'], 'type': 'page', 'url': 'about:blank', 'title': ''}}
+			return {}
+
+		return send
+
+
+def _page(target_id: str) -> dict:
+	return {'targetId': target_id, 'type': 'page', 'url': 'about:blank', 'title': '', 'attached': False, 'canAccessOpener': False}
+
+
+@pytest.fixture
+def browser_session():
+	client = FakeCDPClient()
+	session = BrowserSession(cdp_url='ws://root', browser_profile=BrowserProfile())
+	session._cdp_client_root = client  # type: ignore[assignment]
+	session.agent_focus = CDPSession(cdp_client=client, target_id='a', session_id='session-a')  # type: ignore[arg-type]
+	session._cdp_session_pool['a'] = session.agent_focus
+	session._tab_registry.discovering = True
+	return session, client
+
+
+async def test_focusing_the_active_target_sends_nothing(browser_session):
+	session, client = browser_session
+	for _ in range(5):
+		await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 1
+	assert client.calls.count('Runtime.runIfWaitingForDebugger') == 1
+
+
+async def test_focus_changes_activate_the_target(browser_session):
+	session, client = browser_session
+	await session.get_or_create_cdp_session('a')
+	await session.get_or_create_cdp_session('b')
+	await session.get_or_create_cdp_session('b')
+	await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 3
+	# every session is released from waiting for the debugger once
+	assert client.calls.count('Runtime.runIfWaitingForDebugger') == 2
+
+	# looking at another target without focusing it keeps the foreground where it is
+	await session.get_or_create_cdp_session('b', focus=False)
+	await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 3
+
+
+@pytest.mark.parametrize(
+	'method, event',
+	[
+		('on_target_created', {'targetInfo': _page('popup')}),
+		('on_target_destroyed', {'targetId': 'a'}),
+	],
+)
+async def test_target_events_reset_the_active_target(browser_session, method, event):
+	session, client = browser_session
+	await session.get_or_create_cdp_session('a')
+
+	getattr(session._tab_registry, method)(event)
+	await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 2
+
+
+async def test_new_iframe_targets_keep_the_active_target(browser_session):
+	session, client = browser_session
+	await session.get_or_create_cdp_session('a')
+
+	session._tab_registry.on_target_created({'targetInfo': {**_page('frame'), 'type': 'iframe'}})  # type: ignore[arg-type]
+	await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 1
+
+
+async def test_forced_activation_is_never_skipped(browser_session):
+	session, client = browser_session
+	await session.get_or_create_cdp_session('a')
+
+	# e.g. refocusing after a click that opened a popup which is not reported yet
+	await session._activate_target(session._cdp_session_pool['a'], force=True)
+	assert client.calls.count('Target.activateTarget') == 2
+	assert client.calls.count('Runtime.runIfWaitingForDebugger') == 1
+	assert session._tab_registry.active_target_id == 'a'
+
+
+async def test_without_target_discovery_every_focus_activates(browser_session):
+	session, client = browser_session
+	session._tab_registry.discovering = False
+	for _ in range(3):
+		await session.get_or_create_cdp_session('a')
+	assert client.calls.count('Target.activateTarget') == 3
+
+
+async def test_commands_are_counted_over_all_connections(browser_session, monkeypatch):
+	session, client = browser_session
+	sockets: list[FakeCDPClient] = []
+
+	def make_client(url, additional_headers=None):
+		sockets.append(FakeCDPClient(url, additional_headers))
+		return sockets[-1]
+
+	monkeypatch.setattr(session_module, 'CDPClient', make_client)
+	session.browser_profile.cdp_session_pool_size = 1
+
+	await session.get_or_create_cdp_session('a')
+	assert session.cdp_commands_sent == len(client.calls) == 2
+
+	await session.get_or_create_cdp_session('b', focus=False, new_socket=True)
+	await session.get_or_create_cdp_session('c', focus=False, new_socket=True)
+	await session._evict_cdp_sessions()
+	assert 'b' not in session._cdp_session_pool
+	assert session.cdp_commands_sent == len(client.calls) + len(sockets[0].calls) + len(sockets[1].calls)
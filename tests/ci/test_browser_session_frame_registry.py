@@ -0,0 +1,168 @@
+"""
+Tests for the frame registry behind BrowserSession.get_all_frames().
+
+The frame hierarchy is built once and then kept current from CDP frame / target events instead of being rebuilt
+from every target on each call.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakeCDPClient:
+	"""Records registered event handlers and answers the CDP calls made by get_all_frames()."""
+
+	def __init__(self, frame_trees: dict[str, dict]):
+		self.frame_trees = frame_trees  # session_id -> Page.getFrameTree result
+		self.handlers: dict[str, object] = {}
+		self.calls: list[str] = []
+		self.register = SimpleNamespace(
+			Page=SimpleNamespace(
+				**{name: self._registrar(f'Page.{name}') for name in ('frameAttached', 'frameDetached', 'frameNavigated')}
+			),
+			Target=SimpleNamespace(
+				**{name: self._registrar(f'Target.{name}') for name in ('attachedToTarget', 'detachedFromTarget')}
+			),
+		)
+		self.send = SimpleNamespace(
+			Page=SimpleNamespace(getFrameTree=self._get_frame_tree),
+			DOM=SimpleNamespace(enable=self._noop, getFrameOwner=self._get_frame_owner),
+		)
+
+	def _registrar(self, method: str):
+		def register(callback):
+			self.handlers[method] = callback
+
+		return register
+
+	def emit(self, method: str, event: dict, session_id: str | None = None) -> None:
+		self.handlers[method](event, session_id)  # type: ignore[operator]
+
+	async def _get_frame_tree(self, session_id=None):
+		self.calls.append('Page.getFrameTree')
+		return {'frameTree': self.frame_trees[session_id]}
+
+	async def _noop(self, *args, **kwargs):
+		return {}
+
+	async def _get_frame_owner(self, params, session_id=None):
+		self.calls.append('DOM.getFrameOwner')
+		return {'backendNodeId': len(params['frameId']), 'nodeId': 1}
+
+
+def _frame(frame_id: str, url: str, parent_id: str | None = None, children: list[dict] | None = None) -> dict:
+	frame = {'id': frame_id, 'url': url, 'loaderId': 'loader', 'crossOriginIsolatedContextType': 'NotIsolated'}
+	if parent_id:
+		frame['parentId'] = parent_id
+	return {'frame': frame, 'childFrames': children or []}
+
+
+@pytest.fixture
+def browser_session(monkeypatch):
+	client = FakeCDPClient(
+		{
+			'page-session': _frame(
+				'main',
+				'https://example.com/',
+				children=[
+					_frame('child', 'https://example.com/a', 'main', [_frame('grandchild', 'https://example.com/b', 'child')])
+				],
+			)
+		}
+	)
+	cdp_session = SimpleNamespace(target_id='page', session_id='page-session', cdp_client=client)
+	targets = [{'targetId': 'page', 'type': 'page', 'url': 'https://example.com/', 'title': ''}]
+
+	async def _cdp_get_all_pages(self, **kwargs):
+		client.calls.append('Target.getTargets')
+		return targets
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		return cdp_session
+
+	monkeypatch.setattr(BrowserSession, '_cdp_get_all_pages', _cdp_get_all_pages)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+
+	session = BrowserSession(browser_profile=BrowserProfile(cross_origin_iframes=True))
+	session._cdp_client_root = client  # type: ignore[assignment]
+	session._frame_registry.register(client, root=True)  # type: ignore[arg-type]
+	return session, client
+
+
+async def test_frames_are_built_once_and_served_from_the_registry(browser_session):
+	session, client = browser_session
+
+	all_frames, target_sessions = await session.get_all_frames()
+	assert set(all_frames) == {'main', 'child', 'grandchild'}
+	assert target_sessions == {'page': 'page-session'}
+	assert all_frames['child']['parentTargetId'] == 'page'
+	calls = list(client.calls)
+
+	assert await session.get_all_frames() == (all_frames, target_sessions)
+	assert await session.find_frame_target('grandchild') == all_frames['grandchild']
+	assert client.calls == calls
+	assert session._frame_registry.builds == 1
+	assert session._frame_registry.hits == 2
+
+
+async def test_frame_events_keep_the_registry_current(browser_session):
+	session, client = browser_session
+	await session.get_all_frames()
+
+	# Child navigations are applied in place
+	client.emit('Page.frameNavigated', {'frame': {**_frame('child', 'https://example.com/c', 'main')['frame']}}, 'page-session')
+	all_frames, _ = await session.get_all_frames()
+	assert all_frames['child']['url'] == 'https://example.com/c'
+
+	# Detaching a frame removes it with its descendants
+	client.emit('Page.frameDetached', {'frameId': 'child', 'reason': 'remove'}, 'page-session')
+	all_frames, _ = await session.get_all_frames()
+	assert set(all_frames) == {'main'}
+	assert all_frames['main']['childFrameIds'] == []
+	assert session._frame_registry.builds == 1
+
+	# A new frame needs its owner node, so it triggers a rebuild
+	client.emit('Page.frameAttached', {'frameId': 'child', 'parentFrameId': 'main'}, 'page-session')
+	all_frames, _ = await session.get_all_frames()
+	assert set(all_frames) == {'main', 'child', 'grandchild'}
+	assert session._frame_registry.builds == 2
+
+
+@pytest.mark.parametrize(
+	'method, event',
+	[
+		('Page.frameNavigated', {'frame': _frame('main', 'https://example.org/')['frame']}),
+		('Page.frameDetached', {'frameId': 'child', 'reason': 'swap'}),
+		('Target.attachedToTarget', {'sessionId': 'other', 'targetInfo': {}, 'waitingForDebugger': False}),
+		('Target.detachedFromTarget', {'sessionId': 'other'}),
+	],
+)
+async def test_target_changes_rebuild_the_registry(browser_session, method, event):
+	session, client = browser_session
+	await session.get_all_frames()
+
+	client.emit(method, event)
+	await session.get_all_frames()
+	assert session._frame_registry.builds == 2
+
+
+async def test_build_racing_an_event_is_not_cached(browser_session):
+	session, client = browser_session
+	get_frame_tree = client.send.Page.getFrameTree
+
+	async def get_frame_tree_with_event(session_id=None):
+		client.emit('Page.frameNavigated', {'frame': _frame('child', 'https://example.com/d', 'main')['frame']})
+		return await get_frame_tree(session_id=session_id)
+
+	client.send.Page.getFrameTree = get_frame_tree_with_event
+	await session.get_all_frames()
+	assert session._frame_registry.all_frames is None
+
+	client.send.Page.getFrameTree = get_frame_tree
+	await session.get_all_frames()
+	await session.get_all_frames()
+	assert session._frame_registry.builds == 2
+	assert session._frame_registry.hits == 1
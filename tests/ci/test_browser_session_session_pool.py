@@ -0,0 +1,188 @@
+"""
+Tests for the CDP session pool behind BrowserSession.get_or_create_cdp_session().
+
+Target sessions are multiplexed over the root connection by default, and between steps the pool detaches sessions of
+closed targets, idle sessions and the least recently used ones beyond its size.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser import session as session_module
+from browser_use.browser.session import CDPSession
+from browser_use.browser.watchdogs.crash_watchdog import CrashWatchdog
+
+
+class FakeCDPClient(CDPClient):
+	"""Answers every CDP command with an empty result (or a session / target info), recording the commands sent."""
+
+	def __init__(self, url: str = 'ws://root', additional_headers=None):
+		self.url = url
+		self.msg_id = 0
+		self.calls: list[tuple[str, dict | None, str | None]] = []
+		self.stopped = False
+		self.handlers: dict[str, object] = {}
+		self.send = _Send(self)
+		self.register = SimpleNamespace(Target=SimpleNamespace(targetCrashed=self._registrar('Target.targetCrashed')))
+
+	def _registrar(self, method: str):
+		def register(callback):
+			self.handlers[method] = callback
+
+		return register
+
+	async def start(self):
+		pass
+
+	async def stop(self):
+		self.stopped = True
+
+
+class _Send:
+	def __init__(self, client: FakeCDPClient):
+		self._client = client
+
+	def __getattr__(self, domain: str):
+		return _Domain(self._client, domain)
+
+
+class _Domain:
+	def __init__(self, client: FakeCDPClient, domain: str):
+		self._client = client
+		self._domain = domain
+
+	def __getattr__(self, method: str):
+		async def send(params=None, session_id=None):
+			self._client.calls.append((f'{self._domain}.{method}', params, session_id))
+			if method == 'attachToTarget':
+				return {'sessionId': f'session-{params["targetId"]}'}
+			if method == 'getTargetInfo':
+				return {'targetInfo': {'targetId': params['targetId'], 'type': 'page', 'url': 'about:blank', 'title': ''}}
+			if method == 'getTargets':
+				return {'targetInfos': []}
+			return {}
+
+		return send
+
+
+def _methods(client: FakeCDPClient, method: str) -> list:
+	return [(params, session_id) for name, params, session_id in client.calls if name == method]
+
+
+@pytest.fixture
+def make_session():
+	def make(**profile_kwargs) -> tuple[BrowserSession, FakeCDPClient]:
+		client = FakeCDPClient()
+		session = BrowserSession(cdp_url='ws://root', browser_profile=BrowserProfile(**profile_kwargs))
+		session._cdp_client_root = client  # type: ignore[assignment]
+		session.agent_focus = CDPSession(cdp_client=client, target_id='focus', session_id='session-focus')  # type: ignore[arg-type]
+		return session, client
+
+	return make
+
+
+async def test_sessions_share_the_root_connection(make_session):
+	session, client = make_session()
+
+	iframe_session = await session.get_or_create_cdp_session('iframe', focus=False)
+	assert iframe_session.cdp_client is client and not iframe_session.owns_cdp_client
+	assert await session.get_or_create_cdp_session('iframe', focus=False) is iframe_session
+	assert len(_methods(client, 'Target.attachToTarget')) == 1
+
+	stats = session.cdp_session_pool_stats
+	assert (stats.created, stats.reused, stats.attached_sessions, stats.open_sockets) == (1, 1, 1, 1)
+
+
+async def test_least_recently_used_sessions_are_detached(make_session):
+	session, client = make_session(cdp_session_pool_size=3)
+	for target_id in ('a', 'b', 'c'):
+		await session.get_or_create_cdp_session(target_id, focus=False)
+	await session.get_or_create_cdp_session('a', focus=False)
+	session._frame_registry.all_frames = {}
+
+	await session.get_or_create_cdp_session('d', focus=False)
+	await session._evict_cdp_sessions()
+	assert set(session._cdp_session_pool) == {'a', 'c', 'd'}
+	assert _methods(client, 'Target.detachFromTarget') == [({'sessionId': 'session-b'}, None)]
+	assert session._frame_registry.all_frames is None
+	assert session.cdp_session_pool_stats.evicted == 1
+
+
+async def test_idle_and_closed_target_sessions_are_detached(make_session):
+	session, client = make_session(cdp_session_idle_timeout=60)
+	for target_id in ('a', 'b', 'c'):
+		await session.get_or_create_cdp_session(target_id, focus=False)
+	session._cdp_session_pool['a'].last_used -= 120
+	session._tab_registry.targets = {target_id: {} for target_id in ('focus', 'a', 'c', 'd')}  # type: ignore[misc]
+
+	await session.get_or_create_cdp_session('d', focus=False)
+	await session._evict_cdp_sessions()
+	assert set(session._cdp_session_pool) == {'c', 'd'}
+	assert session.cdp_session_pool_stats.evicted == 2
+
+
+async def test_the_focused_session_is_never_detached(make_session):
+	session, client = make_session(cdp_session_pool_size=1)
+	await session.get_or_create_cdp_session('a', focus=True)
+	await session.get_or_create_cdp_session('b', focus=False)
+	await session._evict_cdp_sessions()
+	assert session.agent_focus and session.agent_focus.target_id == 'a'
+	assert set(session._cdp_session_pool) == {'a'}
+
+
+async def test_the_pool_is_bounded_between_steps(make_session, monkeypatch):
+	session, client = make_session(cdp_session_pool_size=1)
+	await session.get_or_create_cdp_session('old', focus=False)
+	session._cdp_session_pool['old'].last_used -= 1
+
+	async def event_result(**kwargs):
+		# e.g. the sessions of OOPIFs attached while building the state, all still in use
+		for target_id in ('frame-1', 'frame-2'):
+			await session.get_or_create_cdp_session(target_id, focus=False)
+		assert not _methods(client, 'Target.detachFromTarget')
+		return SimpleNamespace(dom_state=object())
+
+	monkeypatch.setattr(session.event_bus, 'dispatch', lambda event: SimpleNamespace(event_result=event_result))
+	await session.get_browser_state_summary()
+	assert set(session._cdp_session_pool) == {'frame-1', 'frame-2'}
+	assert _methods(client, 'Target.detachFromTarget') == [({'sessionId': 'session-old'}, None)]
+
+
+async def test_dedicated_sockets_are_closed_on_eviction(make_session, monkeypatch):
+	sockets: list[FakeCDPClient] = []
+
+	def make_client(url, additional_headers=None):
+		sockets.append(FakeCDPClient(url, additional_headers))
+		return sockets[-1]
+
+	monkeypatch.setattr(session_module, 'CDPClient', make_client)
+	session, client = make_session(dedicated_cdp_sockets=True, cdp_session_pool_size=1)
+
+	await session.get_or_create_cdp_session('a', focus=False)
+	assert session.cdp_session_pool_stats.open_sockets == 2
+
+	await session.get_or_create_cdp_session('b', focus=False)
+	await session._evict_cdp_sessions()
+	assert sockets[0].stopped and not sockets[1].stopped
+	assert session.cdp_session_pool_stats.open_sockets == 2
+	assert not _methods(client, 'Target.detachFromTarget')
+
+
+async def test_crashes_are_handled_for_the_target_that_crashed(make_session, monkeypatch):
+	session, client = make_session()
+	dispatched = []
+	monkeypatch.setattr(session.event_bus, 'dispatch', dispatched.append)
+	crash_watchdog = CrashWatchdog(browser_session=session, event_bus=session.event_bus)
+	await crash_watchdog.attach_to_target('a')
+	await crash_watchdog.attach_to_target('b')
+
+	# both tabs share the root connection, the one handler there tells the targets apart
+	client.handlers['Target.targetCrashed']({'targetId': 'a', 'status': 'crashed', 'errorCode': 139}, None)  # type: ignore[operator]
+	await asyncio.gather(*crash_watchdog._cdp_event_tasks)
+
+	assert set(session._cdp_session_pool) == {'b'}
+	assert [event.details['target_id'] for event in dispatched] == ['a']
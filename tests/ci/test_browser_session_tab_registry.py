@@ -0,0 +1,148 @@
+"""
+Tests for the tab registry behind BrowserSession.get_tabs().
+
+The targets are fetched once with Target.getTargets and then kept current from CDP target discovery events instead of
+asking for the info of every tab on each call.
+"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakeCDPClient:
+	"""Records registered event handlers and answers Target.getTargets from a list of target infos."""
+
+	def __init__(self, targets: list[dict]):
+		self.targets = targets
+		self.handlers: dict[str, object] = {}
+		self.calls: list[str] = []
+		self.register = SimpleNamespace(
+			Target=SimpleNamespace(
+				**{name: self._registrar(f'Target.{name}') for name in ('targetCreated', 'targetInfoChanged', 'targetDestroyed')}
+			),
+		)
+		self.send = SimpleNamespace(Target=SimpleNamespace(getTargets=self._get_targets))
+
+	def _registrar(self, method: str):
+		def register(callback):
+			self.handlers[method] = callback
+
+		return register
+
+	def emit(self, method: str, event: dict) -> None:
+		self.handlers[method](event, None)  # type: ignore[operator]
+
+	async def _get_targets(self, params=None, session_id=None):
+		self.calls.append('Target.getTargets')
+		return {'targetInfos': [dict(target) for target in self.targets]}
+
+
+def _target(target_id: str, url: str, title: str = '', type: str = 'page', opener_id: str | None = None) -> dict:
+	target = {'targetId': target_id, 'type': type, 'url': url, 'title': title, 'attached': True, 'canAccessOpener': False}
+	if opener_id:
+		target['openerId'] = opener_id
+	return target
+
+
+@pytest.fixture
+def browser_session():
+	client = FakeCDPClient(
+		[
+			_target('tab-0001', 'https://example.com/', 'Example'),
+			_target('tab-0002', 'chrome://newtab/'),
+			_target('frame-0003', 'https://ads.example.net/', type='iframe'),
+			_target('worker-0004', 'https://example.com/sw.js', type='service_worker'),
+		]
+	)
+	session = BrowserSession(browser_profile=BrowserProfile())
+	session._cdp_client_root = client  # type: ignore[assignment]
+	session._tab_registry.register(client)  # type: ignore[arg-type]
+	session._tab_registry.discovering = True
+	return session, client
+
+
+async def test_tabs_are_fetched_once_and_served_from_the_registry(browser_session):
+	session, client = browser_session
+
+	tabs = await session.get_tabs()
+	assert [(tab.target_id, tab.url, tab.title) for tab in tabs] == [
+		('tab-0001', 'https://example.com/', 'Example'),
+		('tab-0002', 'chrome://newtab/', 'ignore this tab and do not use it'),
+	]
+	assert await session.get_tabs() == tabs
+	assert client.calls == ['Target.getTargets']
+	assert session._tab_registry.builds == 1
+	assert session._tab_registry.hits == 1
+
+
+async def test_target_events_keep_the_registry_current(browser_session):
+	session, client = browser_session
+	await session.get_tabs()
+
+	client.emit('Target.targetCreated', {'targetInfo': _target('tab-0005', 'about:blank', opener_id='tab-0001')})
+	client.emit('Target.targetInfoChanged', {'targetInfo': _target('tab-0005', 'https://example.com/report.pdf')})
+	client.emit('Target.targetInfoChanged', {'targetInfo': _target('tab-0001', 'https://example.com/cart', 'Cart')})
+	client.emit('Target.targetDestroyed', {'targetId': 'tab-0002'})
+
+	tabs = {tab.target_id: tab for tab in await session.get_tabs()}
+	assert set(tabs) == {'tab-0001', 'tab-0005'}
+	assert tabs['tab-0001'].title == 'Cart'
+	assert tabs['tab-0005'].title == 'report.pdf'
+	assert client.calls == ['Target.getTargets']
+
+
+async def test_popups_keep_their_opener(browser_session):
+	session, client = browser_session
+	await session.get_tabs()
+
+	client.emit('Target.targetCreated', {'targetInfo': _target('tab-0005', 'https://example.com/login', opener_id='tab-0001')})
+	popup = (await session.get_tabs())[-1]
+	assert popup.parent_target_id == 'tab-0001'
+
+
+async def test_seed_racing_an_event_is_not_cached(browser_session):
+	session, client = browser_session
+	get_targets = client.send.Target.getTargets
+
+	async def get_targets_with_event(params=None, session_id=None):
+		client.emit('Target.targetInfoChanged', {'targetInfo': _target('tab-0001', 'https://example.com/', 'Loaded')})
+		return await get_targets()
+
+	client.send.Target.getTargets = get_targets_with_event
+	await session.get_tabs()
+	assert session._tab_registry.targets is None
+
+	client.send.Target.getTargets = get_targets
+	await session.get_tabs()
+	await session.get_tabs()
+	assert session._tab_registry.builds == 2
+	assert session._tab_registry.hits == 1
+
+
+async def test_without_target_discovery_tabs_are_fetched_every_time(browser_session):
+	session, client = browser_session
+	session._tab_registry.discovering = False
+
+	await session.get_tabs()
+	await session.get_tabs()
+	assert client.calls == ['Target.getTargets', 'Target.getTargets']
+
+
+async def test_check_mode_logs_mismatches(browser_session, caplog):
+	session, client = browser_session
+	session.browser_profile.tab_registry_check = True
+	await session.get_tabs()
+	await session.get_tabs()
+	assert session._tab_registry.mismatches == 0
+
+	# an event the registry never saw
+	client.targets[0]['title'] = 'Changed behind our back'
+	with caplog.at_level(logging.WARNING):
+		tabs = await session.get_tabs()
+	assert tabs[0].title == 'Example'
+	assert session._tab_registry.mismatches == 1
+	assert "0001 title: 'Example' != 'Changed behind our back'" in caplog.text
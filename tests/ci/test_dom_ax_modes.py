@@ -0,0 +1,85 @@
+"""
+Tests for the lazy / off accessibility-tree modes of DomService.
+"""
+
+import logging
+from types import SimpleNamespace
+
+from browser_use.dom.playground.compare_ax_modes import AX_TREE_MODES, selector_map_parity, with_ax_mode
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.service import DomService
+
+
+def _element(backend_node_id: int, name: str, attributes: list[str] | None = None, **extra) -> dict:
+	return {
+		'nodeId': backend_node_id,
+		'backendNodeId': backend_node_id,
+		'nodeType': 1,
+		'nodeName': name,
+		'attributes': attributes or [],
+		**extra,
+	}
+
+
+def test_ax_candidates():
+	shadow_host = _element(
+		6, 'DIV', shadowRoots=[{**_element(7, '#document-fragment'), 'nodeType': 11, 'children': [_element(8, 'INPUT')]}]
+	)
+	iframe = _element(9, 'IFRAME', contentDocument={**_element(10, '#document'), 'nodeType': 9, 'children': [_element(11, 'A')]})
+	body = _element(
+		2,
+		'BODY',
+		children=[
+			_element(3, 'DIV', ['class', 'plain']),
+			_element(4, 'DIV', ['role', 'tab']),
+			_element(5, 'SPAN', ['aria-expanded', 'false']),
+			_element(12, 'DIV', ['class', 'clickable-by-listener']),
+			shadow_host,
+			iframe,
+		],
+	)
+	dom_tree = {'root': {**_element(1, '#document'), 'nodeType': 9, 'children': [body]}}
+	snapshot = {'documents': [{'nodes': {'backendNodeId': [1, 2, 12], 'isClickable': {'index': [2]}}}], 'strings': []}
+
+	candidates = DomService._get_ax_candidate_backend_node_ids(dom_tree, snapshot)  # type: ignore[arg-type]
+	assert sorted(candidates) == [4, 5, 8, 11, 12]
+
+
+def test_lazy_mode_keeps_detection_parity_on_synthetic_pages(dom_service):
+	trees = make_synthetic_page(2_000, with_iframe=True)
+	lazy = with_ax_mode(trees, 'lazy')
+	assert lazy.ax_tree['nodes'] and len(lazy.ax_tree['nodes']) == len(trees.ax_tree['nodes'])
+
+	trees_by_mode = {mode: with_ax_mode(make_synthetic_page(2_000, with_iframe=True), mode) for mode in AX_TREE_MODES}
+	parity = selector_map_parity(dom_service(), trees_by_mode)
+	assert parity['lazy'][1:] == (0, 0)
+	assert parity['lazy'][0] == parity['full'][0] > 0
+
+
+async def test_partial_ax_tree_is_fetched_in_batches():
+	requested: list[int] = []
+
+	async def get_partial_ax_tree(params, session_id):
+		requested.append(params['backendNodeId'])
+		assert params['fetchRelatives'] is False
+		if params['backendNodeId'] == 13:
+			raise RuntimeError('No node with given id found')
+		return {'nodes': [{'nodeId': str(params['backendNodeId']), 'backendDOMNodeId': params['backendNodeId']}]}
+
+	cdp_session = SimpleNamespace(
+		session_id='session',
+		cdp_client=SimpleNamespace(send=SimpleNamespace(Accessibility=SimpleNamespace(getPartialAXTree=get_partial_ax_tree))),
+	)
+
+	async def get_or_create_cdp_session(target_id, focus):
+		return cdp_session
+
+	browser_session = SimpleNamespace(
+		logger=logging.getLogger('test_dom_ax_modes'), agent_focus=None, get_or_create_cdp_session=get_or_create_cdp_session
+	)
+	dom_service = DomService(browser_session, ax_tree_mode='lazy')  # type: ignore[arg-type]
+
+	backend_node_ids = list(range(250))
+	ax_tree = await dom_service._get_partial_ax_tree('target', backend_node_ids)
+	assert sorted(requested) == backend_node_ids
+	assert [node['backendDOMNodeId'] for node in ax_tree['nodes']] == [i for i in backend_node_ids if i != 13]
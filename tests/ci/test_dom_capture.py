@@ -0,0 +1,105 @@
+"""
+Tests for recording the CDP payloads of DOM states and replaying them without a browser.
+"""
+
+import asyncio
+import copy
+
+import pytest
+
+from browser_use.dom.capture import MAGIC, DOMCaptureRecorder, offline_dom_service, read_dom_captures
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+
+
+def _serialize(trees) -> str:
+	root, _ = offline_dom_service().build_enhanced_tree(trees, 'target')
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+	return state.llm_representation()
+
+
+def test_captures_round_trip(tmp_path):
+	path = tmp_path / 'page.domcap'
+	recorder = DOMCaptureRecorder(path)
+	recorder.write('target', make_synthetic_page(500, with_iframe=True))
+	recorder.write('other', make_synthetic_page(500, scroll_y=300))
+
+	assert recorder.steps == 2 and recorder.bytes_written == path.stat().st_size
+	assert path.read_bytes().startswith(MAGIC)
+
+	captures = list(read_dom_captures(path))
+	assert [capture.target_id for capture in captures] == ['target', 'other']
+	expected = make_synthetic_page(500, with_iframe=True)
+	assert captures[0].trees.snapshot == expected.snapshot
+	assert captures[0].trees.dom_tree == expected.dom_tree
+	assert captures[0].trees.ax_tree == expected.ax_tree
+	assert captures[0].trees.device_pixel_ratio == expected.device_pixel_ratio
+	assert captures[1].trees.snapshot == make_synthetic_page(500, scroll_y=300).snapshot
+
+
+async def test_replay_matches_live_serialization(tmp_path):
+	path = tmp_path / 'page.domcap'
+	DOMCaptureRecorder(path).write('target', make_synthetic_page(1_000, with_iframe=True))
+
+	capture = next(read_dom_captures(path))
+	root = await offline_dom_service().get_dom_tree(capture.target_id, trees=capture.trees)
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+
+	assert state.llm_representation() == _serialize(make_synthetic_page(1_000, with_iframe=True))
+
+
+async def test_dom_service_records_payloads_before_building(tmp_path, dom_service):
+	path = tmp_path / 'steps.domcap'
+	service = dom_service(
+		[make_synthetic_page(400, scroll_y=500), make_synthetic_page(400)], capture_recorder=DOMCaptureRecorder(path)
+	)
+
+	first, _, _ = await service.get_serialized_dom_tree()
+	await service.get_serialized_dom_tree(previous_cached_state=first)
+
+	captures = list(read_dom_captures(path))
+	assert len(captures) == 2
+	# building rewrites snapshot bounds in place, the recorded ones are untouched
+	assert captures[0].trees.snapshot == make_synthetic_page(400, scroll_y=500).snapshot
+	assert _serialize(captures[0].trees) == first.llm_representation()
+
+
+async def test_failed_writes_do_not_fail_the_state(tmp_path, dom_service, caplog):
+	path = tmp_path / 'not-a-directory'
+	path.write_text('')
+	recorder = DOMCaptureRecorder(path / 'steps.domcap')
+	service = dom_service([make_synthetic_page(400)], capture_recorder=recorder)
+
+	state, _, _ = await service.get_serialized_dom_tree()
+	assert state.selector_map and recorder.steps == 0
+	assert 'Failed to record DOM capture step' in caplog.text
+
+
+async def test_payloads_changing_during_the_write_are_recorded_as_they_were(tmp_path, monkeypatch):
+	path = tmp_path / 'live.domcap'
+	trees = make_synthetic_page(300)
+	expected = copy.deepcopy(trees.dom_tree)
+	to_thread = asyncio.to_thread
+
+	async def mutate_then_run(func, *args):
+		# a DOM event applied by the live mirror while the step is being written
+		trees.dom_tree['root']['children'].append({'nodeId': 100_000, 'nodeName': 'DIV'})  # type: ignore[typeddict-item]
+		return await to_thread(func, *args)
+
+	monkeypatch.setattr(asyncio, 'to_thread', mutate_then_run)
+	assert await DOMCaptureRecorder(path).record('target', trees)
+
+	assert next(read_dom_captures(path)).trees.dom_tree == expected
+
+
+def test_invalid_files_are_rejected(tmp_path):
+	path = tmp_path / 'not.domcap'
+	path.write_bytes(b'{"snapshot": {}}')
+	with pytest.raises(ValueError, match='not a DOM capture file'):
+		list(read_dom_captures(path))
+
+	path = tmp_path / 'truncated.domcap'
+	DOMCaptureRecorder(path).write('target', make_synthetic_page(200))
+	path.write_bytes(path.read_bytes()[:-10])
+	with pytest.raises(ValueError, match='truncated'):
+		list(read_dom_captures(path))
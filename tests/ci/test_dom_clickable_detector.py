@@ -0,0 +1,124 @@
+"""
+Parity tests for the compiled ClickableElementDetector rule tables and its batch classification.
+
+`legacy_is_interactive` is the original per-node rule chain, every verdict must match it.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.dom.playground.benchmark_clickable import all_nodes, legacy_is_interactive
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import DOMRect, EnhancedAXNode, EnhancedAXProperty, EnhancedDOMTreeNode, NodeType
+
+
+def _node(
+	tag: str = 'div',
+	attributes: dict[str, str] | None = None,
+	ax_properties: list[tuple[str, object]] | None = None,
+	ax_role: str | None = None,
+	size: tuple[float, float] | None = None,
+	cursor: str | None = None,
+	node_type: NodeType = NodeType.ELEMENT_NODE,
+) -> EnhancedDOMTreeNode:
+	ax_node = None
+	if ax_properties is not None or ax_role is not None:
+		properties = [EnhancedAXProperty(name=name, value=value) for name, value in ax_properties or []]  # type: ignore[arg-type]
+		ax_node = EnhancedAXNode(
+			ax_node_id='1', ignored=False, role=ax_role, name=None, description=None, properties=properties or None
+		)
+	snapshot_node = None
+	if size is not None or cursor is not None:
+		snapshot_node = SimpleNamespace(bounds=DOMRect(0, 0, *size) if size else None, cursor_style=cursor)
+	return EnhancedDOMTreeNode(
+		node_id=1,
+		backend_node_id=1,
+		node_type=node_type,
+		node_name=tag.upper(),
+		node_value='',
+		attributes=attributes or {},
+		is_scrollable=None,
+		is_visible=None,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=None,
+		ax_node=ax_node,
+		snapshot_node=snapshot_node,  # type: ignore[arg-type]
+	)
+
+
+@pytest.mark.parametrize(
+	'node, expected',
+	[
+		(_node(node_type=NodeType.TEXT_NODE), False),
+		(_node('body', {'onclick': 'go()'}), False),
+		(_node('html', {'class': 'search'}), False),
+		(_node('iframe', size=(300, 200)), True),
+		(_node('frame', size=(300, 50)), False),
+		(_node('div', {'class': 'Site-SEARCH   box'}), True),
+		(_node('div', {'class': 'sear ch'}), False),
+		(_node('div', {'id': 'FindMe'}), True),
+		(_node('div', {'data-kind': 'Query'}), True),
+		(_node('div', {'title': 'search'}), False),
+		(_node('button', ax_properties=[('disabled', True)]), False),
+		(_node('button', ax_properties=[('disabled', False)]), True),
+		(_node('div', ax_properties=[('hidden', True), ('focusable', True)]), False),
+		(_node('div', ax_properties=[('focusable', True), ('hidden', True)]), True),
+		(_node('div', ax_properties=[('focusable', False)]), False),
+		(_node('div', ax_properties=[('expanded', False)]), True),
+		(_node('div', ax_properties=[('keyshortcuts', 'Ctrl+K')]), True),
+		(_node('a'), True),
+		(_node('label', {'for': 'x'}), False),
+		(_node('span', {'tabindex': '-1'}), True),
+		(_node('span', {'role': 'tab'}), True),
+		(_node('span', {'role': 'listbox'}), False),
+		(_node('span', ax_role='listbox'), True),
+		(_node('span', {'class': 'icon'}, size=(24, 24)), True),
+		(_node('span', {'class': 'icon'}, size=(24, 80)), False),
+		(_node('span', {'title': 'icon'}, size=(24, 24)), False),
+		(_node('span', cursor='pointer'), True),
+		(_node('span', cursor='default'), False),
+	],
+)
+def test_compiled_rules_match_the_rule_chain(node, expected):
+	assert legacy_is_interactive(node) is expected
+	assert ClickableElementDetector.is_interactive(node) is expected
+
+
+def test_parity_on_synthetic_pages(synthetic_tree):
+	for seed in range(3):
+		root = synthetic_tree(3_000, seed=seed, with_iframe=True)
+		nodes = all_nodes(root)
+		verdicts = ClickableElementDetector.classify_tree(root)
+
+		assert len(verdicts) == len({node.node_id for node in nodes})
+		for node in nodes:
+			assert ClickableElementDetector.is_interactive(node) == legacy_is_interactive(node)
+			assert verdicts[node.node_id] == legacy_is_interactive(node)
+
+
+def test_serializer_output_is_unchanged(monkeypatch, dom_service, synthetic_tree):
+	trees = make_synthetic_page(2_000, with_iframe=True)
+	root, _ = dom_service().build_enhanced_tree(trees, 'target')
+	state, timing = DOMTreeSerializer(root).serialize_accessible_elements()
+	assert 'clickable_detection_time' in timing
+
+	# The original lazy, per-node detection
+	monkeypatch.setattr(ClickableElementDetector, 'classify_tree', classmethod(lambda cls, root: {}))
+	monkeypatch.setattr(ClickableElementDetector, 'is_interactive', staticmethod(legacy_is_interactive))
+	legacy_root = synthetic_tree(2_000, with_iframe=True)
+	legacy_state, _ = DOMTreeSerializer(legacy_root).serialize_accessible_elements()
+
+	assert state.llm_representation() == legacy_state.llm_representation()
+	assert [node.backend_node_id for node in state.selector_map.values()] == [
+		node.backend_node_id for node in legacy_state.selector_map.values()
+	]
@@ -0,0 +1,73 @@
+"""
+Tests for concurrent cross-origin iframe extraction in DomService.get_dom_tree.
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.service import DomService
+
+
+async def test_cross_origin_iframes_are_fetched_concurrently_with_one_frame_map():
+	calls = {'get_all_frames': 0, 'getTargets': 0}
+	in_flight = 0
+	max_in_flight = 0
+	fetched: list[str] = []
+
+	async def get_all_frames():
+		calls['get_all_frames'] += 1
+		await asyncio.sleep(0.01)
+		frames = {f'OOPIF-{i}': {'frameTargetId': f'iframe-target-{i}'} for i in range(6)}
+		return frames, {}
+
+	async def get_targets():
+		calls['getTargets'] += 1
+		return {'targetInfos': [{'targetId': f'iframe-target-{i}', 'type': 'iframe'} for i in range(6)]}
+
+	browser_session = SimpleNamespace(
+		logger=logging.getLogger('test_dom_cross_origin_iframes'),
+		agent_focus=None,
+		get_all_frames=get_all_frames,
+		cdp_client=SimpleNamespace(send=SimpleNamespace(Target=SimpleNamespace(getTargets=get_targets))),
+	)
+	dom_service = DomService(
+		browser_session,  # type: ignore[arg-type]
+		cross_origin_iframes=True,
+		max_iframe_depth=2,
+		max_concurrent_iframe_fetches=3,
+	)
+
+	async def get_all_trees(target_id, use_live_dom_mirror=False):
+		nonlocal in_flight, max_in_flight
+		if target_id == 'page':
+			return make_synthetic_page(200, cross_origin_iframes=6)
+		in_flight += 1
+		max_in_flight = max(max_in_flight, in_flight)
+		await asyncio.sleep(0.01)
+		in_flight -= 1
+		fetched.append(target_id)
+		# every iframe document embeds two more cross-origin iframes
+		return make_synthetic_page(50, cross_origin_iframes=2)
+
+	dom_service._get_all_trees = get_all_trees  # type: ignore[method-assign]
+
+	root = await dom_service.get_dom_tree('page')
+
+	# 6 iframes in the page, 2 more in each of their documents, nothing deeper than max_iframe_depth
+	assert len(fetched) == 6 + 6 * 2
+	assert calls == {'get_all_frames': 1, 'getTargets': 1}
+	assert 1 < max_in_flight <= 3
+
+	stack = [root]
+	stitched = 0
+	while stack:
+		node = stack.pop()
+		if node.tag_name == 'iframe' and node.content_document is not None:
+			assert node.content_document.parent_node is node
+			stitched += 1
+		stack.extend(node.children_and_shadow_roots)
+		if node.content_document:
+			stack.append(node.content_document)
+	assert stitched == len(fetched)
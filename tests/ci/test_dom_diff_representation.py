@@ -0,0 +1,108 @@
+"""
+Tests for the diff representation of consecutive DOM states and its use in the agent's state message.
+"""
+
+import pytest
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.views import MessageManagerState
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm import SystemMessage
+
+
+def _summary(dom_state: SerializedDOMState, url: str = 'https://example.com/feed') -> BrowserStateSummary:
+	return BrowserStateSummary(dom_state=dom_state, url=url, title='Feed', tabs=[])
+
+
+@pytest.fixture
+def message_manager(tmp_path):
+	return MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System message'),
+		state=MessageManagerState(),
+		file_system=FileSystem(tmp_path / 'fs'),
+		dom_representation='diff',
+	)
+
+
+def test_unchanged_state_collapses_to_one_line(synthetic_state):
+	state = synthetic_state(500)
+	assert (
+		state.diff_representation(synthetic_state(500))
+		== f'... {len(state.llm_representation().splitlines())} unchanged lines ...'
+	)
+
+
+def test_diff_lists_added_elements_with_current_indices(synthetic_state):
+	previous = synthetic_state(500)
+	current = synthetic_state(600, previous)
+	assert current.elements_diff is not None and current.elements_diff.added
+
+	diff = current.diff_representation(previous)
+	assert diff.startswith('... ') and len(diff) < len(current.llm_representation()) / 2
+	added_lines = [line for line in diff.splitlines() if line.startswith('+ ')]
+	for index in current.elements_diff.added:
+		assert any(line.startswith(f'+ [{index}]') for line in added_lines)
+	# new-element markers are relative to the previous step, not to the state diffed against
+	assert '*[' not in diff and not any(line.startswith('- ') for line in diff.splitlines())
+
+
+def test_reindexed_elements_are_reported_again(synthetic_state):
+	previous = synthetic_state(500)
+	scrolled = synthetic_state(500, scroll_y=300)
+	diff = scrolled.diff_representation(previous)
+	assert '- [1]<button' in diff and '+ [1]<button' in diff
+
+
+def test_prompt_falls_back_to_the_full_list_when_the_diff_is_larger(tmp_path, synthetic_state):
+	previous = synthetic_state(500)
+	grown = AgentMessagePrompt(
+		_summary(synthetic_state(600, previous)),
+		FileSystem(tmp_path / 'fs'),
+		dom_representation='diff',
+		previous_dom_state=previous,
+	)
+	assert '<browser_state_keyframe>' in grown._get_browser_state_description() and grown.dom_diff_sent
+
+	scrolled = AgentMessagePrompt(
+		_summary(synthetic_state(500, scroll_y=300)),
+		FileSystem(tmp_path / 'fs'),
+		dom_representation='diff',
+		previous_dom_state=previous,
+	)
+	assert '[Start of page]' in scrolled._get_browser_state_description() and not scrolled.dom_diff_sent
+
+	full = AgentMessagePrompt(_summary(synthetic_state(600)), FileSystem(tmp_path / 'fs'), previous_dom_state=previous)
+	full._get_browser_state_description()
+	assert not full.dom_diff_sent
+
+
+def test_message_manager_keeps_the_keyframe_in_context(message_manager, synthetic_state):
+	first = synthetic_state(500)
+	message_manager.create_state_messages(_summary(first), use_vision=False)
+	assert message_manager.state.history.dom_keyframe_message is None
+	assert first.llm_representation() in message_manager.state.history.state_message.text
+
+	second = synthetic_state(600, first)
+	message_manager.create_state_messages(_summary(second), use_vision=False)
+	messages = message_manager.get_messages()
+	assert len(messages) == 3
+	keyframe, state_message = messages[1].text, messages[2].text
+	assert first.llm_representation() in keyframe
+	assert second.diff_representation(first) in state_message
+	assert second.llm_representation() not in state_message
+
+	# the keyframe stays the same while diffs are sent, so it can be cached
+	third = synthetic_state(650, second)
+	message_manager.create_state_messages(_summary(third), use_vision=False)
+	assert message_manager.get_messages()[1].text == keyframe
+	assert third.diff_representation(first) in message_manager.get_messages()[2].text
+
+	# navigation sends the full list again and drops the keyframe
+	other_page = synthetic_state(300)
+	message_manager.create_state_messages(_summary(other_page, url='https://example.com/other'), use_vision=False)
+	assert message_manager.state.history.dom_keyframe_message is None
+	assert other_page.llm_representation() in message_manager.get_messages()[-1].text
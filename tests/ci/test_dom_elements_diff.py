@@ -0,0 +1,37 @@
+"""
+Tests for the interactive elements diff against the previous state, which marks new elements with `*[` in the output.
+"""
+
+
+def test_elements_diff_against_previous_state(synthetic_state):
+	previous = synthetic_state(num_nodes=400)
+	assert previous.elements_diff is None
+
+	state = synthetic_state(600, previous=previous)
+
+	diff = state.elements_diff
+	assert diff is not None and diff.has_changes
+	previous_ids = set(previous.backend_node_id_to_index)
+	assert diff.added == [index for index, node in state.selector_map.items() if node.backend_node_id not in previous_ids]
+	assert diff.added
+	assert state.llm_representation().count('*[') == len(diff.added)
+	for previous_index, index in diff.moved.items():
+		assert previous.selector_map[previous_index].backend_node_id == state.selector_map[index].backend_node_id
+	assert not diff.removed
+
+	# Against itself nothing changed and nothing is marked as new
+	same = synthetic_state(600, previous=state)
+	assert same.elements_diff is not None and not same.elements_diff.has_changes
+	assert '*[' not in same.llm_representation()
+
+	# Going back to the smaller page removes elements
+	smaller = synthetic_state(400, previous=state)
+	assert smaller.elements_diff is not None
+	assert sorted(smaller.elements_diff.removed) == sorted(diff.added)
+
+
+def test_backend_node_id_to_index_is_built_once(synthetic_state):
+	state = synthetic_state(400)
+	mapping = state.backend_node_id_to_index
+	assert mapping == {node.backend_node_id: index for index, node in state.selector_map.items()}
+	assert state.backend_node_id_to_index is mapping
@@ -0,0 +1,56 @@
+"""
+Tests for the precomputed element fingerprints.
+
+`DomService.compute_fingerprints` must produce exactly the values of the walk-to-the-root implementation, so element
+hashes recorded in existing histories keep matching.
+"""
+
+import hashlib
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode
+
+
+def _all_nodes(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	nodes = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		nodes.append(node)
+		stack.extend(node.children_and_shadow_roots)
+		if node.content_document:
+			stack.append(node.content_document)
+	return nodes
+
+
+def _walk_hashes(node: EnhancedDOMTreeNode) -> tuple[int, int]:
+	"""The original per-call implementation of parent_branch_hash() and hash()"""
+	branch_path = '/'.join(node._get_parent_branch_path())
+	attributes_string = ''.join(f'{key}={value}' for key, value in node.attributes.items())
+	branch_hash = int(hashlib.sha256(branch_path.encode()).hexdigest()[:16], 16)
+	element_hash = int(hashlib.sha256(f'{branch_path}|{attributes_string}'.encode()).hexdigest()[:16], 16)
+	return branch_hash, element_hash
+
+
+def test_precomputed_fingerprints_match_walk_based_hashes(synthetic_tree):
+	root = synthetic_tree(2_000, with_iframe=True)
+	nodes = _all_nodes(root)
+
+	DomService.compute_fingerprints(root)
+	assert all(node._parent_branch_hash is not None for node in nodes)
+
+	for node in nodes:
+		branch_hash, element_hash = _walk_hashes(node)
+		assert node.parent_branch_hash() == branch_hash
+		assert node.__hash__() == element_hash
+		assert node._element_hash == element_hash
+
+
+def test_fingerprints_are_memoized_without_precomputation(synthetic_tree):
+	root = synthetic_tree(200)
+	node = next(node for node in _all_nodes(root) if node.tag_name == 'button')
+
+	assert node._element_hash is None
+	assert node.__hash__() == _walk_hashes(node)[1]
+	assert node._element_hash == _walk_hashes(node)[1]
+	assert node.element_hash == hash(node)
@@ -0,0 +1,136 @@
+"""
+Tests for the live DOM mirror that patches the raw CDP document from DOM mutation events.
+
+No browser needed: the mirror is fed a synthetic `DOM.getDocument` payload and hand-written mutation events.
+"""
+
+import copy
+import logging
+from types import SimpleNamespace
+
+from browser_use.dom.live_mirror import LiveDOMMirror
+from browser_use.dom.playground.synthetic import make_synthetic_page
+
+SESSION_ID = 'mirror-session'
+
+
+class _FakeDOMDomain:
+	def __init__(self, mirror: LiveDOMMirror, document: dict):
+		self.mirror = mirror
+		self.document = document
+		self.get_document_calls = 0
+		self.request_child_nodes_calls = 0
+		self.children_by_node_id: dict[int, list] = {}
+
+	async def getDocument(self, params, session_id=None):
+		self.get_document_calls += 1
+		return {'root': copy.deepcopy(self.document)}
+
+	async def requestChildNodes(self, params, session_id=None):
+		# Chrome answers with a DOM.setChildNodes event before the command response
+		self.request_child_nodes_calls += 1
+		children = self.children_by_node_id.get(params['nodeId'])
+		if children is not None:
+			self.mirror.on_set_child_nodes({'parentId': params['nodeId'], 'nodes': children}, SESSION_ID)
+		return {}
+
+
+def _mirror_with_fake_client() -> tuple[LiveDOMMirror, _FakeDOMDomain]:
+	document = make_synthetic_page(100).dom_tree['root']
+	cdp_client = SimpleNamespace(send=SimpleNamespace())
+	browser_session = SimpleNamespace(logger=logging.getLogger('test_dom_live_mirror'), cdp_client=cdp_client)
+	mirror = LiveDOMMirror(browser_session)  # type: ignore[arg-type]
+	dom = _FakeDOMDomain(mirror, document)
+	cdp_client.send.DOM = dom
+	mirror.cdp_session = SimpleNamespace(session_id=SESSION_ID, cdp_client=cdp_client)  # type: ignore[assignment]
+	mirror.target_id = 'target'
+	return mirror, dom
+
+
+def _find(node: dict, node_id: int) -> dict | None:
+	stack = [node]
+	while stack:
+		current = stack.pop()
+		if current['nodeId'] == node_id:
+			return current
+		stack.extend(current.get('children', []))
+	return None
+
+
+def _row_link(document: dict) -> dict:
+	body = document['children'][0]['children'][1]
+	row = body['children'][1]
+	return row['children'][0]
+
+
+async def test_mutations_are_applied_without_refetching():
+	mirror, dom = _mirror_with_fake_client()
+	document = (await mirror.get_document('target'))['root']
+	assert dom.get_document_calls == 1
+
+	link = _row_link(document)
+	row_id = link['parentId']
+	text = link['children'][0]
+
+	mirror.on_attribute_modified({'nodeId': link['nodeId'], 'name': 'href', 'value': '/changed'}, SESSION_ID)
+	mirror.on_attribute_modified({'nodeId': link['nodeId'], 'name': 'data-new', 'value': 'x'}, SESSION_ID)
+	mirror.on_attribute_removed({'nodeId': link['nodeId'], 'name': 'class'}, SESSION_ID)
+	mirror.on_character_data_modified({'nodeId': text['nodeId'], 'characterData': 'Changed'}, SESSION_ID)
+	new_node = {'nodeId': 90_001, 'backendNodeId': 90_001, 'nodeType': 1, 'nodeName': 'B', 'localName': 'b', 'nodeValue': ''}
+	mirror.on_child_node_inserted({'parentNodeId': row_id, 'previousNodeId': link['nodeId'], 'node': new_node}, SESSION_ID)
+	row = _find(document, row_id)
+	assert row is not None
+	removed = row['children'][-1]
+	mirror.on_child_node_removed({'parentNodeId': row_id, 'nodeId': removed['nodeId']}, SESSION_ID)
+
+	document_again = (await mirror.get_document('target'))['root']
+	assert document_again is document
+	assert dom.get_document_calls == 1
+	assert mirror.incremental_reads == 1
+
+	assert link['attributes'] == ['href', '/changed', 'data-new', 'x']
+	assert text['nodeValue'] == 'Changed'
+	assert [child['nodeId'] for child in row['children']][:2] == [link['nodeId'], 90_001]
+	assert _find(document, 90_001)['parentId'] == row_id  # type: ignore[index]
+	assert _find(document, removed['nodeId']) is None
+
+
+async def test_incomplete_subtrees_are_requested():
+	mirror, dom = _mirror_with_fake_client()
+	document = (await mirror.get_document('target'))['root']
+	row_id = _row_link(document)['parentId']
+
+	container = {'nodeId': 90_010, 'backendNodeId': 90_010, 'nodeType': 1, 'nodeName': 'UL', 'nodeValue': '', 'childNodeCount': 1}
+	item = {'nodeId': 90_011, 'backendNodeId': 90_011, 'nodeType': 1, 'nodeName': 'LI', 'nodeValue': '', 'parentId': 90_010}
+	dom.children_by_node_id[90_010] = [item]
+	mirror.on_child_node_inserted({'parentNodeId': row_id, 'previousNodeId': 0, 'node': container}, SESSION_ID)
+
+	await mirror.get_document('target')
+	assert dom.request_child_nodes_calls == 1
+	assert dom.get_document_calls == 1
+	assert container['children'] == [item]
+
+
+async def test_unsafe_events_force_a_full_fetch():
+	mirror, dom = _mirror_with_fake_client()
+	document = (await mirror.get_document('target'))['root']
+	link = _row_link(document)
+
+	# events of other sessions are ignored
+	mirror.on_attribute_modified({'nodeId': link['nodeId'], 'name': 'href', 'value': '/other'}, 'other-session')
+	assert link['attributes'][1] != '/other'
+	assert not mirror.stale
+
+	mirror.on_attribute_modified({'nodeId': 123_456, 'name': 'href', 'value': '/x'}, SESSION_ID)
+	assert mirror.stale
+	await mirror.get_document('target')
+	assert dom.get_document_calls == 2
+
+	iframe = {'nodeId': 90_020, 'backendNodeId': 90_020, 'nodeType': 1, 'nodeName': 'IFRAME', 'nodeValue': ''}
+	mirror.on_child_node_inserted({'parentNodeId': link['parentId'], 'previousNodeId': 0, 'node': iframe}, SESSION_ID)
+	assert mirror.stale
+
+	await mirror.get_document('target')
+	mirror.on_document_updated({}, SESSION_ID)
+	await mirror.get_document('target')
+	assert dom.get_document_calls == 4
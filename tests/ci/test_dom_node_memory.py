@@ -0,0 +1,84 @@
+"""
+Tests for the compact DOM node representation: lazy uuids, identity equality, interned names, shared styles.
+"""
+
+import json
+from dataclasses import replace
+
+from browser_use.dom.playground.benchmark_memory import measure
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+
+def _elements(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	elements = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		if node.node_type == NodeType.ELEMENT_NODE:
+			elements.append(node)
+		stack.extend(node.children_nodes or [])
+		stack.extend(node.shadow_roots or [])
+		if node.content_document:
+			stack.append(node.content_document)
+	return elements
+
+
+def _decoded_page(num_nodes: int):
+	"""Synthetic page with every string a separate object, like a decoded CDP response"""
+	trees = make_synthetic_page(num_nodes)
+	return replace(
+		trees,
+		snapshot=json.loads(json.dumps(trees.snapshot)),
+		dom_tree=json.loads(json.dumps(trees.dom_tree)),
+		ax_tree=json.loads(json.dumps(trees.ax_tree)),
+	)
+
+
+def test_uuid_is_generated_on_first_access(synthetic_tree):
+	root = synthetic_tree(200)
+	node = _elements(root)[0]
+
+	assert node._uuid is None
+	uuid = node.uuid
+	assert uuid and node.uuid == uuid
+	assert _elements(root)[1].uuid != uuid
+
+
+def test_nodes_compare_by_identity(dom_service, synthetic_tree):
+	trees = make_synthetic_page(200)
+	first, _ = dom_service().build_enhanced_tree(trees, 'target')
+	second = synthetic_tree(200)
+
+	assert first == first
+	assert first != second
+	elements = _elements(first)
+	assert elements.index(elements[5]) == 5
+
+
+def test_tag_names_and_attribute_keys_are_interned(dom_service):
+	root, _ = dom_service().build_enhanced_tree(_decoded_page(500), 'target')
+	elements = _elements(root)
+
+	divs = [node for node in elements if node.node_name == 'DIV']
+	assert len(divs) > 1 and all(node.node_name is divs[0].node_name for node in divs)
+
+	keys = [key for node in elements for key in node.attributes if key == 'class']
+	assert len(keys) > 1 and all(key is keys[0] for key in keys)
+
+
+def test_computed_styles_are_shared_between_nodes(synthetic_tree):
+	root = synthetic_tree(500)
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+
+	styles = [node.snapshot_node.computed_styles for node in state.selector_map.values() if node.snapshot_node]
+	assert styles and all(style is not None for style in styles)
+	assert len({id(style) for style in styles}) < len(styles)
+
+
+def test_memory_benchmark_reports_per_node_sizes(dom_service):
+	result = measure(dom_service(), 500)
+	assert result['nodes'] > 500
+	assert 0 < result['tree_bytes_per_node'] < 5_000
+	assert 0 < result['simplified_bytes_per_node'] < 5_000
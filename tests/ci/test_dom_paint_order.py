@@ -0,0 +1,75 @@
+"""
+Tests for the paint-order occlusion engines.
+
+RectUnionGrid must answer `contains` exactly like RectUnionPure for the same sequence of insertions.
+"""
+
+import random
+
+import pytest
+
+from browser_use.dom.playground.benchmark_paint_order import WORKLOADS
+from browser_use.dom.serializer.paint_order import Rect, RectUnionGrid, RectUnionPure
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+
+
+def _coverage_sequence(union: RectUnionPure | RectUnionGrid, rects: list[Rect]) -> list[bool]:
+	covered = []
+	for rect in rects:
+		covered.append(union.contains(rect))
+		union.add(rect)
+	return covered
+
+
+@pytest.mark.parametrize('workload', sorted(WORKLOADS))
+def test_grid_matches_rect_union_on_workloads(workload: str):
+	rects = WORKLOADS[workload](600)
+	assert _coverage_sequence(RectUnionGrid(), rects) == _coverage_sequence(RectUnionPure(), rects)
+
+
+def test_grid_matches_rect_union_on_edge_cases():
+	"""Integer-aligned rects produce shared edges and exact tilings; tiny cells stress cell borders."""
+	rng = random.Random(7)
+	rects = []
+	for _ in range(400):
+		x, y = rng.randint(0, 40), rng.randint(0, 40)
+		rects.append(Rect(x, y, x + rng.randint(1, 12), y + rng.randint(1, 12)))
+
+	assert _coverage_sequence(RectUnionGrid(cell_size=4, max_cells_per_rect=4), rects) == _coverage_sequence(
+		RectUnionPure(), rects
+	)
+
+
+def test_grid_union_coverage():
+	union = RectUnionGrid(cell_size=10)
+	assert not union.contains(Rect(0, 0, 1, 1))
+
+	assert union.add(Rect(0, 0, 10, 10))
+	assert union.add(Rect(10, 0, 20, 10))
+	assert union.contains(Rect(5, 2, 15, 8))  # covered by two touching rects together
+	assert not union.contains(Rect(5, 2, 25, 8))
+	assert not union.add(Rect(1, 1, 19, 9))  # already covered, union does not grow
+
+	assert union.add(Rect(-1000, -1000, 1000, 1000))  # spans more cells than max_cells_per_rect
+	assert union.contains(Rect(500, 500, 600, 600))
+	assert len(union) == 3
+
+
+def test_grid_zero_area_rects_inside_a_stored_rect_are_covered():
+	"""RectUnionPure answers zero-area queries depending on how it fragmented the union, the grid does not fragment."""
+	union = RectUnionGrid()
+	union.add(Rect(0, 0, 10, 10))
+	union.add(Rect(10, 0, 20, 10))
+	assert union.contains(Rect(15, 5, 15, 5))
+	assert union.contains(Rect(2, 3, 8, 3))
+	assert not union.contains(Rect(0, 11, 20, 11))
+
+
+def test_serializer_output_is_identical_for_both_engines(synthetic_tree):
+	outputs = []
+	for engine in ('rect_union', 'grid'):
+		state, _ = DOMTreeSerializer(synthetic_tree(1_000), paint_order_filtering=engine).serialize_accessible_elements()  # type: ignore[arg-type]
+		outputs.append(state.llm_representation())
+
+	assert outputs[0] == outputs[1]
+	assert outputs[0]
@@ -0,0 +1,178 @@
+"""
+Tests for offloading the DOM build + serialization to a process pool and pruning the tree sent back.
+"""
+
+import pickle
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.enhanced_snapshot import SnapshotNodeView
+from browser_use.dom.offload import acquire_shared_process_pool, prune_for_transfer, release_shared_process_pool
+from browser_use.dom.playground.benchmark_memory import count_nodes
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedSnapshotNode, SerializedDOMState, TargetAllTrees
+from browser_use.tools.service import find_file_input_near_element
+
+
+@pytest.fixture(scope='module')
+def process_pool():
+	pool = acquire_shared_process_pool(1)
+	yield pool
+	release_shared_process_pool(pool)
+
+
+def _element_views(state: SerializedDOMState) -> dict[int, tuple]:
+	"""What agent actions and history read from the selector map elements"""
+	return {
+		index: (
+			node.backend_node_id,
+			node.xpath,
+			hash(node),
+			node.parent_branch_hash(),
+			node.llm_representation(),
+			node.get_meaningful_text_for_llm(),
+			node.get_scroll_info_text(),
+			node.snapshot_node.bounds if node.snapshot_node else None,
+		)
+		for index, node in state.selector_map.items()
+	}
+
+
+def test_snapshot_views_pickle_as_eager_nodes(synthetic_tree):
+	root = synthetic_tree(200)
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+	view = next(node.snapshot_node for node in state.selector_map.values() if node.snapshot_node)
+	assert isinstance(view, SnapshotNodeView)
+
+	copy = pickle.loads(pickle.dumps(view))
+	assert type(copy) is EnhancedSnapshotNode
+	assert copy == view.materialize()
+	assert copy.bounds == view.bounds and copy.computed_styles == view.computed_styles
+
+
+def test_pruned_tree_keeps_what_the_state_reads(synthetic_tree):
+	root = synthetic_tree(2_000, with_iframe=True)
+	DomService.compute_fingerprints(root)
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+	text = state.llm_representation()
+	elements = _element_views(state)
+	total = count_nodes(root)
+	size = len(pickle.dumps((state, root)))
+
+	kept = prune_for_transfer(state, root)
+	payload = pickle.dumps((state, root))
+	pruned_state, _ = pickle.loads(payload)
+
+	assert kept < total and len(payload) < size
+	assert pruned_state.llm_representation() == text
+	assert _element_views(pruned_state) == elements
+
+
+def test_pruned_tree_keeps_file_inputs_next_to_upload_buttons(dom_service):
+	page = make_synthetic_page(500)
+	body = page.dom_tree['root']['children'][0]['children'][1]  # type: ignore[typeddict-item]
+	row = next(node for node in body['children'] if 'row-3' in node['attributes'])
+	# a hidden file input next to the row's button, without layout it is neither in the state nor in the selector map
+	row['children'].append(
+		{
+			'nodeId': 100_000,
+			'backendNodeId': 100_000,
+			'nodeType': 1,
+			'nodeName': 'INPUT',
+			'localName': 'input',
+			'nodeValue': '',
+			'attributes': ['type', 'file', 'style', 'display: none'],
+			'parentId': row['nodeId'],
+		}
+	)
+	root, _ = dom_service().build_enhanced_tree(page, 'target')
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+	button = next(
+		node
+		for node in state.selector_map.values()
+		if node.node_name == 'BUTTON' and node.parent_node and node.parent_node.attributes.get('id') == 'row-3'
+	)
+	assert all(node.backend_node_id != 100_000 for node in state.selector_map.values())
+
+	prune_for_transfer(state, root)
+	pruned_state, _ = pickle.loads(pickle.dumps((state, root)))
+	pruned_button = next(node for node in pruned_state.selector_map.values() if node.backend_node_id == button.backend_node_id)
+	file_input = find_file_input_near_element(pruned_button, BrowserSession(browser_profile=BrowserProfile()).is_file_input)
+	assert file_input is not None and file_input.backend_node_id == 100_000
+
+
+async def test_offloaded_state_matches_in_process(process_pool, dom_service):
+	pages = [make_synthetic_page(1_500, with_iframe=True), make_synthetic_page(1_800, with_iframe=True)]
+	in_process = dom_service([make_synthetic_page(1_500, with_iframe=True), make_synthetic_page(1_800, with_iframe=True)])
+	offloaded = dom_service(pages, process_pool=process_pool)
+
+	expected, _, _ = await in_process.get_serialized_dom_tree()
+	state, root, timing = await offloaded.get_serialized_dom_tree()
+	assert 'dom_offload_total' in timing and 'prune_for_transfer' in timing
+	assert state.llm_representation() == expected.llm_representation()
+	assert _element_views(state) == _element_views(expected)
+	assert root.node_name == '#document'
+
+	# The diff against the previous state is computed in the worker from its backend node ids
+	expected_next, _, _ = await in_process.get_serialized_dom_tree(previous_cached_state=expected)
+	next_state, _, _ = await offloaded.get_serialized_dom_tree(previous_cached_state=state)
+	assert next_state.elements_diff == expected_next.elements_diff
+	assert next_state.elements_diff is not None and next_state.elements_diff.added
+	assert next_state.llm_representation() == expected_next.llm_representation()
+
+
+def _deeply_nested_page(depth: int) -> TargetAllTrees:
+	page = make_synthetic_page(300)
+	parent = page.dom_tree['root']['children'][0]['children'][1]  # type: ignore[typeddict-item]
+	for i in range(depth):
+		node_id = 100_000 + i
+		child = {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 1, 'nodeName': 'DIV', 'localName': 'div'}
+		child.update(nodeValue='', attributes=[], parentId=parent['nodeId'])
+		parent.setdefault('children', []).append(child)
+		parent = child
+	return page
+
+
+async def test_too_deeply_nested_pages_are_built_in_process(process_pool, dom_service):
+	in_process = dom_service([_deeply_nested_page(600)])
+	offloaded = dom_service([_deeply_nested_page(600)], process_pool=process_pool)
+
+	expected, _, _ = await in_process.get_serialized_dom_tree()
+	state, _, timing = await offloaded.get_serialized_dom_tree()
+	assert 'dom_offload_total' not in timing
+	assert state.llm_representation() == expected.llm_representation()
+	assert offloaded.process_pool is process_pool
+
+
+def test_offload_is_disabled_with_cross_origin_iframes(process_pool, dom_service):
+	assert dom_service(process_pool=process_pool).process_pool is process_pool
+	assert dom_service(process_pool=process_pool, cross_origin_iframes=True).process_pool is None
+	assert dom_service(process_pool=process_pool, iterative_tree_builder=False).process_pool is None
+
+
+def test_shared_pool_spawns_workers_and_shuts_down_with_its_last_user():
+	pool = acquire_shared_process_pool(3)
+	assert acquire_shared_process_pool(3) is pool
+	assert pool._mp_context.get_start_method() == 'spawn'  # type: ignore[attr-defined]
+
+	release_shared_process_pool(pool)
+	assert not pool._shutdown_thread  # type: ignore[attr-defined]
+	release_shared_process_pool(pool)
+	assert pool._shutdown_thread  # type: ignore[attr-defined]
+
+	new_pool = acquire_shared_process_pool(3)
+	assert new_pool is not pool
+	release_shared_process_pool(new_pool)
+
+
+async def test_session_releases_its_pool_when_reset():
+	session = BrowserSession(browser_profile=BrowserProfile(dom_process_pool_workers=3))
+	pool = session.get_dom_process_pool()
+	assert pool is not None and session.get_dom_process_pool() is pool
+
+	await session.reset()
+	assert pool._shutdown_thread  # type: ignore[attr-defined]
+	assert BrowserSession(browser_profile=BrowserProfile()).get_dom_process_pool() is None
@@ -0,0 +1,95 @@
+"""
+Tests for the budgeted, line-streaming DOM serializer and the llm_representation cache.
+
+Budgeted output must be made of whole lines of the unbudgeted output, in document order, and never exceed the budget.
+"""
+
+from browser_use.dom.serializer.serializer import APPROX_CHARS_PER_TOKEN, DOMTreeSerializer
+from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES
+
+
+def _is_ordered_subset(lines: list[str], full_lines: list[str]) -> bool:
+	remaining = iter(full_lines)
+	return all(line in remaining for line in lines)
+
+
+def test_streamed_lines_match_serialize_tree(synthetic_state):
+	state = synthetic_state()
+	assert state._root is not None
+	full = DOMTreeSerializer.serialize_tree(state._root, DEFAULT_INCLUDE_ATTRIBUTES)
+	assert '\n'.join(DOMTreeSerializer.iter_serialized_lines(state._root, DEFAULT_INCLUDE_ATTRIBUTES)) == full
+	assert state.llm_representation() == full
+	assert not state.truncated
+
+
+def test_char_budget_stops_at_a_whole_line(synthetic_state):
+	state = synthetic_state()
+	full = state.llm_representation()
+
+	text = state.llm_representation(max_chars=1_000)
+	assert state.truncated
+	assert len(text) <= 1_000
+	assert full.startswith(text + '\n')
+
+	assert state.llm_representation(max_chars=len(full)) == full
+	assert not state.truncated
+
+
+def test_token_budget_is_converted_to_chars(synthetic_state):
+	state = synthetic_state()
+	text = state.llm_representation(max_tokens=100)
+	assert state.truncated
+	assert len(text) <= 100 * APPROX_CHARS_PER_TOKEN
+	assert text == state.llm_representation(max_chars=100 * APPROX_CHARS_PER_TOKEN)
+
+	# The tighter of the two budgets wins
+	assert state.llm_representation(max_chars=50, max_tokens=100) == state.llm_representation(max_chars=50)
+
+
+def test_prioritize_viewport_spends_budget_on_visible_elements_first(synthetic_state):
+	state = synthetic_state(scroll_y=2_000)
+	full_lines = state.llm_representation().split('\n')
+
+	prefix = state.llm_representation(max_chars=2_000)
+	prioritized = state.llm_representation(max_chars=2_000, prioritize_viewport=True)
+	assert state.truncated
+	assert len(prioritized) <= 2_000
+
+	# Lines stay in document order, but the page is scrolled, so the prioritized selection is not just the top of the page
+	prioritized_lines = prioritized.split('\n')
+	assert _is_ordered_subset(prioritized_lines, full_lines)
+	assert prioritized != prefix
+	assert any(line.lstrip().startswith('[') for line in prioritized_lines)
+
+
+def test_llm_representation_is_cached_per_arguments(synthetic_state):
+	state = synthetic_state()
+
+	full = state.llm_representation()
+	assert state.llm_representation() is full
+	assert state.llm_representation(DEFAULT_INCLUDE_ATTRIBUTES) is full
+	assert state.llm_representation_size() == (len(full), len(full) // APPROX_CHARS_PER_TOKEN)
+
+	budgeted = state.llm_representation(max_chars=1_000)
+	assert state.truncated
+	assert state.llm_representation(max_chars=1_000) is budgeted
+	assert state.truncated  # restored from the cache as well
+	assert state.llm_representation(['id']) != full
+
+	assert state.serialization_stats.serializations == 3
+	assert state.serialization_stats.cache_hits == 4
+	assert state.serialization_stats.chars_reused == 3 * len(full) + len(budgeted)
+
+
+def test_llm_representation_cache_is_invalidated(synthetic_state):
+	state = synthetic_state()
+	full = state.llm_representation()
+
+	state.invalidate_cache()
+	assert state.llm_representation() == full
+	assert state.serialization_stats.serializations == 2
+
+	state._root = synthetic_state(num_nodes=200)._root
+	assert state.llm_representation() != full
+	assert state.serialization_stats.serializations == 3
+	assert state.serialization_stats.cache_hits == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the columnar snapshot index used by DomService.
+
+The lazy views must expose exactly the same data as the eager dict-of-objects lookup.
+"""
+
+from dataclasses import asdict
+
+from browser_use.dom.enhanced_snapshot import (
+	SnapshotIndex,
+	SnapshotNodeView,
+	build_eager_snapshot_lookup,
+	build_snapshot_lookup,
+)
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.views import EnhancedSnapshotNode
+
+
+def test_columnar_lookup_matches_eager_lookup():
+	"""Every backend node id resolves to the same snapshot data in both implementations."""
+	snapshot = make_synthetic_page(2_000).snapshot
+
+	eager = build_eager_snapshot_lookup(snapshot, device_pixel_ratio=2.0)
+	columnar = build_snapshot_lookup(snapshot, device_pixel_ratio=2.0)
+
+	assert isinstance(columnar, SnapshotIndex)
+	assert set(columnar) == set(eager)
+	for backend_node_id, eager_node in eager.items():
+		assert asdict(columnar[backend_node_id]) == asdict(eager_node)
+
+
+def test_views_are_lazy_and_stable():
+	"""Views are EnhancedSnapshotNode instances, memoized per node, and keep in-place mutations of their rects."""
+	snapshot = make_synthetic_page(200).snapshot
+	index = build_snapshot_lookup(snapshot)
+
+	backend_node_id = next(node_id for node_id in index if index[node_id].bounds is not None)
+	view = index[backend_node_id]
+	assert isinstance(view, SnapshotNodeView)
+	assert isinstance(view, EnhancedSnapshotNode)
+	assert index.get(backend_node_id) is view
+
+	assert view.bounds is not None
+	view.bounds.x += 10
+	assert index[backend_node_id].bounds is view.bounds
+
+	assert index.get(-1) is None
+	assert -1 not in index
+
+
+def test_missing_layout_and_clickable_data():
+	"""Nodes without layout have no rects/styles, documents without isClickable report None."""
+	snapshot = {
+		'documents': [
+			{
+				'nodes': {'parentIndex': [-1, 0], 'backendNodeId': [1, 2]},
+				'layout': {'nodeIndex': [1], 'styles': [[0]], 'bounds': [[1, 2, 3, 4]], 'text': [-1], 'stackingContexts': {}},
+			}
+		],
+		'strings': ['block'],
+	}
+	index = build_snapshot_lookup(snapshot)  # type: ignore[arg-type]
+
+	no_layout = index[1]
+	assert no_layout.bounds is None
+	assert no_layout.computed_styles is None
+	assert no_layout.paint_order is None
+	assert no_layout.is_clickable is None
+
+	with_layout = index[2]
+	assert with_layout.bounds is not None and with_layout.bounds.width == 3
+	assert with_layout.computed_styles == {'display': 'block'}
+	assert with_layout.cursor_style is None
+	assert with_layout.clientRects is None
+
+
+def test_hidden_by_style_mask_matches_computed_styles():
+	"""The per-document style mask makes the same decision as parsing each node's computed styles."""
+	snapshot = make_synthetic_page(1_000).snapshot
+	eager = build_eager_snapshot_lookup(snapshot)
+	columnar = build_snapshot_lookup(snapshot)
+
+	decisions = {backend_node_id: columnar[backend_node_id].hidden_by_style for backend_node_id in eager}
+	assert decisions == {backend_node_id: node.hidden_by_style for backend_node_id, node in eager.items()}
+	assert any(decisions.values())
@@ -0,0 +1,91 @@
+"""
+Tests for the iterative enhanced-tree builder in DomService.
+
+The iterative builder must produce exactly the same tree as the legacy recursive builder, including visibility
+and the in-place adjustment of snapshot bounds.
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.views import EnhancedDOMTreeNode
+
+
+def _flatten(node: EnhancedDOMTreeNode) -> list[tuple]:
+	"""Pre-order dump of everything the builders compute per node."""
+	rows = []
+	stack = [node]
+	while stack:
+		current = stack.pop()
+		snapshot_bounds = current.snapshot_node.bounds if current.snapshot_node else None
+		rows.append(
+			(
+				current.node_id,
+				current.node_type,
+				current.node_name,
+				current.attributes,
+				current.is_visible,
+				asdict(current.absolute_position) if current.absolute_position else None,
+				asdict(snapshot_bounds) if snapshot_bounds else None,
+				current.parent_node.node_id if current.parent_node else None,
+				[child.node_id for child in current.children_nodes] if current.children_nodes is not None else None,
+				current.ax_node.role if current.ax_node else None,
+			)
+		)
+		subtree = (current.children_nodes or []) + (current.shadow_roots or [])
+		if current.content_document:
+			subtree.append(current.content_document)
+		stack.extend(reversed(subtree))
+	return rows
+
+
+@pytest.mark.parametrize('with_iframe', [False, True])
+async def test_iterative_builder_matches_recursive_builder(with_iframe: bool, dom_service):
+	"""Both builders produce identical trees on a scrolled page with hidden and off-screen rows (and a scrolled iframe)."""
+	service = dom_service()
+
+	recursive_root = await service._build_enhanced_tree_recursive(
+		make_synthetic_page(2_000, scroll_y=500, with_iframe=with_iframe), 'target'
+	)
+	iterative_root, pending_iframes = service.build_enhanced_tree(
+		make_synthetic_page(2_000, scroll_y=500, with_iframe=with_iframe), 'target'
+	)
+
+	assert pending_iframes == []
+	recursive_rows = _flatten(recursive_root)
+	iterative_rows = _flatten(iterative_root)
+	assert len(iterative_rows) == len(recursive_rows)
+	assert iterative_rows == recursive_rows
+
+	visible = [row for row in iterative_rows if row[4]]
+	assert 0 < len(visible) < len(iterative_rows)
+	if with_iframe:
+		frame_buttons = [row for row in iterative_rows if row[2] == 'BUTTON' and row[3] == {'type': 'button'}]
+		assert any(row[4] for row in frame_buttons) and not all(row[4] for row in frame_buttons)
+
+
+def test_iterative_builder_handles_deep_trees(dom_service):
+	"""Nesting far beyond the interpreter recursion limit does not overflow the stack."""
+	depth = 5_000
+	trees = make_synthetic_page(10)
+	body = trees.dom_tree['root']['children'][0]['children'][1]
+	parent = body
+	for i in range(depth):
+		child = {
+			'nodeId': 100_000 + i,
+			'backendNodeId': 100_000 + i,
+			'nodeType': 1,
+			'nodeName': 'DIV',
+			'localName': 'div',
+			'nodeValue': '',
+			'attributes': [],
+			'parentId': parent['nodeId'],
+		}
+		parent.setdefault('children', []).append(child)
+		parent = child
+
+	root, _ = dom_service().build_enhanced_tree(trees, 'target')
+
+	assert len(_flatten(root)) > depth
@@ -0,0 +1,80 @@
+"""
+Tests for reusing the previous serialized DOM state when the page fingerprint did not change.
+"""
+
+from browser_use.browser import BrowserProfile
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.service import DomService
+
+
+def test_fingerprint_covers_layout_and_scroll():
+	fingerprint = DomService.compute_trees_fingerprint(make_synthetic_page(500))
+	assert fingerprint == DomService.compute_trees_fingerprint(make_synthetic_page(500))
+	assert fingerprint != DomService.compute_trees_fingerprint(make_synthetic_page(500, scroll_y=300))
+	assert fingerprint != DomService.compute_trees_fingerprint(make_synthetic_page(500, seed=1))
+	assert fingerprint != DomService.compute_trees_fingerprint(make_synthetic_page(600))
+
+
+async def test_unchanged_page_reuses_previous_state(dom_service):
+	service = dom_service([make_synthetic_page(500) for _ in range(3)], reuse_unchanged_dom=True)
+
+	first, root, _ = await service.get_serialized_dom_tree()
+	text = first.llm_representation()
+
+	second, second_root, timing = await service.get_serialized_dom_tree(previous_cached_state=first)
+	assert service.fingerprint_stats.last_reused and set(timing) == {'dom_fingerprint'}
+	assert second is not first and second_root is root
+	assert second.selector_map is first.selector_map
+	assert second.elements_diff is not None and not second.elements_diff.has_changes
+	assert second.llm_representation() == text
+	assert second.serialization_stats.serializations == 0
+
+	# the reused state can be reused again
+	third, _, _ = await service.get_serialized_dom_tree(previous_cached_state=second)
+	assert service.fingerprint_stats.last_reused and third.selector_map is first.selector_map
+	assert (service.fingerprint_stats.checks, service.fingerprint_stats.hits) == (3, 2)
+
+
+async def test_changed_page_is_rebuilt(dom_service):
+	service = dom_service(
+		[make_synthetic_page(500), make_synthetic_page(500, scroll_y=300), make_synthetic_page(500)], reuse_unchanged_dom=True
+	)
+
+	first, _, _ = await service.get_serialized_dom_tree()
+	scrolled, _, _ = await service.get_serialized_dom_tree(previous_cached_state=first)
+	assert not service.fingerprint_stats.last_reused
+	assert scrolled.selector_map is not first.selector_map
+
+	# Only the state built last can be reused
+	_, _, _ = await service.get_serialized_dom_tree(previous_cached_state=first)
+	assert not service.fingerprint_stats.last_reused
+	assert service.fingerprint_stats.hits == 0
+
+
+async def test_states_with_new_elements_are_serialized_again(dom_service):
+	service = dom_service(
+		[make_synthetic_page(400), make_synthetic_page(600), make_synthetic_page(600), make_synthetic_page(600)],
+		reuse_unchanged_dom=True,
+	)
+
+	first, _, _ = await service.get_serialized_dom_tree()
+	grown, _, _ = await service.get_serialized_dom_tree(previous_cached_state=first)
+	assert grown.elements_diff is not None and grown.elements_diff.added
+	assert '*[' in grown.llm_representation()
+
+	# Same page, but the new markers have to go
+	settled, _, _ = await service.get_serialized_dom_tree(previous_cached_state=grown)
+	assert not service.fingerprint_stats.last_reused
+	assert '*[' not in settled.llm_representation()
+
+	_, _, _ = await service.get_serialized_dom_tree(previous_cached_state=settled)
+	assert service.fingerprint_stats.last_reused
+
+
+def test_reuse_is_opt_in(dom_service):
+	assert not BrowserProfile().reuse_unchanged_dom_state
+	assert not dom_service([]).reuse_unchanged_dom
+
+
+def test_reuse_is_disabled_with_cross_origin_iframes(dom_service):
+	assert not dom_service([], reuse_unchanged_dom=True, cross_origin_iframes=True).reuse_unchanged_dom
@@ -0,0 +1,127 @@
+"""
+Tests for the viewport-windowed serialization, which summarizes off-screen sections of the page instead of listing them.
+"""
+
+import re
+
+import pytest
+
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.browser.views import BrowserStateSummary, PageInfo
+from browser_use.dom.playground.synthetic import ROW_HEIGHT, VIEWPORT_HEIGHT, VIEWPORT_WIDTH
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+
+
+@pytest.fixture
+def windowed_state(synthetic_state):
+	"""Factory for the serialized state of a long page with a section heading every 50 rows, scrolled to `scroll_y`"""
+
+	def serialize(scroll_y: float = 2_000, previous: SerializedDOMState | None = None) -> SerializedDOMState:
+		return synthetic_state(3_000, previous, scroll_y=scroll_y, section_every=50)
+
+	return serialize
+
+
+def _page_info(scroll_y: int = 2_000) -> PageInfo:
+	return PageInfo(
+		viewport_width=VIEWPORT_WIDTH,
+		viewport_height=VIEWPORT_HEIGHT,
+		page_width=VIEWPORT_WIDTH,
+		page_height=20_000,
+		scroll_x=0,
+		scroll_y=scroll_y,
+		pixels_above=scroll_y,
+		pixels_below=20_000 - VIEWPORT_HEIGHT - scroll_y,
+		pixels_left=0,
+		pixels_right=0,
+	)
+
+
+def _summary_counts(text: str) -> dict[str, int]:
+	counts: dict[str, int] = {}
+	for line in text.splitlines():
+		if line.lstrip().startswith('... off-screen'):
+			for count, label in re.findall(r'(\d+) ([a-z ]+?)(?:,| \.\.\.)', line.split(': ', 1)[1]):
+				counts[label.rstrip('s')] = counts.get(label.rstrip('s'), 0) + int(count)
+	return counts
+
+
+def test_only_the_window_is_listed(windowed_state):
+	state = windowed_state()
+	full = state.llm_representation()
+	windowed = state.llm_representation(viewport_margin=0, viewport_height=VIEWPORT_HEIGHT)
+	assert len(windowed) < len(full) / 5
+
+	full_lines = full.splitlines()
+	element_lines = [line for line in windowed.splitlines() if not line.lstrip().startswith('... off-screen')]
+	remaining = iter(full_lines)
+	assert all(line in remaining for line in element_lines)
+
+	# the page is scrolled by 2000px, the rows in view are 47 to 65
+	buttons = re.findall(r'aria-label=Add item (\d+) to cart', windowed)
+	first_row, last_row = int(buttons[0]), int(buttons[-1])
+	assert first_row * ROW_HEIGHT + 100 + 40 >= 2_000
+	assert last_row * ROW_HEIGHT + 100 <= 2_000 + VIEWPORT_HEIGHT
+
+	# every button of the full list is either listed or counted in a summary
+	assert len(buttons) + _summary_counts(windowed)['button'] == full.count('<button')
+
+
+def test_off_screen_sections_are_summarized_by_heading(windowed_state):
+	windowed = windowed_state().llm_representation(viewport_margin=0, viewport_height=VIEWPORT_HEIGHT)
+	summaries = [line for line in windowed.splitlines() if line.startswith('... off-screen below')]
+	assert summaries[1] == '... off-screen below "Section 2": 50 buttons, 50 inputs, 151 text lines ...'
+	assert summaries[-1].startswith('... off-screen below "Section 6": ')
+
+
+def test_margin_widens_the_window(windowed_state):
+	state = windowed_state()
+	narrow = state.llm_representation(viewport_margin=0, viewport_height=VIEWPORT_HEIGHT)
+	wide = state.llm_representation(viewport_margin=400, viewport_height=VIEWPORT_HEIGHT)
+	assert narrow.count('<button') < wide.count('<button') < state.llm_representation().count('<button')
+	assert state.serialization_stats.serializations == 3
+
+
+def test_budget_applies_to_the_windowed_lines(windowed_state):
+	state = windowed_state()
+	windowed = state.llm_representation(viewport_margin=200, viewport_height=VIEWPORT_HEIGHT)
+	budgeted = state.llm_representation(max_chars=1_000, viewport_margin=200, viewport_height=VIEWPORT_HEIGHT)
+	assert state.truncated
+	assert windowed.startswith(budgeted) and len(budgeted) <= 1_000
+	# the window already is the viewport content
+	assert budgeted == state.llm_representation(
+		max_chars=1_000, prioritize_viewport=True, viewport_margin=200, viewport_height=VIEWPORT_HEIGHT
+	)
+
+
+def test_without_a_viewport_height_the_document_client_rect_is_used(windowed_state):
+	# the synthetic document element is as tall as the page, like Chrome reports it, only the side panel
+	# scrolled out at the top is summarized
+	state = windowed_state()
+	windowed = state.llm_representation(viewport_margin=0).splitlines()
+	assert windowed[0] == '... off-screen above: 1 container ...'
+	assert windowed[1:] == state.llm_representation().splitlines()[1:]
+
+
+def test_prompt_lists_the_window_and_diffs_it(tmp_path, windowed_state):
+	previous = windowed_state()
+	current = windowed_state(scroll_y=2_400, previous=previous)
+	summary = BrowserStateSummary(
+		dom_state=current, url='https://example.com/feed', title='Feed', tabs=[], page_info=_page_info(2_400)
+	)
+
+	prompt = AgentMessagePrompt(summary, FileSystem(tmp_path / 'fs'), dom_viewport_margin=0)
+	description = prompt._get_browser_state_description()
+	windowed = current.llm_representation(viewport_margin=0, viewport_height=VIEWPORT_HEIGHT)
+	assert windowed in description
+	assert '... off-screen below "Section 2"' in description
+
+	diff_prompt = AgentMessagePrompt(
+		summary, FileSystem(tmp_path / 'fs'), dom_representation='diff', previous_dom_state=previous, dom_viewport_margin=0
+	)
+	diff_prompt._get_browser_state_description()
+	expected = current.diff_representation(previous, viewport_margin=0, viewport_height=VIEWPORT_HEIGHT)
+	assert '- [1]<button type=button aria-label=Add item 47 to cart />' in expected
+	# scrolling moves every index, the diff is longer than the window itself
+	assert not diff_prompt.dom_diff_sent and len(expected) > len(windowed)
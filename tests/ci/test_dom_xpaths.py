@@ -0,0 +1,86 @@
+"""
+Tests for the batched, memoized xpaths of selector-map elements.
+
+`DomService.compute_xpaths` must produce exactly the values of the walk-to-the-root implementation, they are stored
+in histories and used to find elements again.
+"""
+
+from browser_use.dom.playground.synthetic import make_synthetic_page
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType, TargetAllTrees
+
+
+def _all_nodes(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	nodes = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		nodes.append(node)
+		stack.extend(node.children_nodes or [])
+		stack.extend(node.shadow_roots or [])
+		if node.content_document:
+			stack.append(node.content_document)
+	return nodes
+
+
+def _page_with_shadow_root() -> TargetAllTrees:
+	"""Synthetic page whose first row hosts an open shadow root with two spans and a nested button"""
+	trees = make_synthetic_page(500, with_iframe=True)
+	body = trees.dom_tree['root']['children'][0]['children'][1]
+	host = next(child for child in body['children'] if child['nodeName'] == 'DIV' and 'row' in str(child['attributes']))
+
+	def node(node_id: int, parent_id: int, node_type: int, name: str, children: list | None = None) -> dict:
+		return {
+			'nodeId': node_id,
+			'parentId': parent_id,
+			'backendNodeId': node_id,
+			'nodeType': node_type,
+			'nodeName': name,
+			'nodeValue': '',
+			'children': children or [],
+		}
+
+	spans = [node(900_001, 900_000, 1, 'SPAN'), node(900_002, 900_000, 1, 'SPAN', [node(900_003, 900_002, 1, 'BUTTON')])]
+	host['shadowRoots'] = [{**node(900_000, host['nodeId'], 11, '#document-fragment', spans), 'shadowRootType': 'open'}]
+	return trees
+
+
+def test_batched_xpaths_match_walk_based_xpaths(dom_service):
+	root, _ = dom_service().build_enhanced_tree(_page_with_shadow_root(), 'target')
+	nodes = _all_nodes(root)
+	assert any(node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE for node in nodes)
+
+	expected = [node._build_xpath() for node in nodes]
+	DomService.compute_xpaths(nodes)
+	assert [node._xpath for node in nodes] == expected
+	assert all(node.xpath == xpath for node, xpath in zip(nodes, expected))
+
+	shadow_button = next(node for node in nodes if node.backend_node_id == 900_003)
+	assert shadow_button.xpath == 'html/body/div[2]/span[2]/button'
+
+
+def test_only_the_given_nodes_are_memoized(synthetic_tree):
+	root = synthetic_tree(500)
+	state, _ = DOMTreeSerializer(root).serialize_accessible_elements()
+	elements = set(state.selector_map.values())
+
+	DomService.compute_xpaths(elements)
+	assert all(element._xpath is not None for element in elements)
+	assert all(node._xpath is None for node in _all_nodes(root) if node not in elements)
+
+
+def test_xpath_is_memoized_on_first_access(synthetic_tree):
+	root = synthetic_tree(200)
+	button = next(node for node in _all_nodes(root) if node.attributes.get('aria-label') == 'Add item 0 to cart')
+	assert button._xpath is None
+	xpath = button.xpath
+	# the side panel is the first div of the body, the rows follow
+	assert button._xpath == xpath == 'html/body/div[2]/button'
+
+
+async def test_serialized_state_comes_with_xpaths(dom_service):
+	state, _, timing = await dom_service([make_synthetic_page(1_000, with_iframe=True)]).get_serialized_dom_tree()
+	assert 'compute_xpaths' in timing
+	assert state.selector_map and all(element._xpath is not None for element in state.selector_map.values())
+	assert all(element.xpath == element._build_xpath() for element in state.selector_map.values())